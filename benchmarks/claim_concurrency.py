@@ -0,0 +1,122 @@
+"""
+Load benchmark for /process-claim concurrency on a single worker.
+
+Drives the real FastAPI app in-process through httpx's ASGI transport with a
+latency-injected model and memory collection, so the numbers only reflect how
+the event loop schedules requests:
+
+    blocking  - model and Mongo calls sleep synchronously (the old pymongo/OpenAI path)
+    async     - model and Mongo calls await (the AsyncOpenAI/AsyncMongoClient path)
+
+Usage (from the repository root):
+    python benchmarks/claim_concurrency.py --requests 50 --llm-latency 1.0
+"""
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+os.environ.setdefault("AIMLAPI-KEY", "benchmark")
+os.environ.setdefault("X-API-KEY", "benchmark")
+
+import httpx
+
+from src.application.main import app
+from src.config.appconfig import env_config
+from src.domain.policyintelligencemodule import conversationmanager
+
+
+class _Cursor:
+    def __init__(self, blocking: bool, latency: float):
+        self.blocking = blocking
+        self.latency = latency
+
+    def sort(self, *args, **kwargs):
+        return self
+
+    def limit(self, *args, **kwargs):
+        return self
+
+    async def to_list(self, length=None):
+        await _wait(self.blocking, self.latency)
+        return []
+
+
+class _Collection:
+    def __init__(self, blocking: bool, latency: float):
+        self.blocking = blocking
+        self.latency = latency
+
+    def find(self, *args, **kwargs):
+        return _Cursor(self.blocking, self.latency)
+
+    async def insert_one(self, document):
+        await _wait(self.blocking, self.latency)
+
+
+class _DBClient:
+    def __init__(self, collection):
+        self.collection = collection
+
+    def get_context_collection(self):
+        return self.collection
+
+
+async def _wait(blocking: bool, latency: float):
+    if blocking:
+        time.sleep(latency)
+    else:
+        await asyncio.sleep(latency)
+
+
+async def run(mode: str, requests: int, llm_latency: float, db_latency: float) -> float:
+    blocking = mode == "blocking"
+
+    async def fake_llm_call(messages, model="openai/gpt-5-chat-latest"):
+        await _wait(blocking, llm_latency)
+        return "**Thank you**, your claim has been received."
+
+    conversationmanager.make_llm_call = fake_llm_call
+    app.state.db_client = _DBClient(_Collection(blocking, db_latency))
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        payload = {"policyNumber": "PL-0001", "message": "My car was hit at a junction"}
+        headers = {"X-API-KEY": env_config.x_api_key}
+        started = time.perf_counter()
+        responses = await asyncio.gather(
+            *(client.post("/api/v1/process-claim", json=payload, headers=headers) for _ in range(requests))
+        )
+        elapsed = time.perf_counter() - started
+
+    failures = [r for r in responses if r.status_code != 200]
+    if failures:
+        raise RuntimeError(f"{len(failures)} requests failed: {failures[0].text}")
+    return elapsed
+
+
+def main():
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--llm-latency", type=float, default=1.0)
+    parser.add_argument("--db-latency", type=float, default=0.01)
+    args = parser.parse_args()
+
+    per_request = args.llm_latency + 2 * args.db_latency
+    print(f"{args.requests} concurrent claim turns, {per_request:.2f}s of I/O each")
+    for mode in ("blocking", "async"):
+        elapsed = asyncio.run(run(mode, args.requests, args.llm_latency, args.db_latency))
+        in_flight = per_request * args.requests / elapsed
+        print(
+            f"{mode:>9}: {elapsed:7.2f}s wall, {args.requests / elapsed:7.2f} req/s, "
+            f"~{in_flight:5.1f} requests in flight per worker"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Latency benchmark for the paginated claims list at hundreds of thousands of claims.
+
+Seeds a scratch collection (never `claims`) and pages through it with the
+ClaimsRepository keyset cursor, comparing each depth against the skip/limit
+query it replaces. Also times a filtered, fraud-score-sorted page with field
+projection. Needs DB_CONN_URL / DB_DBNAME to point at a MongoDB server.
+
+Usage (from the repository root):
+    python benchmarks/claims_list.py --claims 300000 --pages 200
+"""
+import argparse
+import asyncio
+import datetime as dt
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from pymongo import DESCENDING, AsyncMongoClient
+
+from src.config.appconfig import env_config
+from src.infrastructure.database.claims_repository import ClaimsRepository
+
+STATUSES = ["pending", "processing", "flagged", "approve", "completed"]
+
+
+async def seed(collection, claims: int, batch_size: int = 10_000):
+    now = dt.datetime.now(dt.timezone.utc)
+    inserted = 0
+    while inserted < claims:
+        batch = []
+        for index in range(inserted, min(claims, inserted + batch_size)):
+            submitted = now - dt.timedelta(seconds=random.uniform(0, 365 * 24 * 3600))
+            batch.append({
+                "_id": f"cl-{index:08d}",
+                "claimantName": "Sam Ayo",
+                "policyNumber": f"PL-{index:08d}",
+                "carRegistration": f"KJA-{random.randint(100, 999)}-AB",
+                "status": random.choice(STATUSES),
+                "claimType": "Motor Accident",
+                "claimAmount": round(random.uniform(200, 20000), 2),
+                "dateSubmitted": submitted,
+                "fraudScore": random.randint(0, 100),
+                "isNew": False,
+                "lastUpdated": submitted,
+            })
+        await collection.insert_many(batch, ordered=False)
+        inserted += len(batch)
+        print(f"\r  seeded {inserted:,}/{claims:,}", end="", flush=True)
+    print()
+
+
+async def main(args):
+    client = AsyncMongoClient(env_config.mongo_conn_url)
+    database = client[env_config.mongo_database_name]
+    collection = database[args.collection]
+    try:
+        if args.reseed or await collection.estimated_document_count() < args.claims:
+            await collection.drop()
+            print(f"Seeding {args.claims:,} claims")
+            await seed(collection, args.claims)
+
+        repository = ClaimsRepository()
+        started = time.perf_counter()
+        await repository.open(database, collection_name=args.collection)
+        print(f"  index build: {time.perf_counter() - started:.1f}s")
+
+        print(f"Paging {args.pages} pages of {args.limit}: cursor vs skip/limit at the same depth")
+        cursor = None
+        for page in range(1, args.pages + 1):
+            started = time.perf_counter()
+            claims, cursor = await repository.list_claims(limit=args.limit, cursor=cursor)
+            cursor_ms = (time.perf_counter() - started) * 1000
+
+            started = time.perf_counter()
+            await collection.find({}).sort([("dateSubmitted", DESCENDING), ("_id", DESCENDING)]).skip(
+                (page - 1) * args.limit
+            ).limit(args.limit).to_list()
+            skip_ms = (time.perf_counter() - started) * 1000
+
+            if page in (1, 10) or page % 50 == 0 or cursor is None:
+                print(f"  page {page:>5}: cursor {cursor_ms:8.2f} ms   skip {skip_ms:8.2f} ms")
+            if cursor is None:
+                break
+
+        started = time.perf_counter()
+        claims, _ = await repository.list_claims(
+            filters={"status": ["flagged"], "minFraudScore": 70},
+            sort="fraudScore",
+            limit=args.limit,
+            fields={"claimantName", "status", "fraudScore", "dateSubmitted"},
+        )
+        print(f"  flagged, fraudScore >= 70, projected: {(time.perf_counter() - started) * 1000:.2f} ms ({len(claims)} claims)")
+    finally:
+        if args.drop:
+            await collection.drop()
+        await client.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--claims", type=int, default=300_000)
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--collection", default="claims_benchmark")
+    parser.add_argument("--reseed", action="store_true")
+    parser.add_argument("--drop", action="store_true", help="drop the scratch collection afterwards")
+    asyncio.run(main(parser.parse_args()))
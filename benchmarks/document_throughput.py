@@ -0,0 +1,178 @@
+"""
+Throughput benchmark for the document-understanding engine.
+
+Generates a synthetic corpus of claim documents (multi-page TXT, DOCX and, when pypdf is
+installed, PDF) carrying amounts, dates, VINs and registration numbers, then reports:
+
+    serial    - analyse_document in this process, one document at a time (one core)
+    pool      - DocumentUnderstandingEngine with a cold cache, one parser process per worker
+    cached    - the same documents again, answered from the content-hash cache
+
+Throughput is reported in pages per second and pages per second per core.
+
+Usage (from the repository root):
+    python benchmarks/document_throughput.py --documents 200 --pages 5 --workers 4
+"""
+import argparse
+import asyncio
+import hashlib
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+import zipfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.domain.evidencesynthesisengine.documentunderstanding import (
+    DocumentUnderstandingEngine,
+    analyse_document,
+    pypdf,
+)
+from src.infrastructure.evidence_store import EvidenceStore
+from src.services.file_upload import DOCX_MIME_TYPE
+
+VIN_CHARS = "ABCDEFGHJKLMNPRSTUVWXYZ0123456789"
+FILLER = (
+    "The insured vehicle was parked outside the claimant's residence when the incident occurred. "
+    "The loss adjuster inspected the damage and recommended repair at an approved workshop. "
+)
+
+
+def _page_lines(rng: random.Random) -> list:
+    vin = "".join(rng.choice(VIN_CHARS) for _ in range(16)) + str(rng.randint(0, 9))
+    lines = [
+        f"Date of incident: {rng.randint(1, 28):02d}/{rng.randint(1, 12):02d}/2025",
+        f"Vehicle VIN: {vin}",
+        f"Registration number: KJA-{rng.randint(100, 999)}-AB",
+        f"Estimated repair cost: ${rng.randint(500, 20000):,}.{rng.randint(0, 99):02d}",
+    ]
+    lines.extend(FILLER for _ in range(12))
+    return lines
+
+
+def _write_txt(path: Path, pages: list):
+    # Pad each page to the engine's characters-per-page so page counts line up
+    path.write_text("\n".join("\n".join(lines).ljust(2999) for lines in pages), encoding="utf-8")
+
+
+def _write_docx(path: Path, pages: list):
+    ns = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+    body = []
+    for index, lines in enumerate(pages):
+        body.extend(f"<w:p><w:r><w:t>{line}</w:t></w:r></w:p>" for line in lines)
+        if index < len(pages) - 1:
+            body.append('<w:p><w:r><w:br w:type="page"/></w:r></w:p>')
+    document = f'<?xml version="1.0" encoding="UTF-8"?><w:document xmlns:w="{ns}"><w:body>{"".join(body)}</w:body></w:document>'
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("word/document.xml", document)
+
+
+def _write_pdf(path: Path, pages: list):
+    def escape(text: str) -> str:
+        return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for lines in pages:
+        text = " T* ".join(f"({escape(line[:90])}) Tj" for line in lines)
+        stream = f"BT /F1 10 Tf 12 TL 40 800 Td {text} ET".encode("latin-1")
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] /Resources << /Font << /F1 3 0 R >> >>"
+            b" /Contents %d 0 R >>" % len(objects)
+        )
+        kids.append(len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        " ".join(f"{kid} 0 R" for kid in kids).encode(), len(kids)
+    )
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    path.write_bytes(bytes(out))
+
+
+def build_corpus(store: EvidenceStore, documents: int, pages: int, seed: int) -> list:
+    """Write the corpus straight into the store's blob layout and return (digest, mime_type, extension) tuples."""
+    rng = random.Random(seed)
+    writers = [(".txt", "text/plain", _write_txt), (".docx", DOCX_MIME_TYPE, _write_docx)]
+    if pypdf is not None:
+        writers.append((".pdf", "application/pdf", _write_pdf))
+
+    corpus = []
+    scratch = store.root / "scratch"
+    scratch.mkdir(parents=True, exist_ok=True)
+    for index in range(documents):
+        extension, mime_type, write = writers[index % len(writers)]
+        staged = scratch / f"{index}{extension}"
+        write(staged, [_page_lines(rng) for _ in range(pages)])
+        digest = hashlib.sha256(staged.read_bytes()).hexdigest()
+        blob = store.blob_path(digest)
+        blob.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(staged, blob)
+        corpus.append((digest, mime_type, extension))
+    return corpus
+
+
+def _report(label: str, pages: int, seconds: float, cores: int):
+    rate = pages / seconds
+    print(f"{label:<8} {pages:>7} pages in {seconds:7.2f}s  {rate:10.1f} pages/s  {rate / cores:10.1f} pages/s/core")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--documents", type=int, default=120)
+    parser.add_argument("--pages", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    root = Path(tempfile.mkdtemp(prefix="document-benchmark-"))
+    try:
+        store = EvidenceStore(str(root))
+        corpus = build_corpus(store, args.documents, args.pages, args.seed)
+        types = sorted({extension for _, _, extension in corpus})
+        print(f"{len(corpus)} documents x {args.pages} pages ({', '.join(types)}), {args.workers} workers")
+        if pypdf is None:
+            print("pypdf is not installed; PDFs are left out of the corpus")
+
+        started = time.perf_counter()
+        results = [analyse_document(str(store.blob_path(digest)), mime_type) for digest, mime_type, _ in corpus]
+        total_pages = sum(result["pages"] for result in results)
+        _report("serial", total_pages, time.perf_counter() - started, 1)
+
+        engine = DocumentUnderstandingEngine(store, max_workers=args.workers, cache_entries=len(corpus))
+        # Start the parser processes before timing so the pool numbers are steady state
+        await asyncio.gather(*(
+            asyncio.get_running_loop().run_in_executor(engine._executor(), time.sleep, 0.01)
+            for _ in range(args.workers)
+        ))
+
+        started = time.perf_counter()
+        results = await asyncio.gather(*(engine.analyse(digest, mime_type) for digest, mime_type, _ in corpus))
+        _report("pool", sum(result["pages"] for result in results), time.perf_counter() - started, args.workers)
+
+        started = time.perf_counter()
+        results = await asyncio.gather(*(engine.analyse(digest, mime_type) for digest, mime_type, _ in corpus))
+        _report("cached", sum(result["pages"] for result in results), time.perf_counter() - started, args.workers)
+
+        fields = results[0]["fields"]
+        print(f"sample fields: {len(fields['amounts'])} amounts, {len(fields['dates'])} dates, "
+              f"{len(fields['vins'])} VINs, {len(fields['registrationNumbers'])} registration numbers")
+        await engine.shutdown()
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,137 @@
+"""
+Throughput benchmark for nightly re-scoring of the whole claim book.
+
+Generates a synthetic book (1M claims by default) as column arrays and times the
+vectorised fraud model end to end: claim frequency per policy, shared evidence
+digests and scoring. The same model written as a per-claim Python loop is timed
+on a sample, extrapolated to the full book and checked to give identical scores.
+Runs offline; no database is needed.
+
+Usage (from the repository root):
+    python benchmarks/fraud_scoring.py --claims 1000000 --loop-sample 50000
+"""
+import argparse
+import math
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import numpy as np
+
+from src.domain.frauddetectionengine.fraudscoring import (
+    FREQUENCY_WINDOW_DAYS,
+    WEIGHTS,
+    ClaimFeatures,
+    count_prior_claims,
+    count_shared_evidence,
+    score_claims,
+)
+
+
+def synthetic_book(claims: int, seed: int) -> tuple:
+    rng = np.random.default_rng(seed)
+    policies = max(1, claims // 3)
+    policy_codes = rng.integers(0, policies, claims)
+    policy_start = rng.integers(19000, 20000, policies).astype(float)
+    premium = rng.uniform(200, 3000, policies)
+
+    submitted = policy_start[policy_codes] + rng.integers(0, 500, claims)
+    incident = submitted - rng.integers(0, 30, claims)
+    features = ClaimFeatures(
+        claim_amount=np.where(rng.random(claims) < 0.05, 0.0, rng.lognormal(7.5, 1.0, claims)),
+        premium=premium[policy_codes],
+        incident_day=incident.astype(float),
+        policy_start_day=policy_start[policy_codes],
+        policy_end_day=policy_start[policy_codes] + 365,
+        prior_claims=np.zeros(claims, dtype=np.int64),
+        shared_evidence=np.zeros(claims, dtype=np.int64),
+        document_count=rng.integers(0, 6, claims),
+        vin_match=rng.choice([-1, 0, 1], claims, p=[0.3, 0.05, 0.65]),
+    )
+
+    # About three evidence files per claim; 1% of files are re-used from another claim
+    evidence_claims = np.repeat(np.arange(claims), 3)
+    digests = np.arange(len(evidence_claims))
+    reused = rng.random(len(digests)) < 0.01
+    digests[reused] = rng.integers(0, len(digests), reused.sum())
+    return features, policy_codes, submitted.astype(np.int64), evidence_claims, digests
+
+
+def vectorised(features: ClaimFeatures, policy_codes, submitted, evidence_claims, digests) -> np.ndarray:
+    features.prior_claims = count_prior_claims(policy_codes, submitted)
+    _, digest_codes = np.unique(digests, return_inverse=True)
+    features.shared_evidence = count_shared_evidence(evidence_claims, digest_codes, len(features))
+    return score_claims(features).fraud_score
+
+
+def python_loop(features: ClaimFeatures, policy_codes, submitted, evidence_claims, digests, sample: int) -> list:
+    """The same model one claim at a time, as a straightforward per-claim implementation would do it."""
+    claims_by_policy = defaultdict(list)
+    for index in range(len(policy_codes)):
+        claims_by_policy[int(policy_codes[index])].append((int(submitted[index]), index))
+    claims_by_digest = defaultdict(set)
+    digests_by_claim = defaultdict(list)
+    for claim, digest in zip(evidence_claims.tolist(), digests.tolist()):
+        claims_by_digest[digest].add(claim)
+        digests_by_claim[claim].append(digest)
+
+    weights = WEIGHTS.tolist()
+    scores = []
+    for index in range(sample):
+        day = int(submitted[index])
+        # Claims on the same day count as earlier when they come first in the book, as in the vectorised version
+        prior = sum(
+            1 for other, other_index in claims_by_policy[int(policy_codes[index])]
+            if day - FREQUENCY_WINDOW_DAYS <= other < day or (other == day and other_index < index)
+        )
+        shared = max((len(claims_by_digest[d]) - 1 for d in digests_by_claim[index]), default=0)
+
+        amount = float(features.claim_amount[index])
+        premium = float(features.premium[index])
+        days_in = float(features.incident_day[index] - features.policy_start_day[index])
+        vin = int(features.vin_match[index])
+        risks = [
+            None if amount <= 0 else min(max((amount / premium - 1.0) / 9.0, 0.0), 1.0),
+            math.exp(-days_in / 30.0) if days_in >= 0 else 0.0,
+            float(not features.policy_start_day[index] <= features.incident_day[index] <= features.policy_end_day[index]),
+            1.0 - 0.5 ** shared,
+            min(prior / 3.0, 1.0),
+            None if vin < 0 else float(vin == 0),
+        ]
+        remaining = 1.0
+        for risk, weight in zip(risks, weights):
+            if risk is not None:
+                remaining *= 1.0 - weight * risk
+        scores.append(round(min(max(1.0 - remaining, 0.0), 1.0) * 100))
+    return scores
+
+
+def main(args):
+    features, policy_codes, submitted, evidence_claims, digests = synthetic_book(args.claims, args.seed)
+    print(f"{args.claims:,} claims, {len(set(policy_codes.tolist())):,} policies, {len(digests):,} evidence files")
+
+    started = time.perf_counter()
+    scores = vectorised(features, policy_codes, submitted, evidence_claims, digests)
+    elapsed = time.perf_counter() - started
+    print(f"vectorised:  {elapsed:8.2f}s  {args.claims / elapsed:12,.0f} claims/s")
+
+    sample = min(args.loop_sample, args.claims)
+    started = time.perf_counter()
+    loop_scores = python_loop(features, policy_codes, submitted, evidence_claims, digests, sample)
+    loop_elapsed = (time.perf_counter() - started) * args.claims / sample
+    print(f"python loop: {loop_elapsed:8.2f}s  {args.claims / loop_elapsed:12,.0f} claims/s (extrapolated from {sample:,})")
+    print(f"speed-up:    {loop_elapsed / elapsed:8.1f}x")
+
+    mismatches = int(np.count_nonzero(scores[:sample] != np.array(loop_scores)))
+    print(f"score mismatches in sample: {mismatches}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--claims", type=int, default=1_000_000)
+    parser.add_argument("--loop-sample", type=int, default=50_000)
+    parser.add_argument("--seed", type=int, default=7)
+    main(parser.parse_args())
@@ -0,0 +1,141 @@
+"""
+OpenAI-compatible stub of the model API for testing the LLM gateway locally.
+
+Serves POST /v1/chat/completions (plain and streamed) with injected latency,
+a slow tail and errors, configurable per model name, so timeouts, retries and
+hedging can be exercised without the real upstream. Usage reports a system
+prompt seen before as cached, like provider prompt caching. Point the app at it with:
+
+    LLM_BASE_URL=http://127.0.0.1:8100/v1
+
+Usage (from the repository root):
+    python benchmarks/llm_stub_server.py --latency 0.3 --tail-fraction 0.05 --tail-latency 5 --error-rate 0.02
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+import time
+import uuid
+from dataclasses import dataclass, field
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+
+@dataclass
+class StubBehaviour:
+    latency: float = 0.3  # median seconds to answer
+    tail_fraction: float = 0.0  # share of calls that are slow
+    tail_latency: float = 5.0
+    error_rate: float = 0.0  # share of calls answered with a 500 or 429
+    reply: str = "This is a stub reply from the model."
+    models: dict = field(default_factory=dict)  # per-model overrides, e.g. {"fallback": {"tail_fraction": 0}}
+
+    def for_model(self, model: str) -> "StubBehaviour":
+        overrides = self.models.get(model)
+        if not overrides:
+            return self
+        return StubBehaviour(**{**self.__dict__, "models": {}, **overrides})
+
+    def delay(self) -> float:
+        if random.random() < self.tail_fraction:
+            return self.tail_latency * random.uniform(0.8, 1.2)
+        return self.latency * random.lognormvariate(0, 0.25)
+
+
+def build_app(behaviour: StubBehaviour) -> FastAPI:
+    app = FastAPI()
+    app.state.calls = {}
+    app.state.prefixes = set()
+
+    def usage(messages: list) -> dict:
+        prompt_tokens = sum(len(str(message.get("content", ""))) for message in messages) // 4 + 1
+        cached_tokens = 0
+        if messages and messages[0].get("role") == "system":
+            prefix = hashlib.sha256(str(messages[0].get("content", "")).encode()).hexdigest()
+            if prefix in app.state.prefixes:
+                # Providers cache in 128-token blocks once the prefix is at least 1024 tokens
+                prefix_tokens = len(str(messages[0]["content"])) // 4
+                cached_tokens = prefix_tokens // 128 * 128 if prefix_tokens >= 1024 else 0
+            app.state.prefixes.add(prefix)
+        return {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": 10,
+            "total_tokens": prompt_tokens + 10,
+            "prompt_tokens_details": {"cached_tokens": cached_tokens},
+        }
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        model = body.get("model", "stub")
+        app.state.calls[model] = app.state.calls.get(model, 0) + 1
+        stub = behaviour.for_model(model)
+
+        if random.random() < stub.error_rate:
+            status = random.choice([500, 429])
+            return JSONResponse(status_code=status, content={"error": {"message": "stub failure", "type": "server_error"}})
+
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+        created = int(time.time())
+        if not body.get("stream"):
+            await asyncio.sleep(stub.delay())
+            return {
+                "id": completion_id,
+                "object": "chat.completion",
+                "created": created,
+                "model": model,
+                "choices": [{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": stub.reply}}],
+                "usage": usage(body.get("messages", [])),
+            }
+
+        async def events():
+            await asyncio.sleep(stub.delay())
+            for word in stub.reply.split(" "):
+                chunk = {
+                    "id": completion_id,
+                    "object": "chat.completion.chunk",
+                    "created": created,
+                    "model": model,
+                    "choices": [{"index": 0, "delta": {"content": word + " "}, "finish_reason": None}],
+                }
+                yield f"data: {json.dumps(chunk)}\n\n"
+                await asyncio.sleep(0.01)
+            if (body.get("stream_options") or {}).get("include_usage"):
+                chunk = {
+                    "id": completion_id,
+                    "object": "chat.completion.chunk",
+                    "created": created,
+                    "model": model,
+                    "choices": [],
+                    "usage": usage(body.get("messages", [])),
+                }
+                yield f"data: {json.dumps(chunk)}\n\n"
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    return app
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--latency", type=float, default=0.3)
+    parser.add_argument("--tail-fraction", type=float, default=0.0)
+    parser.add_argument("--tail-latency", type=float, default=5.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--models", default="{}", help='per-model overrides as JSON, e.g. \'{"fallback": {"tail_fraction": 0}}\'')
+    args = parser.parse_args()
+    behaviour = StubBehaviour(
+        latency=args.latency,
+        tail_fraction=args.tail_fraction,
+        tail_latency=args.tail_latency,
+        error_rate=args.error_rate,
+        models=json.loads(args.models),
+    )
+    uvicorn.run(build_app(behaviour), host="127.0.0.1", port=args.port, log_level="warning")
@@ -0,0 +1,104 @@
+"""
+Tail latency of model calls through the LLM gateway against a local stub upstream.
+
+Starts benchmarks/llm_stub_server.py in-process with a slow tail and some errors
+on the primary model, then sends the same load through LLMGateway three ways:
+
+    bare     - no retries, no hedging (the old single-client behaviour)
+    retries  - deadline-bounded retries with jitter
+    hedged   - retries plus hedging to a fallback model past the primary's p95
+
+and reports p50/p95/p99 latency and failures for each.
+
+Usage (from the repository root):
+    python benchmarks/llm_tail_latency.py --calls 400 --concurrency 20
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+os.environ.setdefault("AIMLAPI-KEY", "benchmark")
+
+import uvicorn
+
+from benchmarks.llm_stub_server import StubBehaviour, build_app
+from src.ai_model.llm_gateway import LLMGateway
+
+MESSAGES = [{"role": "user", "content": "I want to make a claim"}]
+
+
+def percentile(values: list, percent: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * percent / 100))]
+
+
+async def run(gateway: LLMGateway, calls: int, concurrency: int) -> tuple:
+    latencies, failures = [], 0
+    limit = asyncio.Semaphore(concurrency)
+
+    async def one():
+        nonlocal failures
+        async with limit:
+            started = time.perf_counter()
+            try:
+                await gateway.complete(MESSAGES, model="primary", temperature=0.4, max_tokens=64)
+                latencies.append(time.perf_counter() - started)
+            except Exception:
+                failures += 1
+
+    await asyncio.gather(*(one() for _ in range(calls)))
+    return latencies, failures
+
+
+async def main(args):
+    behaviour = StubBehaviour(
+        latency=args.latency,
+        tail_fraction=args.tail_fraction,
+        tail_latency=args.tail_latency,
+        error_rate=args.error_rate,
+        models={"fallback": {"tail_fraction": 0.0, "error_rate": 0.0}},
+    )
+    server = uvicorn.Server(uvicorn.Config(build_app(behaviour), host="127.0.0.1", port=args.port, log_level="warning"))
+    serving = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.05)
+
+    base_url = f"http://127.0.0.1:{args.port}/v1"
+    variants = {
+        "bare": dict(max_retries=0),
+        "retries": dict(max_retries=2, backoff_seconds=0.1),
+        "hedged": dict(max_retries=2, backoff_seconds=0.1, fallback_model="fallback", hedge_min_delay_seconds=0.0),
+    }
+    print(f"{'variant':<8} {'p50':>7} {'p95':>7} {'p99':>7} {'max':>7} {'failed':>7} {'hedges':>7}")
+    for name, options in variants.items():
+        gateway = LLMGateway(base_url=base_url, api_key="benchmark", deadline_seconds=args.deadline, **options)
+        # Warm the latency window so hedging has a p95 to work from
+        await run(gateway, 40, args.concurrency)
+        gateway.counters = dict.fromkeys(gateway.counters, 0)
+        latencies, failures = await run(gateway, args.calls, args.concurrency)
+        print(
+            f"{name:<8} {statistics.median(latencies):7.3f} {percentile(latencies, 95):7.3f}"
+            f" {percentile(latencies, 99):7.3f} {max(latencies):7.3f} {failures:7d} {gateway.counters['hedges']:7d}"
+        )
+        await gateway.close()
+
+    server.should_exit = True
+    await serving
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--tail-fraction", type=float, default=0.05)
+    parser.add_argument("--tail-latency", type=float, default=3.0)
+    parser.add_argument("--error-rate", type=float, default=0.03)
+    parser.add_argument("--deadline", type=float, default=10.0)
+    parser.add_argument("--port", type=int, default=8101)
+    asyncio.run(main(parser.parse_args()))
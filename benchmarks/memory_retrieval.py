@@ -0,0 +1,106 @@
+"""
+Retrieval latency benchmark for the chat memory collection at 1M+ documents.
+
+Seeds a scratch collection (never `aichatmemory`) with memory entries spread
+over many policies, then times retrieve_memory_with_k without indexes and
+again after ensure_memory_indexes has built the (policy_number, timestamp desc)
+and TTL indexes. Needs DB_CONN_URL / DB_DBNAME to point at a MongoDB server.
+
+The TTL index is created with the configured window, so run this against a
+scratch database and expect seeded documents older than the window to vanish.
+
+Usage (from the repository root):
+    python benchmarks/memory_retrieval.py --documents 1000000 --policies 50000
+"""
+import argparse
+import asyncio
+import datetime as dt
+import os
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from pymongo import AsyncMongoClient
+
+from src.ai_model.memory_context import ensure_memory_indexes, memory_window, retrieve_memory_with_k
+from src.config.appconfig import env_config
+
+
+async def seed(collection, documents: int, policies: int, batch_size: int = 10_000):
+    now = dt.datetime.now(dt.timezone.utc)
+    # Spread entries over the memory window so retrieval has something to find
+    spread = memory_window().total_seconds()
+    inserted = 0
+    while inserted < documents:
+        batch = []
+        for _ in range(min(batch_size, documents - inserted)):
+            policy = f"PL-{random.randrange(policies):07d}"
+            batch.append({
+                "policy_number": policy,
+                "History": {"type": "ai", "data": {"user_prompt": "My car was hit", "ai_response": "Sorry to hear that."}},
+                "timestamp": now - dt.timedelta(seconds=random.uniform(0, spread)),
+            })
+        await collection.insert_many(batch, ordered=False)
+        inserted += len(batch)
+        print(f"\r  seeded {inserted:,}/{documents:,}", end="", flush=True)
+    print()
+
+
+async def measure(collection, policies: int, lookups: int) -> list:
+    latencies = []
+    for _ in range(lookups):
+        policy = f"PL-{random.randrange(policies):07d}"
+        started = time.perf_counter()
+        await retrieve_memory_with_k(collection, policy, k=3)
+        latencies.append((time.perf_counter() - started) * 1000)
+    return latencies
+
+
+def report(label: str, latencies: list):
+    latencies = sorted(latencies)
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(f"{label:>12}: p50 {statistics.median(latencies):8.2f} ms   p95 {p95:8.2f} ms   max {latencies[-1]:8.2f} ms")
+
+
+async def main(args):
+    client = AsyncMongoClient(env_config.mongo_conn_url)
+    collection = client[env_config.mongo_database_name][args.collection]
+    try:
+        if args.reseed or await collection.estimated_document_count() < args.documents:
+            await collection.drop()
+            print(f"Seeding {args.documents:,} memory entries over {args.policies:,} policies")
+            await seed(collection, args.documents, args.policies)
+
+        await collection.drop_indexes()
+        report("no index", await measure(collection, args.policies, args.scan_lookups))
+
+        started = time.perf_counter()
+        await ensure_memory_indexes(collection)
+        print(f"  index build: {time.perf_counter() - started:.1f}s")
+        report("indexed", await measure(collection, args.policies, args.lookups))
+
+        explain = await collection.find(
+            {"policy_number": "PL-0000001", "timestamp": {"$gte": dt.datetime.now(dt.timezone.utc) - memory_window()}}
+        ).sort([("timestamp", -1)]).limit(3).explain()
+        stats = explain.get("executionStats", {})
+        print(f"  winning plan docs examined: {stats.get('totalDocsExamined')}, keys examined: {stats.get('totalKeysExamined')}")
+    finally:
+        if args.drop:
+            await collection.drop()
+        await client.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--documents", type=int, default=1_000_000)
+    parser.add_argument("--policies", type=int, default=50_000)
+    parser.add_argument("--lookups", type=int, default=1_000)
+    parser.add_argument("--scan-lookups", type=int, default=20, help="lookups without an index (each one is a full scan)")
+    parser.add_argument("--collection", default="aichatmemory_benchmark")
+    parser.add_argument("--reseed", action="store_true")
+    parser.add_argument("--drop", action="store_true", help="drop the scratch collection afterwards")
+    asyncio.run(main(parser.parse_args()))
@@ -1,22 +1,85 @@
+import asyncio
 from pathlib import Path
-from openai import OpenAI
+from typing import AsyncIterator, Optional
+from src.ai_model.llm_gateway import llm_gateway
 from src.ai_model.memory_context import retrieve_memory_with_k
-from src.config.appconfig import env_config
+from src.ai_model.response_cache import get_response_cache, response_cache_key
+from src.config.app_settings import get_settings
 from src.utilities.prompt_loader import load_yaml_file
 from src.infrastructure.database.mongo import MongoDBClientConfig
 
-base_url = "https://api.aimlapi.com/v1"
+DEFAULT_MODEL = get_settings().LLM_MODEL
+DEFAULT_TEMPERATURE = 0.4
+MAX_TOKENS = 2048
 
-api = OpenAI(api_key=env_config.aimlapi_key, base_url=base_url)
+# Identical cacheable calls in flight share one request to the model
+_pending_calls = {}
 
-def make_llm_call(messages:list,model:str= "openai/gpt-5-chat-latest")->str:
 
-    completion = api.chat.completions.create(
-        model=model,
-        messages=messages,
-        temperature=0.4,
-        max_tokens=2048,
-    )
+def _cache_key(messages: list, model: str, temperature: float, deterministic: bool) -> Optional[str]:
+    """The response cache key when this call may be served from the cache, otherwise None."""
+    if get_response_cache() is None:
+        return None
+    if not deterministic and get_settings().LLM_CACHE_MODE.lower() != "all":
+        return None
+    return response_cache_key(model, temperature, messages, max_tokens=MAX_TOKENS)
 
-    response = completion.choices[0].message.content
-    return response
+
+async def _complete(messages: list, model: str, temperature: float) -> str:
+    return await llm_gateway.complete(messages, model=model, temperature=temperature, max_tokens=MAX_TOKENS)
+
+
+async def _complete_and_cache(key: str, messages: list, model: str, temperature: float) -> str:
+    try:
+        response = await _complete(messages, model, temperature)
+        if response:
+            await get_response_cache().set(key, response)
+        return response
+    finally:
+        _pending_calls.pop(key, None)
+
+
+async def make_llm_call(messages:list,model:str=DEFAULT_MODEL,deterministic:bool=False)->str:
+    """
+    Ask the model for a reply.
+
+    Args:
+        messages (list): The fully rendered chat messages.
+        model (str): Model name.
+        deterministic (bool): For scripted steps whose reply only depends on the prompt: runs at
+            temperature 0 and is served from the response cache when the same prompt was answered before.
+
+    Returns:
+        str: The reply text.
+    """
+    temperature = 0.0 if deterministic else DEFAULT_TEMPERATURE
+    key = _cache_key(messages, model, temperature, deterministic)
+    if key is None:
+        return await _complete(messages, model, temperature)
+
+    cached = await get_response_cache().get(key)
+    if cached is not None:
+        return cached
+    pending = _pending_calls.get(key)
+    if pending is None:
+        pending = _pending_calls[key] = asyncio.ensure_future(_complete_and_cache(key, messages, model, temperature))
+    return await asyncio.shield(pending)
+
+
+async def stream_llm_call(messages:list,model:str=DEFAULT_MODEL,deterministic:bool=False)->AsyncIterator[str]:
+    """Yield the completion text as content deltas arrive from the model; a cached reply is yielded whole."""
+    temperature = 0.0 if deterministic else DEFAULT_TEMPERATURE
+    key = _cache_key(messages, model, temperature, deterministic)
+    if key is not None:
+        cached = await get_response_cache().get(key)
+        if cached is not None:
+            yield cached
+            return
+
+    chunks = []
+    async for delta in llm_gateway.stream(messages, model=model, temperature=temperature, max_tokens=MAX_TOKENS):
+        chunks.append(delta)
+        yield delta
+    # Only a reply streamed to the end is cached
+    if key is not None and chunks:
+        await get_response_cache().set(key, "".join(chunks))
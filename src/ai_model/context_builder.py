@@ -0,0 +1,180 @@
+import json
+import logging
+import math
+from dataclasses import dataclass, field
+from typing import Optional
+
+import tiktoken
+
+from src.config.app_settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+# Tokens the chat format adds around every message (role and separators)
+MESSAGE_OVERHEAD_TOKENS = 4
+# Estimated tokens per character if the encoding could not be loaded (about four characters per token)
+CHARS_PER_TOKEN = 4
+# Share of the history budget that may go to the summary of older, dropped turns
+SUMMARY_SHARE = 0.2
+# Tokens of each dropped claimant message kept in that summary
+SUMMARY_SNIPPET_TOKENS = 24
+
+_encoding = None
+_encoding_loaded = False
+
+
+def load_tokenizer():
+    """
+    Load the TOKENIZER_ENCODING ranks; called once at startup (they are read from TIKTOKEN_CACHE_DIR, or downloaded
+    when not cached there), so no chat turn waits for them.
+    """
+    global _encoding, _encoding_loaded
+    if not _encoding_loaded:
+        _encoding_loaded = True
+        try:
+            _encoding = tiktoken.get_encoding(get_settings().TOKENIZER_ENCODING)
+        except Exception as e:
+            logger.warning(f"Tokenizer unavailable, estimating token counts: {e}")
+    return _encoding
+
+
+def _get_encoding():
+    return _encoding if _encoding_loaded else load_tokenizer()
+
+
+def count_tokens(text: str) -> int:
+    if not text:
+        return 0
+    encoding = _get_encoding()
+    if encoding is None:
+        return math.ceil(len(text) / CHARS_PER_TOKEN)
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Keep the start of ``text`` up to ``max_tokens`` tokens, marking the cut with an ellipsis."""
+    if max_tokens <= 0:
+        return ""
+    if count_tokens(text) <= max_tokens:
+        return text
+    encoding = _get_encoding()
+    if encoding is None:
+        return text[:max(0, max_tokens - 1) * CHARS_PER_TOKEN].rstrip() + "…"
+    return encoding.decode(encoding.encode(text, disallowed_special=())[:max_tokens - 1]).rstrip() + "…"
+
+
+def message_tokens(message: dict) -> int:
+    return MESSAGE_OVERHEAD_TOKENS + count_tokens(message["content"])
+
+
+def format_policy_data(policy_data) -> str:
+    """Policy information as compact JSON without empty fields, instead of a Python dict repr."""
+    if not policy_data:
+        return ""
+    if isinstance(policy_data, str):
+        return policy_data
+    compact = {key: value for key, value in policy_data.items() if value not in (None, "", [], {})}
+    return json.dumps(compact, separators=(",", ":"), default=str)
+
+
+@dataclass
+class PromptContext:
+    """The messages sent to the model and how the history budget was spent."""
+    messages: list
+    history_tokens: int = 0
+    prompt_tokens: int = 0
+    turns_kept: int = 0
+    turns_summarised: int = 0
+    truncated: list = field(default_factory=list)
+
+
+def _summary_message(dropped: list, budget: int) -> Optional[dict]:
+    """One system message recalling what the claimant said in turns that no longer fit, oldest first."""
+    if not dropped or budget <= MESSAGE_OVERHEAD_TOKENS:
+        return None
+    header = "Summary of earlier turns in this conversation (claimant messages, oldest first):"
+    lines, used = [header], MESSAGE_OVERHEAD_TOKENS + count_tokens(header)
+    # Prefer the most recent dropped turns when the summary budget runs out
+    kept = []
+    for turn in reversed(dropped):
+        line = "- " + truncate_to_tokens(" ".join(turn["user_prompt"].split()), SUMMARY_SNIPPET_TOKENS)
+        cost = count_tokens(line) + 1
+        if used + cost > budget:
+            break
+        kept.append(line)
+        used += cost
+    if not kept:
+        return None
+    return {"role": "system", "content": "\n".join(lines + kept[::-1])}
+
+
+def build_context(
+    system_prompt: str,
+    user_prompt: str,
+    history: Optional[list],
+    max_history_tokens: int,
+    context: Optional[str] = None,
+) -> PromptContext:
+    """
+    Assemble the chat messages for one turn: the system prompt, as much recent history as fits in
+    ``max_history_tokens`` as user/assistant messages, the per-turn context, then the current user prompt.
+
+    Everything that changes between calls comes after the system prompt, so the system prompt stays a
+    byte-identical prefix that the provider's prompt cache can serve.
+
+    History is filled newest turn first. Older turns that no longer fit are reduced to a short summary
+    of what the claimant said; if even the latest turn is over budget its assistant reply is cut short.
+
+    Args:
+        system_prompt: The rendered system prompt.
+        user_prompt: The rendered user prompt for this turn.
+        history: Earlier turns, oldest first, as ``{"user_prompt": ..., "ai_response": ...}`` dicts.
+        max_history_tokens: Token budget for the history and its summary.
+        context: Data for this turn only (e.g. policy information), sent as its own message before the user prompt.
+    """
+    history = history or []
+    summary_budget = int(max_history_tokens * SUMMARY_SHARE) if len(history) > 1 else 0
+    turn_budget = max_history_tokens - summary_budget
+
+    kept, used, truncated = [], 0, []
+    index = len(history)
+    for turn in reversed(history):
+        user = {"role": "user", "content": turn["user_prompt"]}
+        assistant = {"role": "assistant", "content": turn["ai_response"]}
+        cost = message_tokens(user) + message_tokens(assistant)
+        if used + cost > turn_budget:
+            if kept:
+                break
+            # The latest turn carries the state of the conversation, so keep a shortened version of it
+            room = turn_budget - message_tokens(user) - MESSAGE_OVERHEAD_TOKENS
+            if room <= 0:
+                break
+            assistant["content"] = truncate_to_tokens(assistant["content"], room)
+            truncated.append(index - 1)
+            cost = message_tokens(user) + message_tokens(assistant)
+        kept[:0] = [user, assistant]
+        used += cost
+        index -= 1
+
+    dropped = history[:index]
+    # Whatever the kept turns left unused also goes to the summary
+    summary = _summary_message(dropped, summary_budget + turn_budget - used)
+    history_messages = ([summary] if summary else []) + kept
+    if summary:
+        used += message_tokens(summary)
+
+    context_messages = [{"role": "system", "content": context}] if context else []
+    messages = [
+        {"role": "system", "content": system_prompt},
+        *history_messages,
+        *context_messages,
+        {"role": "user", "content": user_prompt},
+    ]
+    return PromptContext(
+        messages=messages,
+        history_tokens=used,
+        prompt_tokens=sum(message_tokens(message) for message in messages),
+        turns_kept=len(kept) // 2,
+        turns_summarised=len(dropped) if summary else 0,
+        truncated=truncated,
+    )
@@ -0,0 +1,406 @@
+import asyncio
+import importlib
+import logging
+import random
+import time
+from collections import deque
+from functools import lru_cache
+from typing import TYPE_CHECKING, AsyncIterator, Optional
+
+import httpx
+
+from src.config.app_settings import get_settings
+from src.config.appconfig import env_config
+from src.utilities.metrics import LLM_FIRST_TOKEN_SECONDS, LLM_TOKENS, observe_stage
+
+# The SDK takes about a third of the application's import time, so it is imported on first use
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache()
+def retryable_errors() -> tuple:
+    """Failures worth another attempt; anything else (bad request, auth) fails straight away."""
+    import openai
+
+    return (
+        openai.APITimeoutError,
+        openai.APIConnectionError,
+        openai.RateLimitError,
+        openai.InternalServerError,
+        asyncio.TimeoutError,
+    )
+
+
+class LLMDeadlineExceeded(Exception):
+    """The call could not be completed before its deadline, including time spent queueing and retrying."""
+
+
+class LatencyTracker:
+    """Recent successful call latencies of one model, for the hedging threshold."""
+
+    def __init__(self, window: int = 200):
+        self._samples = deque(maxlen=window)
+
+    def record(self, seconds: float):
+        self._samples.append(seconds)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def percentile(self, percent: float) -> Optional[float]:
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * percent / 100))]
+
+
+class LLMGateway:
+    """
+    The one way out to the model API.
+
+    Owns a tuned connection pool and caps concurrent calls with a semaphore, so a slow upstream
+    queues callers here instead of opening ever more requests. Every call has a deadline that covers
+    queueing, each attempt and the backoff between attempts; retryable failures are retried with full
+    jitter while the deadline allows. With a fallback model configured, a call still running after the
+    primary's recent p95 latency is hedged: the same request goes to the fallback and the first
+    answer wins. Hedges only use spare capacity, so they never add to an overload.
+
+    Token usage of every call, including the prompt tokens the provider served from its prompt cache,
+    is added to ``usage`` per model.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        api_key: Optional[str],
+        max_concurrency: int = 32,
+        max_connections: int = 64,
+        max_keepalive_connections: int = 32,
+        connect_timeout: float = 5.0,
+        request_timeout: float = 60.0,
+        deadline_seconds: float = 90.0,
+        max_retries: int = 2,
+        backoff_seconds: float = 0.5,
+        backoff_max_seconds: float = 8.0,
+        fallback_model: Optional[str] = None,
+        hedge_percentile: float = 95.0,
+        hedge_min_delay_seconds: float = 2.0,
+        hedge_min_samples: int = 20,
+        stream_usage: bool = True,
+    ):
+        self.base_url = base_url
+        self.api_key = api_key
+        self.max_concurrency = max_concurrency
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+        self.connect_timeout = connect_timeout
+        self.request_timeout = request_timeout
+        self.deadline_seconds = deadline_seconds
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self.backoff_max_seconds = backoff_max_seconds
+        self.fallback_model = fallback_model or None
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_delay_seconds = hedge_min_delay_seconds
+        self.hedge_min_samples = hedge_min_samples
+        self.stream_usage = stream_usage
+
+        self.in_flight = 0
+        self.counters = {"calls": 0, "retries": 0, "hedges": 0, "hedgeWins": 0, "deadlineExceeded": 0, "failures": 0}
+        self.usage = {}
+        self._latencies = {}
+        self._client: Optional["AsyncOpenAI"] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    @property
+    def client(self) -> "AsyncOpenAI":
+        """The API client, created on first use rather than at import."""
+        if self._client is None:
+            import openai
+
+            http_client = openai.DefaultAsyncHttpxClient(
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_keepalive_connections,
+                    keepalive_expiry=30.0,
+                ),
+                timeout=httpx.Timeout(self.request_timeout, connect=self.connect_timeout),
+            )
+            # Retries are ours, so they respect the deadline; the SDK's own would not
+            self._client = openai.AsyncOpenAI(
+                api_key=self.api_key, base_url=self.base_url, http_client=http_client, max_retries=0
+            )
+        return self._client
+
+    async def warm_up(self):
+        """Import the SDK off the event loop and build the client, so the first model call does not pay for either."""
+        await asyncio.to_thread(importlib.import_module, "openai")
+        self.client
+
+    @property
+    def semaphore(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    def latency(self, model: str) -> LatencyTracker:
+        if model not in self._latencies:
+            self._latencies[model] = LatencyTracker()
+        return self._latencies[model]
+
+    def record_usage(self, model: str, usage) -> None:
+        """Add one call's token usage (the API's ``usage`` object) to the model's totals."""
+        if usage is None:
+            return
+        details = getattr(usage, "prompt_tokens_details", None)
+        cached = (getattr(details, "cached_tokens", None) or 0) if details is not None else 0
+        totals = self.usage.setdefault(model, {"calls": 0, "promptTokens": 0, "cachedTokens": 0, "completionTokens": 0})
+        totals["calls"] += 1
+        totals["promptTokens"] += usage.prompt_tokens or 0
+        totals["cachedTokens"] += cached
+        totals["completionTokens"] += usage.completion_tokens or 0
+        LLM_TOKENS.labels(model, "prompt").inc(usage.prompt_tokens or 0)
+        LLM_TOKENS.labels(model, "cached").inc(cached)
+        LLM_TOKENS.labels(model, "completion").inc(usage.completion_tokens or 0)
+        logger.debug(
+            f"Model call to {model}: {usage.prompt_tokens} prompt tokens ({cached} cached), "
+            f"{usage.completion_tokens} completion tokens"
+        )
+
+    def stats(self) -> dict:
+        return {
+            **self.counters,
+            "inFlight": self.in_flight,
+            "p95Seconds": {
+                model: round(tracker.percentile(95), 3) for model, tracker in self._latencies.items() if len(tracker)
+            },
+            "usage": {
+                model: {
+                    **totals,
+                    "cachedRatio": round(totals["cachedTokens"] / totals["promptTokens"], 4) if totals["promptTokens"] else 0.0,
+                }
+                for model, totals in self.usage.items()
+            },
+        }
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
+
+    def _remaining(self, deadline: float) -> float:
+        return deadline - time.monotonic()
+
+    async def _acquire(self, deadline: float):
+        try:
+            await asyncio.wait_for(self.semaphore.acquire(), timeout=max(0.0, self._remaining(deadline)))
+        except asyncio.TimeoutError:
+            self.counters["deadlineExceeded"] += 1
+            raise LLMDeadlineExceeded("Timed out waiting for a free model connection") from None
+        self.in_flight += 1
+
+    def _release(self):
+        self.in_flight -= 1
+        self.semaphore.release()
+
+    def _backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.backoff_max_seconds, self.backoff_seconds * 2 ** attempt))
+
+    async def _attempts(self, request, model: str, deadline: float, record_latency: bool = True):
+        """Run ``request(timeout)`` with retries until it succeeds, fails for good or the deadline passes."""
+        attempt = 0
+        while True:
+            remaining = self._remaining(deadline)
+            if remaining <= 0:
+                self.counters["deadlineExceeded"] += 1
+                raise LLMDeadlineExceeded(f"Model call to {model} ran out of time")
+            started = time.monotonic()
+            try:
+                result = await asyncio.wait_for(request(min(self.request_timeout, remaining)), timeout=remaining)
+            except retryable_errors() as e:
+                delay = self._backoff(attempt)
+                out_of_time = delay >= self._remaining(deadline)
+                if attempt >= self.max_retries or out_of_time:
+                    # Per-attempt timeouts are capped to the time left, so a timeout here means the deadline passed
+                    if out_of_time and isinstance(e, (asyncio.TimeoutError, retryable_errors()[0])):
+                        self.counters["deadlineExceeded"] += 1
+                        raise LLMDeadlineExceeded(f"Model call to {model} ran out of time") from e
+                    raise
+                attempt += 1
+                self.counters["retries"] += 1
+                logger.warning(f"Model call to {model} failed ({type(e).__name__}); retry {attempt} in {delay:.2f}s")
+                await asyncio.sleep(delay)
+                continue
+            if record_latency:
+                self.latency(model).record(time.monotonic() - started)
+            return result
+
+    async def _complete_once(self, messages: list, model: str, temperature: float, max_tokens: int, deadline: float, acquired: bool = False) -> str:
+        if not acquired:
+            await self._acquire(deadline)
+        try:
+            async def request(timeout: float):
+                completion = await self.client.chat.completions.create(
+                    model=model, messages=messages, temperature=temperature, max_tokens=max_tokens, timeout=timeout
+                )
+                self.record_usage(model, completion.usage)
+                return completion.choices[0].message.content
+
+            return await self._attempts(request, model, deadline)
+        finally:
+            self._release()
+
+    def _hedge_delay(self, model: str) -> Optional[float]:
+        if self.fallback_model is None or self.fallback_model == model:
+            return None
+        tracker = self.latency(model)
+        if len(tracker) < self.hedge_min_samples:
+            return None
+        return max(self.hedge_min_delay_seconds, tracker.percentile(self.hedge_percentile))
+
+    async def complete(
+        self,
+        messages: list,
+        model: str,
+        temperature: float,
+        max_tokens: int,
+        deadline_seconds: Optional[float] = None,
+    ) -> str:
+        """
+        Return the model's reply to ``messages``.
+
+        Raises:
+            LLMDeadlineExceeded: When no reply arrived within the deadline.
+            openai.OpenAIError: When the call failed for good.
+        """
+        self.counters["calls"] += 1
+        if self._client is None:
+            # The SDK import is a one-off start-up cost, not part of this call's time budget
+            await self.warm_up()
+        deadline = time.monotonic() + (deadline_seconds or self.deadline_seconds)
+        hedge_delay = self._hedge_delay(model)
+        try:
+            with observe_stage("llm_call"):
+                if hedge_delay is None:
+                    return await self._complete_once(messages, model, temperature, max_tokens, deadline)
+                return await self._hedged(messages, model, temperature, max_tokens, deadline, hedge_delay)
+        except Exception:
+            self.counters["failures"] += 1
+            raise
+
+    async def _hedged(self, messages: list, model: str, temperature: float, max_tokens: int, deadline: float, hedge_delay: float) -> str:
+        primary = asyncio.ensure_future(self._complete_once(messages, model, temperature, max_tokens, deadline))
+        tasks = [primary]
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=hedge_delay)
+            # Hedge only with spare capacity; under saturation a second request would only deepen the queue
+            if done or self.semaphore.locked():
+                return await primary
+
+            await self._acquire(deadline)
+            self.counters["hedges"] += 1
+            logger.info(f"Model call to {model} exceeded {hedge_delay:.2f}s; hedging to {self.fallback_model}")
+            hedge = asyncio.ensure_future(
+                self._complete_once(messages, self.fallback_model, temperature, max_tokens, deadline, acquired=True)
+            )
+            tasks.append(hedge)
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            self.counters["hedgeWins"] += 1
+                        return task.result()
+            # Both failed: report the primary's error
+            return primary.result()
+        finally:
+            # Also reached when the caller is cancelled: no request is left running on its behalf
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    async def stream(
+        self,
+        messages: list,
+        model: str,
+        temperature: float,
+        max_tokens: int,
+        deadline_seconds: Optional[float] = None,
+    ) -> AsyncIterator[str]:
+        """
+        Yield the reply as content deltas. Opening the stream (until the first delta) is retried and
+        bounded by the deadline; once text has been yielded a failure is raised to the caller.
+        """
+        self.counters["calls"] += 1
+        if self._client is None:
+            await self.warm_up()
+        started = time.monotonic()
+        deadline = started + (deadline_seconds or self.deadline_seconds)
+        with observe_stage("llm_call"):
+            await self._acquire(deadline)
+            opened = []
+            try:
+                # With include_usage the last chunk carries the call's token usage and no choices
+                options = {"stream_options": {"include_usage": True}} if self.stream_usage else {}
+
+                async def request(timeout: float):
+                    stream = await self.client.chat.completions.create(
+                        model=model, messages=messages, temperature=temperature, max_tokens=max_tokens,
+                        stream=True, timeout=timeout, **options,
+                    )
+                    opened.append(stream)
+                    # Wait for the first delta inside the attempt so a stalled upstream is retried
+                    async for chunk in stream:
+                        if chunk.choices and chunk.choices[0].delta.content:
+                            return chunk.choices[0].delta.content, stream
+                    return None, stream
+
+                first, stream = await self._attempts(request, model, deadline, record_latency=False)
+                if first is None:
+                    return
+                LLM_FIRST_TOKEN_SECONDS.labels(model).observe(time.monotonic() - started)
+                yield first
+                async for chunk in stream:
+                    if not chunk.choices:
+                        self.record_usage(model, getattr(chunk, "usage", None))
+                        continue
+                    delta = chunk.choices[0].delta.content
+                    if delta:
+                        yield delta
+            except Exception:
+                self.counters["failures"] += 1
+                raise
+            finally:
+                # Abandoned attempts and early-closed streams give their connection back to the pool
+                for stream in opened:
+                    await stream.close()
+                self._release()
+
+
+def _build_gateway() -> LLMGateway:
+    settings = get_settings()
+    return LLMGateway(
+        base_url=settings.LLM_BASE_URL,
+        api_key=env_config.aimlapi_key,
+        max_concurrency=settings.LLM_MAX_CONCURRENCY,
+        max_connections=settings.LLM_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.LLM_MAX_KEEPALIVE_CONNECTIONS,
+        connect_timeout=settings.LLM_CONNECT_TIMEOUT_SECONDS,
+        request_timeout=settings.LLM_REQUEST_TIMEOUT_SECONDS,
+        deadline_seconds=settings.LLM_DEADLINE_SECONDS,
+        max_retries=settings.LLM_MAX_RETRIES,
+        backoff_seconds=settings.LLM_RETRY_BACKOFF_SECONDS,
+        backoff_max_seconds=settings.LLM_RETRY_BACKOFF_MAX_SECONDS,
+        fallback_model=settings.LLM_FALLBACK_MODEL,
+        hedge_percentile=settings.LLM_HEDGE_PERCENTILE,
+        hedge_min_delay_seconds=settings.LLM_HEDGE_MIN_DELAY_SECONDS,
+        stream_usage=settings.LLM_STREAM_USAGE,
+    )
+
+
+# Shared gateway; its client is created on the first call and closed by the application lifespan
+llm_gateway = _build_gateway()
@@ -1,73 +1,181 @@
+import logging
 import pymongo
 import datetime as dt
 from datetime import datetime as dtt
+from src.config.app_settings import get_settings
+from src.ai_model.session_cache import get_session_cache
+from src.ai_model.memory_writer import memory_writer
+from src.utilities.metrics import count_stage_error, timed_stage
 
+logger = logging.getLogger(__name__)
 
-def create_memory(collection, policy_number: str, prompt: str, ai_message: str):
+# Index names for the chat memory collection
+MEMORY_LOOKUP_INDEX = "policy_number_1_timestamp_-1"
+MEMORY_TTL_INDEX = "timestamp_ttl"
+
+
+def memory_window() -> dt.timedelta:
+    """The period a memory entry stays relevant, and alive in the collection."""
+    return dt.timedelta(minutes=get_settings().MEMORY_TTL_MINUTES)
+
+
+async def ensure_memory_indexes(collection):
+    """
+    This function creates the indexes the chat memory collection relies on and verifies that they exist.
+
+    - A compound (policy_number, timestamp desc) index that serves the lookup in retrieve_memory_with_k.
+    - A TTL index on timestamp, so MongoDB deletes entries once they fall out of the memory window.
+
+    Args:
+        collection: The async MongoDB collection holding the chat memory.
+
+    Raises:
+        RuntimeError: If an index is missing after creation.
+    """
+    ttl_seconds = int(memory_window().total_seconds())
+    existing = await collection.index_information()
+
+    await collection.create_index(
+        [("policy_number", pymongo.ASCENDING), ("timestamp", pymongo.DESCENDING)],
+        name=MEMORY_LOOKUP_INDEX,
+    )
+    ttl_index = existing.get(MEMORY_TTL_INDEX)
+    if ttl_index is None:
+        await collection.create_index("timestamp", name=MEMORY_TTL_INDEX, expireAfterSeconds=ttl_seconds)
+    elif ttl_index.get("expireAfterSeconds") != ttl_seconds:
+        # The window changed since the index was built; update it in place instead of rebuilding
+        await collection.database.command(
+            "collMod", collection.name,
+            index={"name": MEMORY_TTL_INDEX, "expireAfterSeconds": ttl_seconds},
+        )
+
+    indexes = await collection.index_information()
+    missing = [name for name in (MEMORY_LOOKUP_INDEX, MEMORY_TTL_INDEX) if name not in indexes]
+    if missing:
+        raise RuntimeError(f"Chat memory indexes missing after setup: {missing}")
+    if indexes[MEMORY_TTL_INDEX].get("expireAfterSeconds") != ttl_seconds:
+        raise RuntimeError(f"Chat memory TTL index does not expire after {ttl_seconds}s")
+
+
+@timed_stage("memory_write")
+async def create_memory(collection, policy_number: str, prompt: str, ai_message: str):
     """
     This function creates a new memory entry in a MongoDB collection for a specified user.
 
     Args:
-        collection: The MongoDB collection to insert the memory into.
+        collection: The async MongoDB collection to insert the memory into.
         policy_number (str): The user ID to associate with the memory.
         prompt (str): The user's prompt.
         ai_message (str): The AI's response message.
 
-    The function trims off a specified string from the ai_message before storing it.
+    The entry is also appended to the policy's session cache when that session is warm.
+    While the memory writer is running the insert is queued and batched instead of awaited.
     """
     try:
         data = {"user_prompt": prompt, "ai_response": ai_message}
         history = {
             "policy_number": policy_number,
             "History": {"type": "ai", "data": data},
-            "timestamp":dtt.utcnow().isoformat()
+            # A BSON date, so the TTL index can expire the entry
+            "timestamp":dtt.now(dt.timezone.utc)
         }
 
-        # Insert the data into the collection
-        collection.insert_one(history)
+        # Write through the session cache so the next turn does not need to read the collection
+        session_cache = get_session_cache()
+        if session_cache is not None:
+            await session_cache.append(policy_number, _cache_entry(history))
+
+        # Insert the data into the collection, off the request path when the write-behind queue is running
+        if memory_writer.running:
+            await memory_writer.enqueue(collection, history)
+        else:
+            await collection.insert_one(history)
     except Exception as e:
-        print(
-                "Error occurred while creating memory: %s", str(e), exc_info=1
-            )
+        count_stage_error("memory_write")
+        logger.error("Error occurred while creating memory: %s", str(e), exc_info=True)
  
 
-def retrieve_memory_with_k(collection, policy_number: str, k: int = 3):
+@timed_stage("memory_read")
+async def retrieve_turns_with_k(collection, policy_number: str, k: int = 3):
     """
-    This function retrieves the most recent entries from a MongoDB collection where the policy_number matches the provided policy_number.
-    It only returns entries if they were created within the last 1 minute. If no matching entries are found, or if the most recent
-    matching entries are older than 1 minute, the function returns None.
+    This function retrieves the most recent turns from a MongoDB collection where the policy_number matches the provided policy_number.
+    It only returns entries if they were created within the memory window (Settings.MEMORY_TTL_MINUTES). If no matching entries are
+    found, or if the most recent matching entries are older than the window, the function returns None.
+    Entries still waiting in the memory writer's queue are included, so a turn is visible as soon as create_memory returns.
 
     Args:
-        collection: The MongoDB collection to retrieve the memory from.
+        collection: The async MongoDB collection to retrieve the memory from.
         policy_number (str): The user ID to match.
         k (int): The number of memory messages to pull
 
     Returns:
-        list: The most recent matching entries in the collection, or None if no match is found or if the entries are older than 1 minute.
+        list: The most recent matching turns, oldest first, as {"user_prompt", "ai_response", "timestamp"} dicts,
+        or None if no match is found or if the entries are older than the window.
     """
-    # Query the collection for entries where the policy_number matches and the timestamp is within the last 15 minute
-    min_time = dtt.utcnow() - dt.timedelta(minutes=15)
-    query = {"policy_number": policy_number, "timestamp": {"$gte": min_time.isoformat()}}
+    # Serve warm sessions from the session cache
+    session_cache = get_session_cache()
+    use_cache = session_cache is not None and k <= session_cache.max_turns
+    if use_cache:
+        cached = await session_cache.get(policy_number)
+        if cached is not None:
+            return cached[-k:] or None
+
+    # Query the collection for entries where the policy_number matches and the timestamp is within the memory window.
+    # The TTL monitor only runs about once a minute, so the window is still applied here.
+    min_time = dtt.now(dt.timezone.utc) - memory_window()
+    query = {"policy_number": policy_number, "timestamp": {"$gte": min_time}}
     # Define the fields to return
-    projection = {"History": 1}
+    projection = {"History": 1, "timestamp": 1}
+    # Pull enough entries to fill the session cache, not just this call's k
+    limit = session_cache.max_turns if use_cache else k
+
+    # Turns still in the write-behind queue; taken before the query, so one written meanwhile is matched by _id
+    queued = [
+        document for document in memory_writer.pending(collection, "policy_number", policy_number)
+        if document["timestamp"] >= min_time
+    ]
 
     try:
         # Sort the results in descending order by timestamp and retrieve the first k results
-        result_ = collection.find(query,projection).sort([('timestamp', pymongo.DESCENDING)]).limit(k)
-        chat_history = []
-        result = list(result_)
+        result_ = collection.find(query,projection).sort([('timestamp', pymongo.DESCENDING)]).limit(limit)
+        result = await result_.to_list(length=limit)
+        stored_ids = {r["_id"] for r in result}
+        result = list(reversed(result)) + [d for d in queued if d.get("_id") not in stored_ids]
+        entries = sorted((_cache_entry(r) for r in result), key=lambda e: e["timestamp"])[-limit:]
+        if use_cache:
+            await session_cache.put(policy_number, entries)
         # Check if the query returned a result
-        if result != []:
-            for r in reversed(result):
-                chat_history.append(r['History']['data']['user_prompt'])
-                chat_history.append(r['History']['data']['ai_response'])
-            return chat_history
+        if entries != []:
+            return entries[-k:]
         else:
             # Return None if no match is found
             return None
     except pymongo.errors.PyMongoError as e:
-        print(
-                "Error occurred while retrieving memory: %s", str(e), exc_info=1
-            )
-        
+        count_stage_error("memory_read")
+        logger.error("Error occurred while retrieving memory: %s", str(e), exc_info=True)
+
+
+async def retrieve_memory_with_k(collection, policy_number: str, k: int = 3):
+    """
+    Like retrieve_turns_with_k, but returns the turns flattened into a list of alternating user prompts and AI responses.
+    """
+    return _chat_history(await retrieve_turns_with_k(collection, policy_number, k))
+
+
+def _cache_entry(history: dict) -> dict:
+    data = history["History"]["data"]
+    timestamp = history["timestamp"]
+    if timestamp.tzinfo is None:
+        # pymongo returns naive UTC datetimes by default
+        timestamp = timestamp.replace(tzinfo=dt.timezone.utc)
+    return {"user_prompt": data["user_prompt"], "ai_response": data["ai_response"], "timestamp": timestamp.timestamp()}
+
 
+def _chat_history(entries: list):
+    if not entries:
+        return None
+    chat_history = []
+    for entry in entries:
+        chat_history.append(entry["user_prompt"])
+        chat_history.append(entry["ai_response"])
+    return chat_history
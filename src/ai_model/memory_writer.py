@@ -0,0 +1,174 @@
+import asyncio
+import logging
+import random
+
+from pymongo.errors import BulkWriteError, PyMongoError
+
+from src.config.app_settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class MemoryWriteQueue:
+    """
+    Write-behind queue for chat memory entries.
+
+    Entries are queued by create_memory and written by a background task that batches them into
+    ``insert_many`` once ``batch_size`` entries are waiting or ``flush_interval`` seconds have passed.
+    Failed batches are retried with jittered exponential backoff, capped at ``max_backoff`` seconds
+    and ``max_retries`` retries. ``stop`` drains everything still queued before returning.
+
+    Until its batch is written (or dropped), a document can be found through ``pending``, so readers
+    missing the session cache still see turns that are only queued.
+    """
+
+    def __init__(
+        self,
+        batch_size: int = 100,
+        flush_interval: float = 0.5,
+        max_queue_size: int = 10000,
+        max_retries: int = 5,
+        base_backoff: float = 0.5,
+        max_backoff: float = 10.0,
+    ):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_queue_size = max_queue_size
+        self.max_retries = max_retries
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self._queue = None
+        self._batch_ready = None
+        self._task = None
+        # id(document) -> (collection, document), in queueing order, until the batch holding it is done
+        self._unwritten = {}
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self):
+        """Start the background writer on the running event loop."""
+        if self.running:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+        self._batch_ready = asyncio.Event()
+        self._task = asyncio.create_task(self._run(), name="memory-write-queue")
+
+    async def enqueue(self, collection, document: dict):
+        """Queue a document for insertion; waits only when the queue is full."""
+        self._unwritten[id(document)] = (collection, document)
+        await self._queue.put((collection, document))
+        if self._queue.qsize() >= self.batch_size:
+            self._batch_ready.set()
+
+    def pending(self, collection, field: str, value) -> list:
+        """
+        Documents for ``collection`` with ``document[field] == value`` that are queued or still being written,
+        oldest first. A document whose insert is under way already carries the ``_id`` it is written with.
+        """
+        return [
+            document for target, document in list(self._unwritten.values())
+            if target is collection and document.get(field) == value
+        ]
+
+    async def stop(self, timeout: float = 30.0):
+        """Flush every queued entry and stop the writer, giving up after ``timeout`` seconds."""
+        if not self.running:
+            return
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        self._batch_ready.set()
+        try:
+            try:
+                self._queue.put_nowait(_STOP)
+            except asyncio.QueueFull:
+                # The writer frees room as it drains; waiting for it counts against the same timeout
+                await asyncio.wait_for(self._queue.put(_STOP), timeout)
+            await asyncio.wait_for(asyncio.shield(self._task), max(0.0, deadline - loop.time()))
+        except asyncio.TimeoutError:
+            self._task.cancel()
+            lost = len(self._unwritten)
+            self._unwritten.clear()
+            logger.error(f"Memory writer did not drain within {timeout}s; {lost} entries may not have been persisted")
+        self._task = None
+
+    async def _run(self):
+        while True:
+            first = await self._queue.get()
+            if first is _STOP:
+                return
+            batch = [first]
+
+            # Wait for a full batch, or until the flush interval elapses
+            if self._queue.qsize() < self.batch_size - 1:
+                self._batch_ready.clear()
+                try:
+                    await asyncio.wait_for(self._batch_ready.wait(), self.flush_interval)
+                except asyncio.TimeoutError:
+                    pass
+
+            stopping = False
+            while len(batch) < self.batch_size and not self._queue.empty():
+                item = self._queue.get_nowait()
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            try:
+                await self._flush(batch)
+            except Exception as e:
+                logger.error(f"Unexpected error while persisting {len(batch)} memory entries: {e}")
+            if stopping:
+                return
+
+    async def _flush(self, batch: list):
+        by_collection = {}
+        for collection, document in batch:
+            by_collection.setdefault(id(collection), (collection, []))[1].append(document)
+        for collection, documents in by_collection.values():
+            try:
+                await self._insert_with_retry(collection, documents)
+            finally:
+                for document in documents:
+                    self._unwritten.pop(id(document), None)
+
+    async def _insert_with_retry(self, collection, documents: list):
+        error = None
+        for attempt in range(self.max_retries + 1):
+            try:
+                await collection.insert_many(documents, ordered=False)
+                return
+            except BulkWriteError as e:
+                # Duplicate keys mean an earlier attempt already wrote those documents
+                write_errors = e.details.get("writeErrors", [])
+                if write_errors and all(err.get("code") == 11000 for err in write_errors) \
+                        and not e.details.get("writeConcernErrors"):
+                    return
+                error = e
+            except PyMongoError as e:
+                error = e
+
+            if attempt < self.max_retries:
+                delay = min(self.max_backoff, self.base_backoff * 2 ** attempt) * random.uniform(0.5, 1.0)
+                logger.warning(f"Memory batch write failed (attempt {attempt + 1}), retrying in {delay:.2f}s: {error}")
+                await asyncio.sleep(delay)
+
+        logger.error(f"Dropping {len(documents)} memory entries after {self.max_retries + 1} attempts: {error}")
+
+
+def _build_memory_writer() -> MemoryWriteQueue:
+    settings = get_settings()
+    return MemoryWriteQueue(
+        batch_size=settings.MEMORY_WRITE_BATCH_SIZE,
+        flush_interval=settings.MEMORY_WRITE_FLUSH_SECONDS,
+        max_queue_size=settings.MEMORY_WRITE_QUEUE_SIZE,
+        max_retries=settings.MEMORY_WRITE_MAX_RETRIES,
+    )
+
+
+# Shared writer, started and drained by the application lifespan
+memory_writer = _build_memory_writer()
@@ -0,0 +1,255 @@
+import asyncio
+import hashlib
+import json
+import logging
+import re
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Optional
+
+from pymongo import ASCENDING
+from pymongo.asynchronous.collection import AsyncCollection
+from pymongo.asynchronous.database import AsyncDatabase
+from pymongo.errors import PyMongoError
+
+from src.config.app_settings import get_settings
+from src.utilities.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+RESPONSE_CACHE_COLLECTION = "llm_response_cache"
+
+_TRAILING_SPACE = re.compile(r"[ \t]+\n")
+_BLANK_LINES = re.compile(r"\n{3,}")
+
+
+def normalise_content(content: str) -> str:
+    """Whitespace-only differences in a rendered prompt should not produce a different cache key."""
+    content = _TRAILING_SPACE.sub("\n", content.replace("\r\n", "\n"))
+    return _BLANK_LINES.sub("\n\n", content).strip()
+
+
+def response_cache_key(model: str, temperature: float, messages: list, **params) -> str:
+    """SHA-256 of the model, sampling parameters and the normalised, fully rendered messages."""
+    payload = {
+        "model": model,
+        "temperature": temperature,
+        "params": params,
+        "messages": [
+            {"role": message["role"], "content": normalise_content(str(message.get("content", "")))}
+            for message in messages
+        ],
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, separators=(",", ":")).encode()).hexdigest()
+
+
+class ResponseCache(ABC):
+    """
+    Cache of model replies keyed by ``response_cache_key``, with hit/miss counters.
+
+    Backends never raise on a failed read or write; the call simply goes to the model.
+    """
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    async def open(self, database: AsyncDatabase) -> None:
+        pass
+
+    @abstractmethod
+    async def _get(self, key: str) -> Optional[str]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def _set(self, key: str, response: str) -> None:
+        raise NotImplementedError
+
+    async def get(self, key: str) -> Optional[str]:
+        response = await self._get(key)
+        if response is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return response
+
+    async def set(self, key: str, response: str) -> None:
+        await self._set(key, response)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "backend": type(self).__name__,
+            "hits": self.hits,
+            "misses": self.misses,
+            "errors": self.errors,
+            "hitRatio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+    async def close(self) -> None:
+        pass
+
+
+class InMemoryResponseCache(ResponseCache):
+    """Replies cached in this worker process, least recently used evicted first."""
+
+    def __init__(self, max_entries: int, max_bytes: int, ttl_seconds: float):
+        super().__init__(ttl_seconds)
+        self._responses = TTLCache(max_entries=max_entries, ttl_seconds=ttl_seconds, max_bytes=max_bytes, sizeof=len)
+
+    async def _get(self, key: str) -> Optional[str]:
+        return self._responses.get(key)
+
+    async def _set(self, key: str, response: str) -> None:
+        self._responses.set(key, response)
+
+
+class SqliteResponseCache(ResponseCache):
+    """Replies cached in a local SQLite file (WAL mode), shared by every worker process on the host."""
+
+    def __init__(self, path: str, max_entries: int, ttl_seconds: float):
+        super().__init__(ttl_seconds)
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = None
+        self._writes = 0
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                " key TEXT PRIMARY KEY, response TEXT NOT NULL, expires_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at)")
+            self._conn = conn
+        return self._conn
+
+    def _read(self, key: str) -> Optional[str]:
+        with self._lock:
+            conn = self._connection()
+            now = time.time()
+            row = conn.execute("SELECT response FROM responses WHERE key = ? AND expires_at > ?", (key, now)).fetchone()
+            if row is None:
+                return None
+            conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+            return row[0]
+
+    def _write(self, key: str, response: str) -> None:
+        with self._lock:
+            conn = self._connection()
+            now = time.time()
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, response, expires_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, response, now + self.ttl_seconds, now),
+            )
+            self._writes += 1
+            # Evicting on every write would count the table each time; every 100 writes is enough
+            if self._writes % 100 == 0:
+                conn.execute("DELETE FROM responses WHERE expires_at <= ?", (now,))
+                conn.execute(
+                    "DELETE FROM responses WHERE key IN (SELECT key FROM responses ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,),
+                )
+
+    async def _get(self, key: str) -> Optional[str]:
+        try:
+            return await asyncio.to_thread(self._read, key)
+        except sqlite3.Error as e:
+            self.errors += 1
+            logger.warning(f"LLM response cache read failed: {e}")
+            return None
+
+    async def _set(self, key: str, response: str) -> None:
+        try:
+            await asyncio.to_thread(self._write, key, response)
+        except sqlite3.Error as e:
+            self.errors += 1
+            logger.warning(f"LLM response cache write failed: {e}")
+
+    async def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+class MongoResponseCache(ResponseCache):
+    """Replies cached in the ``llm_response_cache`` collection, shared by every worker; a TTL index expires them."""
+
+    def __init__(self, ttl_seconds: float, collection_name: str = RESPONSE_CACHE_COLLECTION):
+        super().__init__(ttl_seconds)
+        self.collection_name = collection_name
+        self.collection: Optional[AsyncCollection] = None
+
+    async def open(self, database: AsyncDatabase) -> None:
+        self.collection = database[self.collection_name]
+        await self.collection.create_index([("expiresAt", ASCENDING)], name="expiresAt_ttl", expireAfterSeconds=0)
+
+    async def _get(self, key: str) -> Optional[str]:
+        if self.collection is None:
+            return None
+        try:
+            # The TTL monitor only runs once a minute, so expiry is checked here as well
+            document = await self.collection.find_one(
+                {"_id": key, "expiresAt": {"$gt": datetime.now(timezone.utc)}}, projection={"response": 1}
+            )
+        except PyMongoError as e:
+            self.errors += 1
+            logger.warning(f"LLM response cache read failed: {e}")
+            return None
+        return None if document is None else document["response"]
+
+    async def _set(self, key: str, response: str) -> None:
+        if self.collection is None:
+            return
+        try:
+            await self.collection.replace_one(
+                {"_id": key},
+                {"response": response, "expiresAt": datetime.now(timezone.utc) + timedelta(seconds=self.ttl_seconds)},
+                upsert=True,
+            )
+        except PyMongoError as e:
+            self.errors += 1
+            logger.warning(f"LLM response cache write failed: {e}")
+
+
+_response_cache = None
+_response_cache_built = False
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """Return the process-wide LLM response cache configured in Settings, or None when disabled."""
+    global _response_cache, _response_cache_built
+    if not _response_cache_built:
+        settings = get_settings()
+        backend = settings.LLM_CACHE_BACKEND.lower()
+        _response_cache = None
+        if backend == "memory":
+            _response_cache = InMemoryResponseCache(
+                max_entries=settings.LLM_CACHE_MAX_ENTRIES,
+                max_bytes=settings.LLM_CACHE_MAX_BYTES,
+                ttl_seconds=settings.LLM_CACHE_TTL_SECONDS,
+            )
+        elif backend == "sqlite":
+            _response_cache = SqliteResponseCache(
+                path=settings.LLM_CACHE_PATH,
+                max_entries=settings.LLM_CACHE_MAX_ENTRIES,
+                ttl_seconds=settings.LLM_CACHE_TTL_SECONDS,
+            )
+        elif backend == "mongo":
+            _response_cache = MongoResponseCache(ttl_seconds=settings.LLM_CACHE_TTL_SECONDS)
+        elif backend not in ("none", "off", ""):
+            raise ValueError(f"Unknown LLM_CACHE_BACKEND: {settings.LLM_CACHE_BACKEND}")
+        _response_cache_built = True
+    return _response_cache
@@ -0,0 +1,255 @@
+import asyncio
+import json
+import logging
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Optional
+
+from src.config.app_settings import get_settings
+from src.utilities.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+
+def _entries_size(entries: list) -> int:
+    return sum(len(e["user_prompt"]) + len(e["ai_response"]) + 64 for e in entries)
+
+
+def _within_window(entries: list, window_seconds: float) -> list:
+    min_time = time.time() - window_seconds
+    return [e for e in entries if e["timestamp"] >= min_time]
+
+
+class SessionCache(ABC):
+    """
+    Per-policy cache of the most recent chat memory entries, layered in front of the memory collection.
+
+    A policy's session is only cached once it has been loaded from MongoDB in full (``put``), so a warm
+    session can answer retrieve_memory_with_k on its own; ``append`` only extends sessions that are warm.
+    Entries are dicts of ``user_prompt``, ``ai_response`` and a ``timestamp`` in epoch seconds.
+    """
+
+    def __init__(self, max_turns: int, window_seconds: float):
+        self.max_turns = max_turns
+        self.window_seconds = window_seconds
+
+    @abstractmethod
+    async def get(self, policy_number: str) -> Optional[list]:
+        """Return the cached entries within the memory window, or None if the session is cold."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def put(self, policy_number: str, entries: list) -> None:
+        """Cache the full recent history of a policy, oldest entry first."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def append(self, policy_number: str, entry: dict) -> bool:
+        """Append an entry to a warm session; returns False if the session is cold."""
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        pass
+
+
+class InMemorySessionCache(SessionCache):
+    """Session cache local to one worker process."""
+
+    def __init__(self, max_sessions: int, max_bytes: int, max_turns: int, window_seconds: float):
+        super().__init__(max_turns, window_seconds)
+        self._sessions = TTLCache(
+            max_entries=max_sessions,
+            ttl_seconds=window_seconds,
+            max_bytes=max_bytes,
+            sizeof=_entries_size,
+        )
+
+    async def get(self, policy_number: str) -> Optional[list]:
+        entries = self._sessions.get(policy_number)
+        if entries is None:
+            return None
+        return _within_window(entries, self.window_seconds)
+
+    async def put(self, policy_number: str, entries: list) -> None:
+        self._sessions.set(policy_number, list(entries[-self.max_turns:]))
+
+    async def append(self, policy_number: str, entry: dict) -> bool:
+        entries = self._sessions.get(policy_number)
+        if entries is None:
+            return False
+        self._sessions.set(policy_number, (entries + [entry])[-self.max_turns:])
+        return True
+
+
+class SqliteSessionCache(SessionCache):
+    """
+    Session cache in a local SQLite file (WAL mode), shared by every worker process on the host
+    so a turn served by one worker sees the exchanges written by another.
+    """
+
+    def __init__(self, path: str, max_sessions: int, max_bytes: int, max_turns: int, window_seconds: float):
+        super().__init__(max_turns, window_seconds)
+        self.path = Path(path)
+        self.max_sessions = max_sessions
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn = None
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS sessions ("
+                " policy_number TEXT PRIMARY KEY, entries TEXT NOT NULL, size INTEGER NOT NULL,"
+                " expires_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS sessions_accessed_at ON sessions (accessed_at)")
+            self._conn = conn
+        return self._conn
+
+    def _get(self, policy_number: str) -> Optional[list]:
+        with self._lock:
+            conn = self._connection()
+            now = time.time()
+            row = conn.execute(
+                "SELECT entries FROM sessions WHERE policy_number = ? AND expires_at > ?", (policy_number, now)
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute("UPDATE sessions SET accessed_at = ? WHERE policy_number = ?", (now, policy_number))
+            return json.loads(row[0])
+
+    def _put(self, policy_number: str, entries: list) -> None:
+        entries = entries[-self.max_turns:]
+        with self._lock:
+            conn = self._connection()
+            now = time.time()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute(
+                    "INSERT OR REPLACE INTO sessions (policy_number, entries, size, expires_at, accessed_at)"
+                    " VALUES (?, ?, ?, ?, ?)",
+                    (policy_number, json.dumps(entries), _entries_size(entries), now + self.window_seconds, now),
+                )
+                self._evict(conn, now)
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+    def _append(self, policy_number: str, entry: dict) -> bool:
+        with self._lock:
+            conn = self._connection()
+            now = time.time()
+            # Read-modify-write under a write lock so concurrent workers never lose an entry
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute(
+                    "SELECT entries FROM sessions WHERE policy_number = ? AND expires_at > ?", (policy_number, now)
+                ).fetchone()
+                if row is None:
+                    conn.execute("COMMIT")
+                    return False
+                entries = (json.loads(row[0]) + [entry])[-self.max_turns:]
+                conn.execute(
+                    "UPDATE sessions SET entries = ?, size = ?, expires_at = ?, accessed_at = ? WHERE policy_number = ?",
+                    (json.dumps(entries), _entries_size(entries), now + self.window_seconds, now, policy_number),
+                )
+                conn.execute("COMMIT")
+                return True
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+    def _evict(self, conn: sqlite3.Connection, now: float) -> None:
+        conn.execute("DELETE FROM sessions WHERE expires_at <= ?", (now,))
+        count, total = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM sessions").fetchone()
+        if count > self.max_sessions:
+            conn.execute(
+                "DELETE FROM sessions WHERE policy_number IN"
+                " (SELECT policy_number FROM sessions ORDER BY accessed_at LIMIT ?)",
+                (count - self.max_sessions,),
+            )
+        while total > self.max_bytes:
+            row = conn.execute("SELECT policy_number, size FROM sessions ORDER BY accessed_at LIMIT 1").fetchone()
+            if row is None:
+                break
+            conn.execute("DELETE FROM sessions WHERE policy_number = ?", (row[0],))
+            total -= row[1]
+
+    async def get(self, policy_number: str) -> Optional[list]:
+        try:
+            entries = await asyncio.to_thread(self._get, policy_number)
+        except sqlite3.Error as e:
+            logger.warning(f"Session cache read failed, falling back to MongoDB: {e}")
+            return None
+        if entries is None:
+            return None
+        return _within_window(entries, self.window_seconds)
+
+    async def put(self, policy_number: str, entries: list) -> None:
+        try:
+            await asyncio.to_thread(self._put, policy_number, entries)
+        except sqlite3.Error as e:
+            logger.warning(f"Session cache write failed: {e}")
+
+    async def append(self, policy_number: str, entry: dict) -> bool:
+        try:
+            return await asyncio.to_thread(self._append, policy_number, entry)
+        except sqlite3.Error as e:
+            logger.warning(f"Session cache append failed: {e}")
+            # Drop the session so nobody serves history that is missing this entry
+            await asyncio.to_thread(self._drop, policy_number)
+            return False
+
+    def _drop(self, policy_number: str) -> None:
+        try:
+            with self._lock:
+                self._connection().execute("DELETE FROM sessions WHERE policy_number = ?", (policy_number,))
+        except sqlite3.Error:
+            pass
+
+    async def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+_session_cache = None
+_session_cache_built = False
+
+
+def get_session_cache() -> Optional[SessionCache]:
+    """Return the process-wide session cache configured in Settings, or None when disabled."""
+    global _session_cache, _session_cache_built
+    if not _session_cache_built:
+        settings = get_settings()
+        window_seconds = settings.MEMORY_TTL_MINUTES * 60
+        backend = settings.SESSION_CACHE_BACKEND.lower()
+        _session_cache = None
+        if backend == "memory":
+            _session_cache = InMemorySessionCache(
+                max_sessions=settings.SESSION_CACHE_MAX_SESSIONS,
+                max_bytes=settings.SESSION_CACHE_MAX_BYTES,
+                max_turns=settings.SESSION_CACHE_TURNS,
+                window_seconds=window_seconds,
+            )
+        elif backend == "sqlite":
+            _session_cache = SqliteSessionCache(
+                path=settings.SESSION_CACHE_PATH,
+                max_sessions=settings.SESSION_CACHE_MAX_SESSIONS,
+                max_bytes=settings.SESSION_CACHE_MAX_BYTES,
+                max_turns=settings.SESSION_CACHE_TURNS,
+                window_seconds=window_seconds,
+            )
+        elif backend not in ("none", "off", ""):
+            raise ValueError(f"Unknown SESSION_CACHE_BACKEND: {settings.SESSION_CACHE_BACKEND}")
+        _session_cache_built = True
+    return _session_cache
@@ -1,4 +1,7 @@
 import asyncio
+import hashlib
+import json
+import logging
 from datetime import datetime, timedelta
 import os
 from pathlib import Path
@@ -14,21 +17,38 @@ from fastapi import (
     Form,
     HTTPException,
     Header,
+    Query,
     Request,
     UploadFile,
     status,
 )
 from src.services.process_claim import ProcessClaim
+from src.services.file_upload import UploadRejected, stream_upload_to_disk
+from src.services.claim_analysis import claim_analysis_queue
+from src.infrastructure.database.claims_repository import InvalidCursor, claims_repository
+from src.infrastructure.database.policy_repository import policy_repository
+from src.ai_model.response_cache import get_response_cache
+from src.ai_model.llm_gateway import LLMDeadlineExceeded, llm_gateway
+from src.services.claim_events import CLAIM_STATUS_TOPIC
+from src.services.event_bus import TooManySubscribers, event_bus
+from src.services.health import health_monitor
+from src.infrastructure.evidence_store import IngestResult, evidence_store
+from src.domain.evidencesynthesisengine.documentunderstanding import document_engine
 from src.application.datamodels import *
 from src.config.app_settings import get_settings
-from fastapi.responses import JSONResponse
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from src.config.appconfig import env_config
-from src.utilities.cold_start import generate_mock_claim_data, generate_mock_claims_list
+from src.utilities.utils import strip_bold_markers
+from src.utilities.metrics import HTTP_SHED, count_stage_error, observe_stage, render_metrics, timed_stage
 
 # Get application settings from the settings module
 settings = get_settings()
+logger = logging.getLogger(__name__)
 
 claim_router = APIRouter()
+# Probes; mounted without claim_router's dependencies so they answer before the database is connected
+health_router = APIRouter()
 
 # Configuration constants
 MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
@@ -43,6 +63,19 @@ ALLOWED_MIME_TYPES = {
     "text/plain",
 }
 UPLOAD_DIR = "uploads/claims"  # Configure this path
+MAX_BATCH_FILES = 20
+# Room for multipart boundaries, part headers and form fields on top of the files themselves
+MULTIPART_OVERHEAD = 64 * 1024
+UPLOAD_CONCURRENCY = 4  # Files of one batch persisted at the same time
+
+
+def api_key_valid(x_api_key: Optional[str]) -> bool:
+    """Check the X-API-KEY header; rejected keys are counted as api_key_check errors."""
+    with observe_stage("api_key_check"):
+        valid = x_api_key == env_config.x_api_key
+    if not valid:
+        count_stage_error("api_key_check")
+    return valid
 
 
 # Define a health check endpoint
@@ -56,17 +89,68 @@ def health():
     return "healthy"
 
 
+@health_router.get("/health/live", status_code=status.HTTP_200_OK)
+async def liveness():
+    """Liveness probe: the process is up and its event loop is turning. Never touches a dependency."""
+    return health_monitor.liveness()
+
+
+@health_router.get("/health/ready")
+async def readiness():
+    """
+    Readiness probe: 200 when MongoDB and the evidence disk passed their last background check, 503 otherwise.
+    Reports every dependency with its check latency; answering costs a dict lookup, not a round trip.
+    """
+    ready, report = health_monitor.readiness()
+    return JSONResponse(status_code=200 if ready else 503, content=report)
+
+
+@claim_router.get("/metrics")
+def metrics():
+    """Prometheus metrics of this worker: per-stage latency histograms, in-flight gauges, errors and token counts."""
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
+
+
+@claim_router.get("/llm-cache/stats")
+async def llm_cache_stats(x_api_key: Optional[str] = Header(None, alias="X-API-KEY")):
+    """Hit/miss counters of this worker's LLM response cache."""
+    if not api_key_valid(x_api_key):
+        return JSONResponse(
+            status_code=401, content={"message": "Unauthorized access: Invalid API key"}
+        )
+    response_cache = get_response_cache()
+    if response_cache is None:
+        return JSONResponse(content={"backend": None})
+    return JSONResponse(content=response_cache.stats())
+
+
+@claim_router.get("/llm-gateway/stats")
+async def llm_gateway_stats(x_api_key: Optional[str] = Header(None, alias="X-API-KEY")):
+    """Call counters, latency and token usage (incl. prompt-cache hits) of this worker's model calls."""
+    if not api_key_valid(x_api_key):
+        return JSONResponse(
+            status_code=401, content={"message": "Unauthorized access: Invalid API key"}
+        )
+    return JSONResponse(content=llm_gateway.stats())
+
+
 @claim_router.post("/verify-customer", response_model=CustomerLoginResponse)
 async def customer_login(
     customer_login_payload: CustomerLoginPayload,
     x_api_key: Optional[str] = Header(None, alias="X-API-KEY"),
 ):
-    if x_api_key != env_config.x_api_key:
+    if not api_key_valid(x_api_key):
         # Return an unauthorized error response
         return JSONResponse(
             status_code=401, content={"message": "Unauthorized access: Invalid API key"}
         )
     try:
+        # Loads the policy into the cache so the claimant's first chat turns never wait on the database
+        if not await policy_repository.warm(customer_login_payload.policyNumber):
+            return JSONResponse(
+                status_code=404, content={"message": "Policy not found"}
+            )
         rand_token = uuid4().hex[:5]
         customerLoginResponse = CustomerLoginResponse(
             token=rand_token, policyNumber=customer_login_payload.policyNumber
@@ -77,7 +161,7 @@ async def customer_login(
         )
     except Exception as e:
         # Log the error
-        print(f"Error in login endpoint: {str(e)}")
+        logger.error("Error in login endpoint: %s", e, exc_info=True)
         # Return an error response
         return JSONResponse(
             status_code=500, content={"message": f"An error occurred {e}"}
@@ -90,7 +174,7 @@ async def claim_processing(
     claim_application_payload: ClaimApplicationPayload,
     x_api_key: Optional[str] = Header(None, alias="X-API-KEY"),
 ):
-    if x_api_key != env_config.x_api_key:
+    if not api_key_valid(x_api_key):
         # Return an unauthorized error response
         return JSONResponse(
             status_code=401, content={"message": "Unauthorized access: Invalid API key"}
@@ -98,7 +182,7 @@ async def claim_processing(
     try:
         db_client = request.app.state.db_client
         processClaim = ProcessClaim()
-        result = processClaim.run_claim_processing(
+        result = await processClaim.run_claim_processing(
             claim_application_payload, db_client_config=db_client
         )
 
@@ -108,15 +192,59 @@ async def claim_processing(
             content=claimApplicationResponse.model_dump(),
             status_code=claimApplicationResponse.status,
         )
+    except LLMDeadlineExceeded as e:
+        logger.error("Error in process claim endpoint: %s", e, exc_info=True)
+        return JSONResponse(
+            status_code=504, content={"message": "The assistant is taking too long to respond, please try again"}
+        )
     except Exception as e:
         # Log the error
-        print(f"Error in process claim endpoint: {str(e)}")
+        logger.error("Error in process claim endpoint: %s", e, exc_info=True)
         # Return an error response
         return JSONResponse(
             status_code=500, content={"message": f"An error occurred {e}"}
         )
 
 
+@claim_router.post("/process-claim/stream")
+async def claim_processing_stream(
+    request: Request,
+    claim_application_payload: ClaimApplicationPayload,
+    x_api_key: Optional[str] = Header(None, alias="X-API-KEY"),
+):
+    """
+    Stream the AI reply as Server-Sent Events.
+    Each `message` event carries a `delta` of text; a final `done` or `error` event closes the stream.
+    """
+    if not api_key_valid(x_api_key):
+        # Return an unauthorized error response
+        return JSONResponse(
+            status_code=401, content={"message": "Unauthorized access: Invalid API key"}
+        )
+
+    db_client = request.app.state.db_client
+    processClaim = ProcessClaim()
+
+    async def event_stream():
+        try:
+            deltas = processClaim.stream_claim_processing(
+                claim_application_payload, db_client_config=db_client
+            )
+            async for delta in strip_bold_markers(deltas):
+                yield f"data: {json.dumps({'delta': delta})}\n\n"
+            yield f"event: done\ndata: {json.dumps({'status': 200})}\n\n"
+        except Exception as e:
+            # Log the error
+            logger.error("Error in process claim stream endpoint: %s", e, exc_info=True)
+            yield f"event: error\ndata: {json.dumps({'message': f'An error occurred {e}'})}\n\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @claim_router.post("/claims/uploads")
 async def claim_processing_file_upload(
     request: Request,
@@ -129,29 +257,33 @@ async def claim_processing_file_upload(
     """
     
     # Validate API key
-    if x_api_key != env_config.x_api_key:
+    if not api_key_valid(x_api_key):
         return JSONResponse(
             status_code=401, 
             content={"message": "Unauthorized access: Invalid API key"}
         )
 
     try:
-        # Read file content
-        content = await file.read()
-        
         # Generate safe filename
-        safe_filename = "".join(c for c in file.filename if c.isalnum() or c in "._-")
+        safe_filename = _safe_filename(file.filename)
         splitted_filenames = safe_filename.split("riaˆ")
-        os.makedirs(f"src/assets/uploads/{splitted_filenames[0]}/", exist_ok=True)
-        # Save file (example - adjust path as needed)
-        file_path = f"src/assets/uploads/{splitted_filenames[0]}/{splitted_filenames[1]}"
-        with open(file_path, "wb") as f:
-            f.write(content)
+        if len(splitted_filenames) != 2 or any(part in ("", ".", "..") for part in splitted_filenames):
+            return JSONResponse(
+                status_code=400,
+                content={"message": f"Filename '{file.filename}' is not in the expected <policy>riaˆ<name> format"}
+            )
+        # Stream the file into the evidence store, enforcing size and type limits as it arrives
+        stored = await _store_evidence(file, splitted_filenames[0], splitted_filenames[1])
         
-        print(f"Successfully uploaded file: {file.filename} -> {safe_filename}")
+        logger.debug(
+            "Uploaded evidence file",
+            extra={"policy_number": splitted_filenames[0], "sha256": stored.digest[:12], "deduplicated": stored.deduplicated},
+        )
         db_client = request.app.state.db_client
         processClaim = ProcessClaim()
-        result = processClaim.save_claim_processing_docs(splitted_filenames[0], db_client)
+        result = await processClaim.save_claim_processing_docs(splitted_filenames[0], db_client)
+        # New evidence means a new claim or a fresh analysis of an existing one
+        await claim_analysis_queue.submit(splitted_filenames[0], restart=True)
 
         # Return response format that frontend expects
         return JSONResponse(
@@ -159,12 +291,22 @@ async def claim_processing_file_upload(
             content={
                 "message": "File uploaded successfully",
                 "filename": safe_filename,
-                "url": f"/uploads/{safe_filename}"  
+                # The claim's documents and their extracted fields
+                "url": f"{settings.API_V1_STR}/claims/{splitted_filenames[0]}/documents",
+                "size": stored.size,
+                "sha256": stored.digest,
+                "mimeType": stored.mime_type,
+                "deduplicated": stored.deduplicated,
             }
         )
-        
+
+    except UploadRejected as rejected:
+        return JSONResponse(
+            status_code=rejected.status_code,
+            content={"message": f"Error processing file '{file.filename}': {rejected.message}"}
+        )
     except Exception as file_error:
-        print(f"Error processing file {file.filename}: {str(file_error)}")
+        logger.error("Error processing file %s: %s", file.filename, file_error, exc_info=True)
         return JSONResponse(
             status_code=500,
             content={
@@ -174,98 +316,384 @@ async def claim_processing_file_upload(
 
 
 
-@claim_router.get("/claims/claimant-list")
-async def get_mock_claims_list(
+@claim_router.post("/claims/uploads/batch")
+async def claim_processing_batch_upload(
+    request: Request,
+    policyNumber: str = Form(...),
+    files: List[UploadFile] = File(...),
     x_api_key: Optional[str] = Header(None, alias="X-API-KEY"),
 ):
     """
-    Get list of mock claims for dashboard
+    Upload a claim form and its supporting evidence in one multipart request.
+    Files are persisted concurrently, a single memory entry is recorded for the batch,
+    and the response carries a status for every file.
     """
-    if x_api_key != env_config.x_api_key:
+
+    # Validate API key
+    if not api_key_valid(x_api_key):
         return JSONResponse(
             status_code=401, 
             content={"message": "Unauthorized access: Invalid API key"}
         )
-    
+
+    policy_dir = _safe_filename(policyNumber)
+    if policy_dir in ("", ".", ".."):
+        return JSONResponse(status_code=400, content={"message": "Invalid policy number"})
+    if len(files) > MAX_BATCH_FILES:
+        return JSONResponse(
+            status_code=400,
+            content={"message": f"A batch may contain at most {MAX_BATCH_FILES} files"}
+        )
+
+    semaphore = asyncio.Semaphore(UPLOAD_CONCURRENCY)
+    seen_names = set()
+
+    async def persist(file: UploadFile) -> dict:
+        safe_filename = _safe_filename(file.filename or "")
+        if safe_filename in ("", ".", ".."):
+            return {"filename": file.filename, "status": 400, "message": "Invalid filename"}
+        if safe_filename in seen_names:
+            return {"filename": safe_filename, "status": 409, "message": "Duplicate filename in batch"}
+        seen_names.add(safe_filename)
+
+        async with semaphore:
+            try:
+                stored = await _store_evidence(file, policy_dir, safe_filename)
+                return {
+                    "filename": safe_filename,
+                    "status": 201,
+                    "url": f"{settings.API_V1_STR}/claims/{policy_dir}/documents",
+                    "size": stored.size,
+                    "sha256": stored.digest,
+                    "mimeType": stored.mime_type,
+                    "deduplicated": stored.deduplicated,
+                }
+            except UploadRejected as rejected:
+                return {"filename": safe_filename, "status": rejected.status_code, "message": rejected.message}
+            except Exception as file_error:
+                logger.error("Error processing file %s: %s", file.filename, file_error, exc_info=True)
+                return {"filename": safe_filename, "status": 500, "message": str(file_error)}
+
     try:
-        claims_list = generate_mock_claims_list()
-        
+        results = await asyncio.gather(*(persist(file) for file in files))
+        uploaded = [result["filename"] for result in results if result["status"] == 201]
+
+        # One memory entry for the whole batch rather than one per file
+        if uploaded:
+            db_client = request.app.state.db_client
+            processClaim = ProcessClaim()
+            await processClaim.save_claim_processing_docs(policy_dir, db_client, filenames=uploaded)
+            # New evidence means a new claim or a fresh analysis of an existing one
+            await claim_analysis_queue.submit(policy_dir, restart=True)
+
+        if len(uploaded) == len(results):
+            status_code, message = 201, "Files uploaded successfully"
+        elif uploaded:
+            status_code, message = 207, "Some files could not be uploaded"
+        else:
+            status_code, message = 400, "No files could be uploaded"
         return JSONResponse(
-            status_code=200,
+            status_code=status_code,
             content={
-                "status": "completed",
-                "data": claims_list,
-                "total": len(claims_list)
+                "message": message,
+                "uploaded": len(uploaded),
+                "failed": len(results) - len(uploaded),
+                "files": results,
             }
         )
-        
+
+    except Exception as e:
+        logger.error("Error in batch upload endpoint: %s", e, exc_info=True)
+        return JSONResponse(
+            status_code=500,
+            content={"message": f"An error occurred: {e}"}
+        )
+
+
+def _safe_filename(filename: str) -> str:
+    return "".join(c for c in filename if c.isalnum() or c in "._-")
+
+
+@timed_stage("file_write")
+async def _store_evidence(file: UploadFile, policy_number: str, filename: str) -> IngestResult:
+    """Stream an upload to the evidence store's staging area, then ingest it under its content hash."""
+    staged = evidence_store.staging_path(Path(filename).suffix.lower())
+    stored = await stream_upload_to_disk(
+        file, staged, MAX_FILE_SIZE, ALLOWED_EXTENSIONS, ALLOWED_MIME_TYPES
+    )
+    try:
+        ingested = await evidence_store.ingest(
+            staged, stored.sha256, stored.size, stored.mime_type, policy_number, filename
+        )
+    except Exception:
+        staged.unlink(missing_ok=True)
+        raise
+    # Parse the document in the background so its analysis is cached before anyone asks for it
+    document_engine.schedule(ingested.digest, ingested.mime_type)
+    return ingested
+
+
+@claim_router.get("/claims/{policy_number}/documents")
+async def get_claim_documents(
+    policy_number: str,
+    include_text: bool = False,
+    x_api_key: Optional[str] = Header(None, alias="X-API-KEY"),
+):
+    """
+    Get the extracted fields (amounts, dates, VINs, registration numbers) and metadata
+    of every document uploaded for a claim. Set `include_text` to also return the extracted text.
+    """
+    if not api_key_valid(x_api_key):
+        return JSONResponse(
+            status_code=401, 
+            content={"message": "Unauthorized access: Invalid API key"}
+        )
+
+    try:
+        analyses = await document_engine.analyse_claim(_safe_filename(policy_number))
+        if not include_text:
+            analyses = [{k: v for k, v in analysis.items() if k != "text"} for analysis in analyses]
+        return JSONResponse(
+            status_code=200,
+            content={"policyNumber": policy_number, "documents": analyses, "total": len(analyses)}
+        )
     except Exception as e:
-        print(f"Error in mock claims list endpoint: {str(e)}")
+        logger.error("Error in claim documents endpoint: %s", e, exc_info=True)
+        return JSONResponse(
+            status_code=500,
+            content={"message": f"An error occurred: {e}"}
+        )
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """The weak comparison If-None-Match calls for: ``*`` or any listed tag, ignoring ``W/`` prefixes."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
+
+
+@claim_router.get("/claims/claimant-list")
+async def get_claims_list(
+    request: Request,
+    status_filter: Optional[str] = Query(None, alias="status"),
+    claimType: Optional[str] = None,
+    policyNumber: Optional[str] = None,
+    minFraudScore: Optional[float] = None,
+    maxFraudScore: Optional[float] = None,
+    submittedFrom: Optional[datetime] = None,
+    submittedTo: Optional[datetime] = None,
+    sort: str = "dateSubmitted",
+    order: str = "desc",
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    x_api_key: Optional[str] = Header(None, alias="X-API-KEY"),
+):
+    """
+    Get one page of claims for the dashboard.
+    Filter by `status` (comma separated), `claimType`, `policyNumber`, fraud score range and submission dates,
+    sort by `dateSubmitted` or `fraudScore`, and pick the returned `fields` (comma separated).
+    Pass the `nextCursor` of a page as `cursor` to read the next one. Pages carry an ETag, so
+    re-requesting an unchanged page with `If-None-Match` returns 304 without a body.
+
+    The ETag is a hash of the page itself, so a 304 saves the transfer, not the read: the page is still
+    fetched, through a bounded index range scan. Nothing cheaper identifies a page's version, as fraud
+    rescoring rewrites scores without touching ``lastUpdated`` and a count over the filter reads every match.
+    """
+    if not api_key_valid(x_api_key):
+        return JSONResponse(
+            status_code=401, 
+            content={"message": "Unauthorized access: Invalid API key"}
+        )
+    if order not in ("asc", "desc"):
+        return JSONResponse(status_code=400, content={"message": "order must be 'asc' or 'desc'"})
+    
+    try:
+        filters = {
+            "status": [value for value in status_filter.split(",") if value] if status_filter else None,
+            "claimType": claimType,
+            "policyNumber": policyNumber,
+            "minFraudScore": minFraudScore,
+            "maxFraudScore": maxFraudScore,
+            "submittedFrom": submittedFrom,
+            "submittedTo": submittedTo,
+        }
+        claims_list, next_cursor = await claims_repository.list_claims(
+            filters=filters,
+            sort=sort,
+            descending=order == "desc",
+            limit=limit,
+            cursor=cursor,
+            fields={field for field in fields.split(",") if field} if fields else None,
+        )
+        content = {
+            "status": "completed",
+            "data": claims_list,
+            "count": len(claims_list),
+            "nextCursor": next_cursor,
+        }
+
+        body = json.dumps(content, separators=(",", ":")).encode()
+        etag = f'W/"{hashlib.sha1(body).hexdigest()}"'
+        headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+        if _etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers=headers)
+        return Response(content=body, status_code=200, media_type="application/json", headers=headers)
+
+    except (ValueError, InvalidCursor) as e:
+        return JSONResponse(status_code=400, content={"message": str(e)})
+    except Exception as e:
+        logger.error("Error in claims list endpoint: %s", e, exc_info=True)
         return JSONResponse(
             status_code=500, 
             content={"message": f"An error occurred: {e}"}
         )
     
-# In-memory storage to simulate processing states
-processing_claims = {}
+@claim_router.post("/claims/{claim_id}/analysis", status_code=status.HTTP_202_ACCEPTED)
+async def submit_claim_analysis(
+    claim_id: str,
+    policyNumber: Optional[str] = None,
+    restart: bool = False,
+    x_api_key: Optional[str] = Header(None, alias="X-API-KEY"),
+):
+    """
+    Queue the analysis of a claim (document extraction, policy check, LLM assessment).
+    Returns the current job status; submitting a claim that is already queued or running is a no-op.
+    """
+    if not api_key_valid(x_api_key):
+        return JSONResponse(
+            status_code=401, 
+            content={"message": "Unauthorized access: Invalid API key"}
+        )
 
-@claim_router.get("/claims/mock-data/{claim_id}")
-async def get_mock_claim_data(
+    try:
+        job = await claim_analysis_queue.submit(claim_id, policy_number=policyNumber, restart=restart)
+        return JSONResponse(status_code=202, content=jsonable_encoder(claim_analysis_queue.describe(job)))
+    except Exception as e:
+        logger.error("Error in submit claim analysis endpoint: %s", e, exc_info=True)
+        return JSONResponse(
+            status_code=500, 
+            content={"message": f"An error occurred: {e}"}
+        )
+
+
+@claim_router.get("/claims/{claim_id}/analysis")
+async def get_claim_analysis(
     claim_id: str,
     x_api_key: Optional[str] = Header(None, alias="X-API-KEY"),
 ):
     """
-    Get mock claim data with processing status simulation
+    Get the status of a claim's analysis job, read from the persisted stage progress.
     """
-    if x_api_key != env_config.x_api_key:
+    if not api_key_valid(x_api_key):
         return JSONResponse(
             status_code=401, 
             content={"message": "Unauthorized access: Invalid API key"}
         )
-    
+
     try:
-        
-        if claim_id not in processing_claims:
-            processing_claims[claim_id] = {
-                "start_time": time.time(),
-                "status": "running"
-            }
-        
-        # Check if enough time has passed to complete processing 
-        processing_time = time.time() - processing_claims[claim_id]["start_time"]
-        simulation_delay = 20  # 20 seconds processing time
-        
-        if processing_time < simulation_delay:
-            # Still processing
+        job = await claim_analysis_queue.get(claim_id)
+        if job is None:
             return JSONResponse(
-                status_code=200,
-                content={
-                    "status": "running",
-                    "processing_status": "AI analysis in progress...",
-                    "progress": min(int((processing_time / simulation_delay) * 100), 95),
-                    "data": None
-                }
+                status_code=404,
+                content={"message": f"No analysis has been submitted for claim '{claim_id}'"}
             )
-        
-        # Processing complete - return mock data
-        processing_claims[claim_id]["status"] = "completed"
-        
-        mock_data = generate_mock_claim_data(claim_id)
-        
+        return JSONResponse(status_code=200, content=jsonable_encoder(claim_analysis_queue.describe(job)))
+    except Exception as e:
+        logger.error("Error in claim analysis status endpoint: %s", e, exc_info=True)
         return JSONResponse(
-            status_code=200,
-            content={
-                "status": "completed",
-                "processing_status": "Analysis completed successfully",
-                "progress": 100,
-                "data": mock_data
-            }
+            status_code=500, 
+            content={"message": f"An error occurred: {e}"}
+        )
+
+
+@claim_router.get("/claims/events")
+async def claim_events(
+    request: Request,
+    apiKey: Optional[str] = None,
+    x_api_key: Optional[str] = Header(None, alias="X-API-KEY"),
+):
+    """
+    Push claim status and progress changes to dashboards as Server-Sent Events.
+    Each `claim.status` event carries the claim id, status, current stage and progress, plus the claim data once
+    analysis completes. EventSource cannot send headers, so the API key may also be given as `apiKey`.
+    """
+    if not api_key_valid(x_api_key or apiKey):
+        return JSONResponse(
+            status_code=401, 
+            content={"message": "Unauthorized access: Invalid API key"}
+        )
+
+    try:
+        subscription = event_bus.subscribe({CLAIM_STATUS_TOPIC})
+    except TooManySubscribers:
+        HTTP_SHED.inc()
+        return JSONResponse(
+            status_code=503,
+            content={"message": "Too many open event streams; try again shortly"},
+            headers={"Retry-After": "5"},
         )
+
+    async def event_stream():
+        # A draining worker ends the stream, and the browser reconnects to a pod that is still serving
+        draining = asyncio.ensure_future(health_monitor.wait_draining())
+        try:
+            # Ask the browser to reconnect quickly if the connection drops
+            yield "retry: 3000\n\n"
+            while not health_monitor.draining and not await request.is_disconnected():
+                next_event = asyncio.ensure_future(subscription.get())
+                await asyncio.wait(
+                    {next_event, draining},
+                    timeout=settings.CLAIM_EVENTS_HEARTBEAT_SECONDS,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if not next_event.done():
+                    next_event.cancel()
+                    if not draining.done():
+                        # Comment line that keeps proxies from closing an idle connection
+                        yield ": keep-alive\n\n"
+                    continue
+                event = next_event.result()
+                yield f"id: {event.id}\nevent: {event.topic}\ndata: {event.encoded}\n\n"
+        finally:
+            draining.cancel()
+            subscription.close()
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@claim_router.get("/claims/mock-data/{claim_id}")
+async def get_mock_claim_data(
+    claim_id: str,
+    x_api_key: Optional[str] = Header(None, alias="X-API-KEY"),
+):
+    """
+    Get claim details for the admin dashboard.
+    Opening a claim that has not been analysed yet queues its analysis; until the job
+    completes the response carries the current stage and real progress.
+    """
+    if not api_key_valid(x_api_key):
+        return JSONResponse(
+            status_code=401, 
+            content={"message": "Unauthorized access: Invalid API key"}
+        )
+    
+    try:
+        job = await claim_analysis_queue.get(claim_id)
+        if job is None:
+            job = await claim_analysis_queue.submit(claim_id)
+        return JSONResponse(status_code=200, content=jsonable_encoder(claim_analysis_queue.describe(job)))
         
     except Exception as e:
-        print(f"Error in mock claims endpoint: {str(e)}")
+        logger.error("Error in mock claims endpoint: %s", e, exc_info=True)
         return JSONResponse(
             status_code=500, 
             content={"message": f"An error occurred: {e}"}
         )
-
@@ -1,6 +1,10 @@
 # Import necessary modules
+import time
 
-import os, secrets, uvicorn
+# Taken before the application's imports, so the startup breakdown includes them
+_import_started = time.perf_counter()
+
+import asyncio, os, secrets, uvicorn
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from fastapi import FastAPI, Request, Depends, HTTPException
@@ -13,11 +17,31 @@ from contextlib import asynccontextmanager
 from starlette.middleware.httpsredirect import HTTPSRedirectMiddleware
 from src.utilities.Printer import printer
 from src.config.appconfig import env_config
-from src.application.api_route import claim_router
+from src.application.api_route import MAX_BATCH_FILES, MAX_FILE_SIZE, MULTIPART_OVERHEAD, claim_router, health_router
+from src.application.middleware import LoadSheddingMiddleware, RequestBodyLimitMiddleware, RequestContextMiddleware
+from src.utilities.structured_logging import configure_logging
+from src.utilities.startup import StartupTimer
+from src.utilities.metrics import release_worker_metrics
+from src.utilities.prompt_loader import prompt_registry
+from src.ai_model.memory_writer import memory_writer
+from src.ai_model.response_cache import get_response_cache
+from src.ai_model.llm_gateway import llm_gateway
+from src.ai_model.context_builder import load_tokenizer
+from src.services.evidence_retention import retention_sweeper
+from src.domain.evidencesynthesisengine.documentunderstanding import document_engine
+from src.services.claim_analysis import claim_analysis_queue
+from src.infrastructure.database.claims_repository import claims_repository
+from src.infrastructure.database.policy_repository import policy_repository
+from src.services.claim_events import claim_status_broadcaster
+from src.services.health import health_monitor, mongo_check
+from src.domain.policyintelligencemodule.conversationmanager import PROMPT_PATH
 
 # Get application settings from the settings module
 settings = get_settings()
 
+# JSON lines (LOG_FORMAT) written off the event loop and flushed at exit; lines written while serving a request carry its X-Request-ID
+configure_logging()
+
 # Description for API documentation
 description = f"""
 {settings.API_V1_STR} helps you do awesome stuff. 🚀
@@ -31,8 +55,49 @@ async def lifespan(app: FastAPI):
     This function initializes and cleans up resources during the application's lifecycle.
     """
     # STARTUP Call Check routine
+    startup = StartupTimer(_import_started)
+    startup.mark("import", time.perf_counter() - _import_started)
     mongo_client = MongoDBClientConfig()
+    # Bounded: a pod that cannot reach MongoDB fails fast and is restarted instead of hanging unready
+    with startup.phase("mongo_connect"):
+        async with asyncio.timeout(settings.STARTUP_TIMEOUT_SECONDS):
+            await mongo_client.connect()
     app.state.db_client = mongo_client
+    memory_writer.start()
+    # Claims list and claim analysis jobs live in Mongo; workers here are optional when dedicated workers run elsewhere.
+    # Each only ensures its own indexes, so they are opened concurrently
+    response_cache = get_response_cache()
+    with startup.phase("repositories"):
+        db = mongo_client.get_context_db()
+        async with asyncio.timeout(settings.STARTUP_TIMEOUT_SECONDS):
+            await asyncio.gather(
+                claims_repository.open(db),
+                policy_repository.open(db),
+                claim_analysis_queue.open(db),
+                *([response_cache.open(db)] if response_cache is not None else []),
+            )
+    claim_analysis_queue.start()
+    # Fan claim progress out to connected dashboards from one watcher per process
+    claim_status_broadcaster.start()
+    # Expire old evidence in the background; each sweep only touches expired entries
+    if settings.EVIDENCE_SWEEP_ENABLED:
+        retention_sweeper.start()
+    # Compile the prompt templates once so the first claim turn does not pay for YAML parsing
+    with startup.phase("prompts"):
+        prompt_registry.load(PROMPT_PATH)
+    # Token budgets need the tokenizer's ranks; loading them may hit the disk or network, so off the event loop
+    with startup.phase("tokenizer"):
+        await asyncio.to_thread(load_tokenizer)
+    # Readiness follows the background dependency checks; the first round runs before traffic is accepted
+    with startup.phase("health"):
+        health_monitor.register("mongo", mongo_check(mongo_client), critical=True)
+        await health_monitor.refresh()
+        health_monitor.start()
+    # Installed over the server's own SIGTERM handler: readiness drops first, the listener closes after the drain delay
+    health_monitor.drain_on_signal(settings.SHUTDOWN_DRAIN_SECONDS)
+    app.state.startup = startup.report()
+    # The model SDK is imported off the critical path, while the pod already answers probes
+    warm_up = asyncio.create_task(llm_gateway.warm_up(), name="llm-warm-up") if settings.LLM_WARM_UP else None
     print(running_mode)
     print()
     print()
@@ -40,6 +105,20 @@ async def lifespan(app: FastAPI):
     print()
     printer(" ⚡️🏎  ClaimLightning AI Server::Running", "sky_blue")
     yield
+    if warm_up is not None and not warm_up.done():
+        warm_up.cancel()
+    await health_monitor.stop()
+    await retention_sweeper.stop()
+    await claim_status_broadcaster.stop()
+    await claim_analysis_queue.stop()
+    await document_engine.shutdown()
+    await llm_gateway.close()
+    # Persist queued memory entries before the connection goes away
+    await memory_writer.stop()
+    if response_cache is not None:
+        await response_cache.close()
+    await mongo_client.close_connection()
+    release_worker_metrics()
     printer(" 🔴 ClaimLightning AI Server::SHUTDOWN", "red")
 
 # Adjust dependency to use warmed db_client
@@ -93,6 +172,30 @@ app.add_middleware(
     expose_headers=["*"],
 )
 
+# Refuse oversized uploads before the multipart parser spools them to disk
+app.add_middleware(
+    RequestBodyLimitMiddleware,
+    limits={
+        f"{settings.API_V1_STR}/claims/uploads": MAX_FILE_SIZE + MULTIPART_OVERHEAD,
+        f"{settings.API_V1_STR}/claims/uploads/batch": MAX_BATCH_FILES * MAX_FILE_SIZE + MULTIPART_OVERHEAD,
+    },
+)
+
+# Shed load per worker before any work is done; probes and metrics must answer even at capacity, and
+# event streams, which stay open for as long as a dashboard does, have their own cap (EVENT_BUS_MAX_SUBSCRIBERS)
+app.add_middleware(
+    LoadSheddingMiddleware,
+    max_in_flight=settings.MAX_IN_FLIGHT_REQUESTS,
+    monitor=health_monitor,
+    exempt_paths=[
+        f"{settings.API_V1_STR}{path}"
+        for path in ("/health", "/health/live", "/health/ready", "/metrics", "/claims/events")
+    ],
+)
+
+# Request IDs and per-route HTTP metrics; added last so it wraps every other middleware
+app.add_middleware(RequestContextMiddleware)
+
 @app.get("/", response_class=HTMLResponse)
 async def home(request: Request,):
     return templates.TemplateResponse(request=request,name="index.html",context={})
@@ -107,16 +210,17 @@ async def claim_backend_application(request: Request,):
 
 app.include_router(claim_router,prefix=settings.API_V1_STR,  
                    tags=["AUTH"],dependencies=[  Depends(get_db_client),Depends(get_settings),],)
+app.include_router(health_router, prefix=settings.API_V1_STR, tags=["HEALTH"])
 
 
 if __name__ == "__main__":
     # Retrieve environment variables for host, port, and timeout
-    timeout_keep_alive = int(os.getenv("TIMEOUT", 6000))
+    timeout_keep_alive = int(os.getenv("TIMEOUT", settings.KEEP_ALIVE_SECONDS))
 
-    # Run the application with the specified host, port, and timeout
+    # Run a single process for local development; production runs `python -m src.application.server`
     uvicorn.run(
         app,
         host="0.0.0.0",
-        port=int(env_config.port),
+        port=int(env_config.app_port or 8080),
         timeout_keep_alive=timeout_keep_alive,
     )
@@ -0,0 +1,166 @@
+import json
+import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.services.health import HealthMonitor
+from src.utilities.metrics import HTTP_IN_FLIGHT, HTTP_REQUESTS, HTTP_SECONDS, HTTP_SHED
+from src.utilities.request_context import REQUEST_ID_HEADER, new_request_id, request_id_var
+
+
+class RequestContextMiddleware:
+    """
+    Gives every HTTP request an ID (the caller's ``X-Request-ID`` or a new one) that log records carry
+    and the response echoes, and records request count, latency and in-flight requests per route.
+
+    Plain ASGI rather than ``BaseHTTPMiddleware`` so streamed (SSE) responses pass through unbuffered.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope.get("headers") or [])
+        request_id = new_request_id(headers.get(REQUEST_ID_HEADER.lower().encode(), b"").decode("latin-1"))
+        token = request_id_var.set(request_id)
+        status_code = 500
+
+        async def send_with_request_id(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                MutableHeaders(scope=message).append(REQUEST_ID_HEADER, request_id)
+            await send(message)
+
+        HTTP_IN_FLIGHT.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            # The route template, not the raw path, so IDs in URLs do not explode the label set
+            route = scope.get("route")
+            path = getattr(route, "path", None) or "unmatched"
+            method = scope["method"]
+            HTTP_SECONDS.labels(method, path).observe(time.perf_counter() - started)
+            HTTP_REQUESTS.labels(method, path, str(status_code)).inc()
+            HTTP_IN_FLIGHT.dec()
+            request_id_var.reset(token)
+
+
+class LoadSheddingMiddleware:
+    """
+    Caps the HTTP requests one worker serves at once: past ``max_in_flight`` a request is answered 503 with
+    ``Retry-After`` straight away, rather than queueing behind model calls until it times out anyway.
+    Probes, metrics and long-lived streams (``exempt_paths``) are never shed. While draining, responses ask the client to close
+    the connection, so keep-alive clients reconnect to another worker or pod.
+    """
+
+    def __init__(self, app: ASGIApp, max_in_flight: int, monitor: HealthMonitor, exempt_paths=(), retry_after_seconds: int = 1):
+        self.app = app
+        self.max_in_flight = max_in_flight
+        self.monitor = monitor
+        self.exempt_paths = set(exempt_paths)
+        self.retry_after_seconds = retry_after_seconds
+        self.in_flight = 0
+
+    async def _shed(self, send: Send):
+        body = json.dumps({"message": "Server is at capacity, please retry shortly"}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 503,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(self.retry_after_seconds).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or scope["path"] in self.exempt_paths:
+            await self.app(scope, receive, send)
+            return
+        if self.max_in_flight > 0 and self.in_flight >= self.max_in_flight:
+            HTTP_SHED.inc()
+            await self._shed(send)
+            return
+
+        async def send_closing_when_draining(message: Message):
+            if message["type"] == "http.response.start" and self.monitor.draining:
+                MutableHeaders(scope=message)["connection"] = "close"
+            await send(message)
+
+        self.in_flight += 1
+        try:
+            await self.app(scope, receive, send_closing_when_draining)
+        finally:
+            self.in_flight -= 1
+
+
+class RequestBodyLimitMiddleware:
+    """
+    Answers 413 for a request to one of ``limits`` (path -> maximum body bytes) whose body is larger, before
+    the form parser spools it to a temporary file: at once from ``Content-Length``, or as soon as a chunked
+    body passes the limit, in which case the application sees the client disconnect. Per-file limits are
+    still enforced when each upload is stored.
+    """
+
+    def __init__(self, app: ASGIApp, limits: dict):
+        self.app = app
+        self.limits = limits
+
+    async def _reject(self, send: Send, max_bytes: int):
+        body = json.dumps({"message": f"Request body exceeds the {max_bytes // (1024 * 1024)}MB limit"}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 413,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"connection", b"close"),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        max_bytes = self.limits.get(scope["path"]) if scope["type"] == "http" else None
+        if max_bytes is None:
+            await self.app(scope, receive, send)
+            return
+
+        content_length = dict(scope.get("headers") or []).get(b"content-length")
+        if content_length is not None and content_length.isdigit() and int(content_length) > max_bytes:
+            await self._reject(send, max_bytes)
+            return
+
+        received = 0
+        response_started = False
+        rejected = False
+
+        async def limited_receive() -> Message:
+            nonlocal received, rejected
+            if rejected:
+                return {"type": "http.disconnect"}
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > max_bytes and not response_started:
+                    rejected = True
+                    await self._reject(send, max_bytes)
+                    return {"type": "http.disconnect"}
+            return message
+
+        async def tracking_send(message: Message):
+            nonlocal response_started
+            if rejected:
+                return  # The 413 has been sent; whatever the application answers is dropped
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        await self.app(scope, limited_receive, tracking_send)
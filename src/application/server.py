@@ -0,0 +1,112 @@
+"""
+Production entry point: ``python -m src.application.server``.
+
+Runs WEB_CONCURRENCY uvicorn workers (by default one per CPU the container may use) on uvloop and httptools
+when they are installed. Each worker caps its own in-flight requests (MAX_IN_FLIGHT_REQUESTS) and drains on
+SIGTERM (SHUTDOWN_DRAIN_SECONDS, then SHUTDOWN_GRACE_SECONDS); see the lifespan in ``main.py``.
+
+Workers share nothing in memory, so with more than one:
+
+- the session cache moves to the ``sqlite`` backend, shared by the workers on the host: a per-worker cache would
+  answer one claimant's next turn from stale history whenever another worker served the previous one. Starting
+  with SESSION_CACHE_BACKEND explicitly set to ``memory`` is refused.
+- each worker's document parser pool gets an equal share of the CPUs (DOCUMENT_WORKERS, unless set), instead of
+  every worker starting one process per CPU.
+- Prometheus metrics are combined across workers through PROMETHEUS_MULTIPROC_DIR, which is set to a fresh
+  directory here unless the deployment provides one.
+
+The policy and response caches and the LLM gateway's concurrency cap and ``/llm-gateway/stats`` stay per worker.
+"""
+import glob
+import importlib.util
+import logging
+import math
+import os
+import tempfile
+
+import uvicorn
+
+from src.config.app_settings import get_settings
+from src.config.appconfig import env_config
+from src.utilities.structured_logging import configure_logging
+
+logger = logging.getLogger(__name__)
+
+APP = "src.application.main:app"
+
+
+def available_cpus() -> int:
+    """CPUs this process may run on, lowered to the container's CPU quota (cgroup v2) when one is set."""
+    cpus = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count() or 1
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            quota, period = f.read().split()
+        if quota != "max":
+            cpus = min(cpus, math.ceil(int(quota) / int(period)))
+    except (OSError, ValueError):
+        pass
+    return max(1, cpus)
+
+
+def worker_count() -> int:
+    return get_settings().WEB_CONCURRENCY or available_cpus()
+
+
+def share_worker_settings(workers: int):
+    """
+    Settings the workers must agree on, passed to them through the environment they are spawned with.
+    Only defaults are replaced: the environment (with .env already loaded into it) is what the workers read.
+    """
+    settings = get_settings()
+    if settings.SESSION_CACHE_BACKEND.lower() == "memory":
+        if "SESSION_CACHE_BACKEND" in os.environ:
+            raise SystemExit(
+                f"SESSION_CACHE_BACKEND=memory keeps a separate session cache in each of the {workers} workers, "
+                "which serves stale chat history; use sqlite or none, or set WEB_CONCURRENCY=1"
+            )
+        os.environ["SESSION_CACHE_BACKEND"] = "sqlite"
+        logger.info(f"Session cache: sqlite at {settings.SESSION_CACHE_PATH}, shared by the workers")
+    if not settings.DOCUMENT_WORKERS:
+        os.environ["DOCUMENT_WORKERS"] = str(max(1, available_cpus() // workers))
+
+
+def prepare_multiprocess_metrics():
+    """Point every worker at one metrics directory, emptied of a previous run's files."""
+    directory = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if directory is None:
+        directory = tempfile.mkdtemp(prefix="claimlightning-metrics-")
+        os.environ["PROMETHEUS_MULTIPROC_DIR"] = directory
+    os.makedirs(directory, exist_ok=True)
+    for stale in glob.glob(os.path.join(directory, "*.db")):
+        os.remove(stale)
+
+
+def main():
+    configure_logging()
+    settings = get_settings()
+    workers = worker_count()
+    if workers > 1:
+        share_worker_settings(workers)
+        prepare_multiprocess_metrics()
+    loop = "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
+    http = "httptools" if importlib.util.find_spec("httptools") else "h11"
+    logger.info(f"Starting {workers} worker(s) on {loop}/{http}")
+    uvicorn.run(
+        APP,
+        host="0.0.0.0",
+        port=int(env_config.app_port or 8080),
+        workers=workers,
+        loop=loop,
+        http=http,
+        # Logging is configured by each worker (configure_logging in main.py), not by uvicorn
+        log_config=None,
+        timeout_keep_alive=settings.KEEP_ALIVE_SECONDS,
+        timeout_graceful_shutdown=settings.SHUTDOWN_GRACE_SECONDS,
+        # Client addresses and scheme from the load balancer's X-Forwarded-* headers
+        proxy_headers=True,
+        forwarded_allow_ips="*",
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -4,15 +4,115 @@ from functools import lru_cache
 from pydantic import Field
 from pydantic_settings import BaseSettings
 
+from src.config.appconfig import load_environment
+
 class Settings(BaseSettings):
     # Basic service settings
     APP_NAME: str = "ClaimLightning"
     API_V1_STR: str = "/api/v1"
     # Model settings
     MODEL_NAME: str = "gpt-5"
+    # Token budget for the chat history sent with each turn; older turns are summarised, then dropped.
+    # Counted with this tiktoken encoding, loaded at startup; the Docker image caches o200k_base's ranks
     MAX_HISTORY_TOKENS: int = 1000
+    TOKENIZER_ENCODING: str = "o200k_base"
+    # Chat memory entries expire (TTL index) and drop out of the prompt after this many minutes
+    MEMORY_TTL_MINUTES: int = 15
+    # Session cache in front of the chat memory: "memory" (per worker), "sqlite" (shared by local workers) or "none".
+    # The multi-worker server switches the "memory" default to "sqlite"
+    SESSION_CACHE_BACKEND: str = "memory"
+    SESSION_CACHE_PATH: str = "src/assets/cache/sessions.sqlite3"
+    SESSION_CACHE_MAX_SESSIONS: int = 10000
+    SESSION_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    SESSION_CACHE_TURNS: int = 6
+    # Write-behind batching of chat memory inserts
+    MEMORY_WRITE_BATCH_SIZE: int = 100
+    MEMORY_WRITE_FLUSH_SECONDS: float = 0.5
+    MEMORY_WRITE_QUEUE_SIZE: int = 10000
+    MEMORY_WRITE_MAX_RETRIES: int = 5
+    # Content-addressed evidence store (blobs, manifests and their index)
+    EVIDENCE_STORE_PATH: str = "src/assets/evidence"
+    # Evidence retention sweeper
+    EVIDENCE_RETENTION_DAYS: float = 30
+    EVIDENCE_SWEEP_ENABLED: bool = True
+    EVIDENCE_SWEEP_INTERVAL_SECONDS: float = 3600
+    EVIDENCE_SWEEP_BATCH_SIZE: int = 500
+    EVIDENCE_MAX_DELETIONS_PER_SECOND: int = 200
+    # Document understanding: parser processes per server worker (0 = one per CPU core, divided between the
+    # workers of the multi-worker server) and analyses kept in memory
+    DOCUMENT_WORKERS: int = 0
+    DOCUMENT_CACHE_ENTRIES: int = 1024
+    # Claim analysis job queue: worker tasks in this process (0 = submit only, run `python -m src.services.claim_analysis`)
+    CLAIM_ANALYSIS_WORKERS: int = 2
+    CLAIM_ANALYSIS_LEASE_SECONDS: float = 120
+    CLAIM_ANALYSIS_POLL_SECONDS: float = 2
+    CLAIM_ANALYSIS_MAX_ATTEMPTS: int = 3
+    # Push updates to dashboards: events buffered per subscriber, watcher interval for jobs run by other processes
+    EVENT_BUS_QUEUE_SIZE: int = 256
+    CLAIM_EVENTS_POLL_SECONDS: float = 1.0
+    CLAIM_EVENTS_HEARTBEAT_SECONDS: float = 15.0
+    # Open event streams per worker; they are not counted in MAX_IN_FLIGHT_REQUESTS, so they are capped here (0: no cap)
+    EVENT_BUS_MAX_SUBSCRIBERS: int = 500
+    # Model API gateway: OpenAI-compatible endpoint (point it at benchmarks/llm_stub_server.py to test locally),
+    # connection pool, concurrent call cap and per-call deadline covering queueing, attempts and retry backoff
+    LLM_BASE_URL: str = "https://api.aimlapi.com/v1"
+    LLM_MODEL: str = "openai/gpt-5-chat-latest"
+    LLM_MAX_CONCURRENCY: int = 32
+    LLM_MAX_CONNECTIONS: int = 64
+    LLM_MAX_KEEPALIVE_CONNECTIONS: int = 32
+    LLM_CONNECT_TIMEOUT_SECONDS: float = 5.0
+    LLM_REQUEST_TIMEOUT_SECONDS: float = 60.0
+    LLM_DEADLINE_SECONDS: float = 90.0
+    LLM_MAX_RETRIES: int = 2
+    LLM_RETRY_BACKOFF_SECONDS: float = 0.5
+    LLM_RETRY_BACKOFF_MAX_SECONDS: float = 8.0
+    # Hedge calls slower than the primary model's recent percentile latency to this model ("" disables hedging)
+    LLM_FALLBACK_MODEL: str = ""
+    LLM_HEDGE_PERCENTILE: float = 95.0
+    LLM_HEDGE_MIN_DELAY_SECONDS: float = 2.0
+    # Ask for token usage (incl. prompt-cache hits) at the end of streamed replies; turn off for providers that reject stream_options
+    LLM_STREAM_USAGE: bool = True
+    # Cache of model replies: "memory" (per worker), "sqlite" (shared by local workers), "mongo" (shared by all) or "none".
+    # "deterministic" only caches calls that ask for it (scripted turns, run at temperature 0); "all" caches every call
+    LLM_CACHE_BACKEND: str = "memory"
+    LLM_CACHE_MODE: str = "deterministic"
+    LLM_CACHE_TTL_SECONDS: float = 24 * 3600
+    LLM_CACHE_MAX_ENTRIES: int = 5000
+    LLM_CACHE_MAX_BYTES: int = 32 * 1024 * 1024
+    LLM_CACHE_PATH: str = "src/assets/cache/llm_responses.sqlite3"
+    # Policy lookups: "mongo" (the policies collection) or "demo" (every policy number is the demo policy),
+    # cached per worker; unknown policy numbers are remembered for the shorter negative TTL
+    POLICY_BACKEND: str = "demo"
+    POLICY_CACHE_ENTRIES: int = 50000
+    POLICY_CACHE_TTL_SECONDS: float = 900
+    POLICY_NEGATIVE_CACHE_TTL_SECONDS: float = 60
     # Runtime & infra
+    # Production server (python -m src.application.server): worker processes (0 = one per CPU available to the container)
+    WEB_CONCURRENCY: int = 0
+    # Above the load balancer's idle timeout (60s on most), so the balancer, not this server, closes idle connections
+    KEEP_ALIVE_SECONDS: int = 75
+    # Requests one worker serves at once before answering 503 with Retry-After (0 = no limit); probes are exempt
+    MAX_IN_FLIGHT_REQUESTS: int = 128
+    # On SIGTERM: report not ready and keep serving for the drain delay, then stop accepting and give in-flight
+    # requests (a model call is bounded by LLM_DEADLINE_SECONDS) the grace period to finish
+    SHUTDOWN_DRAIN_SECONDS: float = 5.0
+    SHUTDOWN_GRACE_SECONDS: float = 95.0
+    # Dependency checks behind /health/ready run in the background on this interval; probes only read the results
+    HEALTH_CHECK_INTERVAL_SECONDS: float = 5.0
+    HEALTH_CHECK_TIMEOUT_SECONDS: float = 2.0
+    HEALTH_MIN_FREE_DISK_MB: int = 512
+    # Startup gives up (and the pod restarts) rather than hanging when MongoDB cannot be reached in time
+    STARTUP_TIMEOUT_SECONDS: float = 30.0
+    MONGO_CONNECT_TIMEOUT_MS: int = 5000
+    MONGO_SERVER_SELECTION_TIMEOUT_MS: int = 5000
+    # Import the model SDK and build its client in the background once serving, instead of on the first claim
+    LLM_WARM_UP: bool = True
     LOG_LEVEL: str = Field("INFO", env="LOG_LEVEL")
+    # "json" (one object per line, for log shippers) or "text" (local development); both redact policy numbers and PII
+    LOG_FORMAT: str = "json"
+    # Share of DEBUG records kept; records beyond LOG_QUEUE_SIZE waiting to be written are dropped, never waited on
+    LOG_DEBUG_SAMPLE_RATE: float = 0.1
+    LOG_QUEUE_SIZE: int = 10000
     # Security
     ALLOWED_ORIGINS: str = "*"
 
@@ -21,4 +121,6 @@ class Settings(BaseSettings):
 
 @lru_cache()
 def get_settings() -> Settings:
+    # Settings may be overridden from .env, so it is loaded before the first read
+    load_environment()
     return Settings()
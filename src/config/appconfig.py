@@ -1,18 +1,42 @@
-# Load .env file using:
-from dotenv import load_dotenv
-load_dotenv(override=True)
 import os
 
+from dotenv import load_dotenv
+
+_environment_loaded = False
+
+
+def load_environment():
+    """
+    Load the .env file into the process environment, once. Values in .env override the environment,
+    as they always have; this runs on first use of the configuration rather than as a side effect of import.
+    """
+    global _environment_loaded
+    if not _environment_loaded:
+        load_dotenv(override=True)
+        _environment_loaded = True
+
+
 class EnvConfig:
-    """Class to hold environment configuration variables."""
-    
-    def __init__(self):
-        self.env = os.getenv("ENVIRONMENT")
-        self.app_port = os.getenv("PORT")
-        self.x_api_key = os.getenv("X-API-KEY")
-        self.aimlapi_key = os.getenv("AIMLAPI-KEY")
-        self.mongo_conn_url =os.getenv("DB_CONN_URL")
-        self.mongo_database_name= os.getenv("DB_DBNAME")
+    """Class to hold environment configuration variables, read from the environment on first access."""
+
+    # Attribute name -> environment variable
+    VARIABLES = {
+        "env": "ENVIRONMENT",
+        "app_port": "PORT",
+        "x_api_key": "X-API-KEY",
+        "aimlapi_key": "AIMLAPI-KEY",
+        "mongo_conn_url": "DB_CONN_URL",
+        "mongo_database_name": "DB_DBNAME",
+    }
+
+    def __getattr__(self, name):
+        # Only called for attributes not set yet: read the variable once and keep it on the instance
+        if name not in self.VARIABLES:
+            raise AttributeError(name)
+        load_environment()
+        value = os.getenv(self.VARIABLES[name])
+        setattr(self, name, value)
+        return value
 
     def __repr__(self):
         return (
@@ -20,4 +44,4 @@ class EnvConfig:
         )
 
 # Create an instance of EnvConfig to access the environment variables
-env_config = EnvConfig()
\ No newline at end of file
+env_config = EnvConfig()
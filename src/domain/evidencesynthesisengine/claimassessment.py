@@ -0,0 +1,258 @@
+import json
+import logging
+import re
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from src.ai_model.aimlapi import make_llm_call
+from src.domain.evidencesynthesisengine.documentunderstanding import document_engine
+from src.domain.frauddetectionengine.fraudscoring import (
+    FREQUENCY_WINDOW_DAYS,
+    ClaimFeatures,
+    epoch_day,
+    score_claims,
+)
+from src.infrastructure.database.claims_repository import claims_repository
+from src.infrastructure.database.policy_repository import policy_repository
+from src.infrastructure.evidence_store import evidence_store
+from src.utilities.prompt_loader import prompt_registry
+
+logger = logging.getLogger(__name__)
+
+ASSESSMENT_PROMPT_PATH = Path("src/domain/evidencesynthesisengine/assessmentprompt.yaml")
+
+RECOMMENDATION_STATUSES = {"approve": "approve", "review": "flagged", "reject": "reject"}
+DEFAULT_RECOMMENDATIONS = ["Review the claim manually; the AI assessment could not be parsed"]
+# Formats of the dates found in documents, tried in order; day-first as on UK and Nigerian documents
+DATE_FORMATS = ("%Y-%m-%d", "%d/%m/%Y", "%d-%m-%Y", "%d.%m.%Y", "%d/%m/%y", "%d %B %Y", "%d %b %Y", "%B %d %Y", "%b %d %Y")
+
+
+async def extract_documents(policy_number: str) -> dict:
+    """
+    Stage 1: analyse every document uploaded for the claim and merge their extracted fields.
+
+    Returns:
+        dict: ``documents`` (filename, MIME type, pages, fields) and the merged ``fields``.
+    """
+    analyses = await document_engine.analyse_claim(policy_number)
+    merged = {"amounts": [], "dates": [], "vins": [], "registrationNumbers": []}
+    documents = []
+    for analysis in analyses:
+        fields = analysis.get("fields", {})
+        for key, values in merged.items():
+            values.extend(value for value in fields.get(key, []) if value not in values)
+        documents.append({
+            "filename": analysis["filename"],
+            "mimeType": analysis.get("mimeType"),
+            "pages": analysis.get("pages", 0),
+            "fields": fields,
+            "error": analysis.get("error"),
+        })
+    return {"documents": documents, "fields": merged}
+
+
+async def policy_holder_name(policy_number: str) -> Optional[str]:
+    policy = await policy_repository.get(policy_number)
+    return None if policy is None else policy.get("policy_holder_name")
+
+
+async def check_policy(policy_number: str, extraction: dict) -> dict:
+    """
+    Stage 2: check the extracted evidence against the policy on file.
+
+    Returns:
+        dict: The ``policy``, individual ``checks`` and the ``missingFields`` the claimant still has to provide.
+    """
+    policy = await policy_repository.get(policy_number)
+    fields = extraction["fields"]
+    today = date.today().isoformat()
+
+    missing = []
+    if policy is None:
+        policy = {"policy_number": policy_number}
+        missing.append("A valid policy number")
+    checks = {
+        "policyFound": len(missing) == 0,
+        "policyActive": policy.get("policy_start_date", "") <= today <= policy.get("policy_end_date", ""),
+        "documentsReceived": len(extraction["documents"]),
+        "vinMatchesPolicy": None,
+    }
+    if fields["vins"] and policy.get("vehicle_vin"):
+        checks["vinMatchesPolicy"] = policy["vehicle_vin"].upper() in fields["vins"]
+
+    if not extraction["documents"]:
+        missing.append("Claim form and supporting evidence")
+    if not fields["amounts"]:
+        missing.append("Repair invoice or estimate")
+    if not fields["dates"]:
+        missing.append("Date of incident")
+    if not fields["registrationNumbers"] and not fields["vins"]:
+        missing.append("Vehicle registration number or VIN")
+    return {"policy": policy, "checks": checks, "missingFields": missing}
+
+
+def incident_date(dates: list, submitted: date):
+    """The earliest document date on or before submission, taken as the date of the incident, or None."""
+    parsed = []
+    for value in dates:
+        cleaned = re.sub(r"(\d)(st|nd|rd|th)\b", r"\1", value.replace(",", "").replace(".", " ").strip(), flags=re.IGNORECASE)
+        for candidate in (value, cleaned):
+            for fmt in DATE_FORMATS:
+                try:
+                    found = datetime.strptime(candidate, fmt).date()
+                except ValueError:
+                    continue
+                if found <= submitted:
+                    parsed.append(found)
+                break
+            else:
+                continue
+            break
+    return min(parsed, default=None)
+
+
+async def score_fraud(claim_id: str, policy_number: str, submitted_at: datetime, extraction: dict, policy_check: dict) -> dict:
+    """
+    Stage 3: score the claim with the fraud model, as a batch of one.
+
+    Returns:
+        dict: ``fraudScore``, ``confidenceScores``, the ``indicators`` behind the score and the
+        per-claim ``features`` kept on the claim so the nightly batch can re-score it.
+    """
+    policy = policy_check["policy"]
+    fields = extraction["fields"]
+    incident = incident_date(fields["dates"], submitted_at.date())
+    vin_match = policy_check["checks"]["vinMatchesPolicy"]
+    features = {
+        "claimAmount": max((amount["value"] for amount in fields["amounts"]), default=0),
+        "incidentDate": (incident or submitted_at.date()).isoformat(),
+        "documentCount": len(extraction["documents"]),
+        "vinMatch": -1 if vin_match is None else int(vin_match),
+    }
+    prior_claims = await claims_repository.count_prior_claims(
+        policy_number, claim_id, submitted_at, FREQUENCY_WINDOW_DAYS
+    )
+    shared_evidence = await evidence_store.shared_evidence(policy_number)
+
+    scores = score_claims(ClaimFeatures(
+        claim_amount=np.array([features["claimAmount"]], dtype=float),
+        premium=np.array([policy.get("premium_amount") or np.nan], dtype=float),
+        incident_day=np.array([epoch_day(features["incidentDate"])]),
+        policy_start_day=np.array([epoch_day(policy.get("policy_start_date"))]),
+        policy_end_day=np.array([epoch_day(policy.get("policy_end_date"))]),
+        prior_claims=np.array([prior_claims]),
+        shared_evidence=np.array([shared_evidence]),
+        document_count=np.array([features["documentCount"]]),
+        vin_match=np.array([features["vinMatch"]]),
+    ))
+    return {
+        "fraudScore": int(scores.fraud_score[0]),
+        "confidenceScores": {
+            "fraudDetection": int(scores.fraud_detection_confidence[0]),
+            "repairCostEstimator": int(scores.repair_cost_confidence[0]),
+            "documentVerification": int(scores.document_verification_confidence[0]),
+        },
+        "indicators": scores.indicators(0),
+        "priorClaims": prior_claims,
+        "sharedEvidence": shared_evidence,
+        "features": features,
+    }
+
+
+def build_assessment_messages(claim_id: str, policy_number: str, extraction: dict, policy_check: dict, fraud: dict) -> list:
+    templates = prompt_registry.load(ASSESSMENT_PROMPT_PATH)
+    return [
+        {"role": "system", "content": templates["SYSTEMPROMPT"].render()},
+        {"role": "user", "content": templates["USERPROMPT"].render(
+            claim_id=claim_id,
+            policy_number=policy_number,
+            policy_data=json.dumps(policy_check["policy"], indent=2),
+            document_fields=json.dumps(extraction["fields"], indent=2),
+            policy_checks=json.dumps(
+                {**policy_check["checks"], "missingFields": policy_check["missingFields"]}, indent=2
+            ),
+            fraud_assessment=json.dumps(
+                {key: fraud[key] for key in ("fraudScore", "indicators", "priorClaims", "sharedEvidence")}, indent=2
+            ),
+        )},
+    ]
+
+
+def parse_assessment(reply: str) -> dict:
+    """Parse the model's JSON reply, tolerating code fences or text around the object."""
+    match = re.search(r"\{.*\}", reply, re.DOTALL)
+    if match:
+        try:
+            assessment = json.loads(match.group(0))
+            if isinstance(assessment, dict):
+                return assessment
+        except json.JSONDecodeError:
+            pass
+    logger.warning("Claim assessment reply was not valid JSON; falling back to manual review")
+    return {"recommendation": "review", "summary": reply.strip(), "aiRecommendations": DEFAULT_RECOMMENDATIONS}
+
+
+async def assess_claim(claim_id: str, policy_number: str, extraction: dict, policy_check: dict, fraud: dict) -> dict:
+    """Stage 4: ask the model for a recommendation based on the evidence, policy checks and fraud score."""
+    messages = build_assessment_messages(claim_id, policy_number, extraction, policy_check, fraud)
+    # Same evidence, same assessment: re-running an analysis is answered from the response cache
+    reply = await make_llm_call(messages, deterministic=True)
+    return parse_assessment(reply)
+
+
+def build_claim_record(job: dict) -> dict:
+    """
+    Assemble the claim details shown on the admin dashboard from a completed analysis job.
+
+    Args:
+        job (dict): The job document, with the result of every stage under ``stageResults``.
+
+    Returns:
+        dict: Claim details in the shape the dashboard renders.
+    """
+    extraction = job["stageResults"]["document_extraction"]
+    policy_check = job["stageResults"]["policy_check"]
+    fraud = job["stageResults"]["fraud_scoring"]
+    assessment = job["stageResults"]["llm_assessment"]
+    policy = policy_check["policy"]
+    fields = extraction["fields"]
+
+    claim_amount = max((amount["value"] for amount in fields["amounts"]), default=0)
+    suggested = assessment.get("suggestedSettlement")
+    if not isinstance(suggested, (int, float)):
+        suggested = claim_amount
+
+    timeline = [{"timestamp": _iso(job["createdAt"]), "action": "submitted", "user": "System"}]
+    timeline.extend(
+        {"timestamp": _iso(stage["completedAt"]), "action": stage["name"], "user": "AI System"}
+        for stage in job["stages"] if stage.get("completedAt")
+    )
+
+    return {
+        "id": job["_id"],
+        "claimantName": policy.get("policy_holder_name"),
+        "policyNumber": job["policyNumber"],
+        "carRegistration": next(iter(fields["registrationNumbers"]), ""),
+        "status": RECOMMENDATION_STATUSES.get(str(assessment.get("recommendation", "")).lower(), "flagged"),
+        "claimType": assessment.get("claimType") or "Motor Accident",
+        "claimDetails": assessment.get("summary", ""),
+        "evidence": [document["filename"] for document in extraction["documents"]],
+        "claimAmount": claim_amount,
+        "suggestedSettlement": min(suggested, claim_amount),
+        "fraudScore": fraud["fraudScore"],
+        "fraudIndicators": fraud["indicators"],
+        "fraudFeatures": fraud["features"],
+        "confidenceScores": fraud["confidenceScores"],
+        "missingFields": policy_check["missingFields"],
+        "aiRecommendations": assessment.get("aiRecommendations") or DEFAULT_RECOMMENDATIONS,
+        "timeline": timeline,
+        "dateSubmitted": _iso(job["createdAt"]),
+        "lastUpdated": datetime.now(timezone.utc).isoformat(),
+    }
+
+
+def _iso(value) -> str:
+    return value.isoformat() if isinstance(value, datetime) else str(value)
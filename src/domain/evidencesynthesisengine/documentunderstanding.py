@@ -0,0 +1,340 @@
+import asyncio
+import json
+import logging
+import multiprocessing
+import os
+import re
+import struct
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+from xml.etree import ElementTree
+
+import aiofiles
+import aiofiles.os
+import pypdf
+
+from src.config.app_settings import get_settings
+from src.infrastructure.evidence_store import EvidenceStore, evidence_store
+from src.utilities.structured_logging import configure_process_logging
+from src.utilities.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# Bump when extraction changes so cached analyses are recomputed
+ANALYSER_VERSION = 3
+# Upper bound on the text kept in an analysis result
+MAX_TEXT_CHARS = 200_000
+# Upper bound on the uncompressed size of a .docx body; larger ones are refused rather than inflated
+MAX_DOCX_XML_BYTES = 64 * 1024 * 1024
+# Characters per page used to estimate page counts for plain text
+TEXT_CHARS_PER_PAGE = 3000
+
+WORD_NAMESPACE = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+AMOUNT_PATTERN = re.compile(
+    r"(?P<currency>[$£€₦]|\b(?:USD|GBP|EUR|NGN)\s?)(?P<value>\d{1,3}(?:,\d{3})+(?:\.\d{1,2})?|\d+(?:\.\d{1,2})?)"
+)
+CURRENCY_CODES = {"$": "USD", "£": "GBP", "€": "EUR", "₦": "NGN"}
+MONTHS = "jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec"
+DATE_PATTERN = re.compile(
+    r"\b(?:\d{4}-\d{2}-\d{2}"
+    r"|\d{1,2}[/.-]\d{1,2}[/.-]\d{2,4}"
+    rf"|\d{{1,2}}(?:st|nd|rd|th)?\s+(?:{MONTHS})[a-z]*\.?,?\s+\d{{4}}"
+    rf"|(?:{MONTHS})[a-z]*\.?\s+\d{{1,2}}(?:st|nd|rd|th)?,?\s+\d{{4}})\b",
+    re.IGNORECASE,
+)
+# 17 characters, no I, O or Q
+VIN_PATTERN = re.compile(r"\b[A-HJ-NPR-Z0-9]{17}\b")
+REGISTRATION_PATTERNS = (
+    # Labelled registrations, e.g. "Reg. No: 2930-393" or "Plate number KJA 123 AB"
+    re.compile(
+        r"\b(?:reg(?:istration)?|licen[cs]e\s+plate|number\s+plate|plate)\.?(?:\s+(?:no\.?|number))?\s*[:#]?\s*"
+        r"(?P<value>[A-Z0-9](?:[A-Z0-9 -]{2,9})[A-Z0-9])\b",
+        re.IGNORECASE,
+    ),
+    re.compile(r"\b(?P<value>[A-Z]{2}\d{2}\s?[A-Z]{3})\b"),  # UK
+    re.compile(r"\b(?P<value>[A-Z]{3}[- ]?\d{3}[- ]?[A-Z]{2})\b"),  # Nigeria
+)
+
+
+def _dedupe(values: list) -> list:
+    return list(dict.fromkeys(values))
+
+
+def extract_claim_fields(text: str) -> dict:
+    """
+    Pull structured claim fields out of free text.
+
+    Args:
+        text (str): Text extracted from a document.
+
+    Returns:
+        dict: ``amounts`` (currency and value), ``dates``, ``vins`` and ``registrationNumbers`` found in the text.
+    """
+    amounts = []
+    for match in AMOUNT_PATTERN.finditer(text):
+        currency = match.group("currency").strip()
+        amounts.append({
+            "currency": CURRENCY_CODES.get(currency, currency),
+            "value": float(match.group("value").replace(",", "")),
+        })
+
+    vins = [
+        vin for vin in VIN_PATTERN.findall(text.upper())
+        if any(c.isdigit() for c in vin) and any(c.isalpha() for c in vin)
+    ]
+
+    registrations = []
+    for pattern in REGISTRATION_PATTERNS:
+        for match in pattern.finditer(text):
+            value = match.group("value").strip().upper()
+            # Digits are required so labels like "Plate number" followed by words do not match
+            if any(c.isdigit() for c in value) and value not in vins:
+                registrations.append(value)
+
+    return {
+        "amounts": [dict(t) for t in _dedupe([tuple(a.items()) for a in amounts])],
+        "dates": _dedupe(m.group(0) for m in DATE_PATTERN.finditer(text)),
+        "vins": _dedupe(vins),
+        "registrationNumbers": _dedupe(registrations),
+    }
+
+
+def extract_docx_text(path: str) -> tuple:
+    """
+    Return ``(text, pages)`` of a .docx file, reading word/document.xml straight from the zip.
+    Reading stops once MAX_TEXT_CHARS characters have been collected.
+    """
+    paragraphs = []
+    collected = 0
+    page_breaks = 0
+    with zipfile.ZipFile(path) as archive:
+        # The zip stops inflating a member at its recorded size, so checking that size bounds the work
+        size = archive.getinfo("word/document.xml").file_size
+        if size > MAX_DOCX_XML_BYTES:
+            raise ValueError(f"word/document.xml is {size} bytes uncompressed, over the {MAX_DOCX_XML_BYTES}-byte limit")
+        with archive.open("word/document.xml") as document:
+            current = []
+            for event, element in ElementTree.iterparse(document, events=("end",)):
+                if element.tag == f"{WORD_NAMESPACE}t" and element.text:
+                    current.append(element.text)
+                    collected += len(element.text)
+                elif element.tag == f"{WORD_NAMESPACE}tab":
+                    current.append("\t")
+                elif element.tag == f"{WORD_NAMESPACE}br" and element.get(f"{WORD_NAMESPACE}type") == "page":
+                    page_breaks += 1
+                elif element.tag == f"{WORD_NAMESPACE}p":
+                    paragraphs.append("".join(current))
+                    current = []
+                    element.clear()
+                if collected >= MAX_TEXT_CHARS:
+                    break
+            if current:
+                paragraphs.append("".join(current))
+        pages = page_breaks + 1
+        try:
+            # Word records the rendered page count in the extended properties
+            app_xml = ElementTree.fromstring(archive.read("docProps/app.xml"))
+            for element in app_xml.iter():
+                if element.tag.endswith("}Pages") and element.text and element.text.isdigit():
+                    pages = max(1, int(element.text))
+        except KeyError:
+            pass
+    return "\n".join(paragraphs), pages
+
+
+def extract_pdf_text(path: str) -> tuple:
+    """Return ``(text, pages)`` of a PDF."""
+    reader = pypdf.PdfReader(path)
+    texts = [page.extract_text() or "" for page in reader.pages]
+    return "\n".join(texts), len(reader.pages)
+
+
+def read_image_metadata(path: str) -> dict:
+    """Return the format and pixel dimensions of a PNG or JPEG image from its header."""
+    with open(path, "rb") as image:
+        head = image.read(32)
+        if head.startswith(b"\x89PNG\r\n\x1a\n") and head[12:16] == b"IHDR":
+            width, height = struct.unpack(">II", head[16:24])
+            return {"format": "png", "width": width, "height": height, "bitDepth": head[24]}
+        if head.startswith(b"\xff\xd8"):
+            image.seek(2)
+            while True:
+                marker = image.read(2)
+                if len(marker) < 2 or marker[0] != 0xFF:
+                    break
+                (length,) = struct.unpack(">H", image.read(2))
+                # Start-of-frame markers carry the dimensions (C4, C8 and CC are not frames)
+                if 0xC0 <= marker[1] <= 0xCF and marker[1] not in (0xC4, 0xC8, 0xCC):
+                    precision, height, width, components = struct.unpack(">BHHB", image.read(6))
+                    return {"format": "jpeg", "width": width, "height": height, "components": components}
+                image.seek(length - 2, os.SEEK_CUR)
+            return {"format": "jpeg"}
+    return {}
+
+
+def analyse_document(path: str, mime_type: str) -> dict:
+    """
+    Analyse one stored document. Runs inside the process pool, so it must stay a picklable top-level function.
+
+    Args:
+        path (str): Path of the blob on disk.
+        mime_type (str): The sniffed MIME type recorded at upload.
+
+    Returns:
+        dict: ``mimeType``, ``pages``, ``text``, ``fields`` and, for images, ``image`` metadata.
+    """
+    text, pages, image = "", 0, None
+    if mime_type == "application/pdf":
+        text, pages = extract_pdf_text(path)
+    elif mime_type == "application/vnd.openxmlformats-officedocument.wordprocessingml.document":
+        text, pages = extract_docx_text(path)
+    elif mime_type == "text/plain":
+        with open(path, "r", encoding="utf-8", errors="replace") as document:
+            text = document.read()
+        pages = max(1, -(-len(text) // TEXT_CHARS_PER_PAGE))
+    elif mime_type in ("image/png", "image/jpeg"):
+        image = read_image_metadata(path)
+        pages = 1
+
+    result = {
+        "analyserVersion": ANALYSER_VERSION,
+        "mimeType": mime_type,
+        "pages": pages,
+        "text": text[:MAX_TEXT_CHARS],
+        "fields": extract_claim_fields(text),
+    }
+    if image is not None:
+        result["image"] = image
+    return result
+
+
+def _init_parser_process():
+    """Runs first in every parser process."""
+    configure_process_logging()
+
+
+class DocumentUnderstandingEngine:
+    """
+    Runs analyse_document for stored evidence in a process pool, so CPU-heavy parsing never blocks the
+    event loop, and caches results by content hash in memory and as JSON next to the evidence blobs.
+    The same document is parsed once however many claims or requests reference it.
+    """
+
+    def __init__(self, store: EvidenceStore, max_workers: Optional[int] = None, cache_entries: int = 1024):
+        self.store = store
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._cache = TTLCache(max_entries=cache_entries, ttl_seconds=float("inf"))
+        self._pool = None
+        self._in_flight = {}
+        self._background = set()
+
+    def _executor(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            # Parser processes start from a clean interpreter rather than a fork of this one, which would copy the
+            # event loop, the Mongo client's threads and sockets, and locks that some other thread may be holding
+            if "forkserver" in multiprocessing.get_all_start_methods():
+                context = multiprocessing.get_context("forkserver")
+                # The fork server imports the parsers once; each parser process is forked from it
+                context.set_forkserver_preload([__name__])
+            else:
+                context = multiprocessing.get_context("spawn")
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=context,
+                initializer=_init_parser_process,
+            )
+        return self._pool
+
+    async def _read_cached(self, digest: str) -> Optional[dict]:
+        result = self._cache.get(digest)
+        if result is not None:
+            return result
+        path = self.store.analysis_path(digest)
+        if not await aiofiles.os.path.exists(path):
+            return None
+        async with aiofiles.open(path, "r", encoding="utf-8") as cached:
+            result = json.loads(await cached.read())
+        if result.get("analyserVersion") != ANALYSER_VERSION:
+            return None
+        self._cache.set(digest, result)
+        return result
+
+    async def _write_cached(self, digest: str, result: dict):
+        self._cache.set(digest, result)
+        path = self.store.analysis_path(digest)
+        await aiofiles.os.makedirs(path.parent, exist_ok=True)
+        partial = path.with_name(path.name + ".part")
+        async with aiofiles.open(partial, "w", encoding="utf-8") as cached:
+            await cached.write(json.dumps(result))
+        await aiofiles.os.replace(partial, path)
+
+    async def analyse(self, digest: str, mime_type: str) -> dict:
+        """Return the analysis of a stored blob, computing it in the process pool on a cache miss."""
+        cached = await self._read_cached(digest)
+        if cached is not None:
+            return cached
+        # Concurrent requests for the same document share one parse
+        if digest in self._in_flight:
+            return await asyncio.shield(self._in_flight[digest])
+
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(
+            self._executor(), analyse_document, str(self.store.blob_path(digest)), mime_type
+        )
+        self._in_flight[digest] = future
+        try:
+            result = await future
+            await self._write_cached(digest, result)
+            return result
+        finally:
+            self._in_flight.pop(digest, None)
+
+    async def analyse_claim(self, policy_number: str) -> list:
+        """Analyse every document in a claim's manifest."""
+        entries = await self.store.manifest(policy_number)
+        results = await asyncio.gather(
+            *(self.analyse(entry["digest"], entry["mime_type"]) for entry in entries),
+            return_exceptions=True,
+        )
+        analyses = []
+        for entry, result in zip(entries, results):
+            if isinstance(result, Exception):
+                logger.error(f"Document analysis failed for {entry['filename']}: {result}")
+                result = {"error": str(result)}
+            analyses.append({"filename": entry["filename"], "digest": entry["digest"], **result})
+        return analyses
+
+    def schedule(self, digest: str, mime_type: str):
+        """Analyse a document in the background, e.g. straight after upload, to warm the cache."""
+        task = asyncio.create_task(self.analyse(digest, mime_type))
+        self._background.add(task)
+
+        def _done(finished):
+            self._background.discard(finished)
+            if not finished.cancelled() and finished.exception() is not None:
+                logger.error(f"Background document analysis failed for {digest[:12]}: {finished.exception()}")
+
+        task.add_done_callback(_done)
+
+    async def shutdown(self):
+        for task in list(self._background):
+            task.cancel()
+        if self._pool is not None:
+            pool, self._pool = self._pool, None
+            # Waits for running parses to finish; off the event loop, so the rest of the shutdown is not held up
+            await asyncio.to_thread(pool.shutdown, wait=True, cancel_futures=True)
+
+
+def _build_engine() -> DocumentUnderstandingEngine:
+    settings = get_settings()
+    return DocumentUnderstandingEngine(
+        store=evidence_store,
+        max_workers=settings.DOCUMENT_WORKERS or None,
+        cache_entries=settings.DOCUMENT_CACHE_ENTRIES,
+    )
+
+
+# Shared engine, shut down by the application lifespan
+document_engine = _build_engine()
@@ -1,9 +1,30 @@
+import logging
 from pathlib import Path
-from src.ai_model.aimlapi import make_llm_call
-from src.ai_model.memory_context import create_memory, retrieve_memory_with_k
-from src.utilities.prompt_loader import load_yaml_file
+from typing import AsyncIterator
+from src.ai_model.aimlapi import make_llm_call, stream_llm_call
+from src.ai_model.context_builder import build_context, format_policy_data
+from src.ai_model.memory_context import create_memory, retrieve_turns_with_k
+from src.config.app_settings import get_settings
+from src.utilities.metrics import observe_stage
+from src.utilities.prompt_loader import prompt_registry
 from src.infrastructure.database.mongo import MongoDBClientConfig
 
+logger = logging.getLogger(__name__)
+
+PROMPT_PATH = Path("src/domain/policyintelligencemodule/systemprompt.yaml")
+
+# Scripted turns (menu selections and confirmations) whose reply only depends on the rendered prompt;
+# they run deterministically and are answered from the LLM response cache when the prompt repeats
+DETERMINISTIC_QUERIES = {
+    "i want to make a claim",
+    "i want to check my claim status",
+    "yes",
+    "yes, that is correct",
+    "that is correct",
+    "correct",
+    "confirmed",
+}
+
 
 class ConversationManager:
     def __init__(self,query:str,policy_number:str,policy_data="",db_client_config:MongoDBClientConfig=MongoDBClientConfig):
@@ -11,51 +32,93 @@ class ConversationManager:
         self.policy_number=policy_number
         self.db_client_config=db_client_config
         self.policy_data=policy_data
-        self.chat_history_from_memory=retrieve_memory_with_k(self.db_client_config.get_context_collection(), policy_number,k=3)
+        self.chat_history_from_memory=None
         self.prompt_template = self.load_prompt_template()
 
-    def load_prompt_template(self) -> str:
-        """Load the instruction prompt template from YAML file."""
+    def load_prompt_template(self) -> dict:
+        """Load the compiled instruction prompt templates from the shared prompt registry."""
         try:
-            prompt_path = Path(
-                "src/domain/policyintelligencemodule/systemprompt.yaml"
-            )
-            if not prompt_path.exists():
-                raise FileNotFoundError(f"Prompt template not found at {prompt_path}")
-            yaml_data = load_yaml_file(prompt_path)
+            templates = prompt_registry.load(PROMPT_PATH)
             return {
-                "LLMSYSTEMPROMPT": yaml_data.get("SYSTEMPROMPT", ""),
-                       "LLMUSERPROMPT": yaml_data.get("USERPROMPT", ""),
+                "LLMSYSTEMPROMPT": templates.get("SYSTEMPROMPT"),
+                "LLMPOLICYPROMPT": templates.get("POLICYPROMPT"),
+                       "LLMUSERPROMPT": templates.get("USERPROMPT"),
             }
         except Exception as e:
             raise RuntimeError(f"Failed to load prompt template: {str(e)}")
 
+    @property
+    def deterministic(self) -> bool:
+        return self.query.strip().rstrip(".!").lower() in DETERMINISTIC_QUERIES
+
+    @property
+    def prompt_versions(self) -> dict:
+        return {name: template.version for name, template in self.prompt_template.items() if template is not None}
+
+
+    async def load_chat_history(self):
+        """Fetch the recent turns for this policy from the memory collection; the token budget decides how many are sent."""
+        self.chat_history_from_memory = await retrieve_turns_with_k(
+            self.db_client_config.get_context_collection(), self.policy_number, k=get_settings().SESSION_CACHE_TURNS
+        )
+        return self.chat_history_from_memory
+
+    def build_messages(self)->list:
+        """
+        Render the prompts and the budgeted chat history into chat messages for the model.
+
+        The system prompt takes no values, so it is the same bytes on every call and the provider can
+        cache it; history, policy data and the query follow it as separate messages.
+        """
+        system_prompt = self.prompt_template.get("LLMSYSTEMPROMPT")
+        if system_prompt is None:
+            raise ValueError("Instruction prompt could not be loaded.")
+        system_prompt = system_prompt.render()
 
-    def llm_call(self)->str:
+        policy_prompt = self.prompt_template.get("LLMPOLICYPROMPT")
+        user_prompt = self.prompt_template.get("LLMUSERPROMPT")
+        if user_prompt is None or policy_prompt is None:
+            raise ValueError("user prompt could not be loaded.")
+        
+        policy_prompt = policy_prompt.render(policy_number=self.policy_number,policy_data=format_policy_data(self.policy_data))
+        user_prompt = user_prompt.render(query=self.query)
+        context = build_context(
+            system_prompt, user_prompt, self.chat_history_from_memory, get_settings().MAX_HISTORY_TOKENS, context=policy_prompt
+        )
+        logger.debug(
+            f"Prompt context: {context.prompt_tokens} tokens, {context.history_tokens} of history "
+            f"({context.turns_kept} turns kept, {context.turns_summarised} summarised)"
+        )
+        return context.messages
+
+    async def llm_call(self)->str:
         response = ""
         try:
-            system_prompt = self.load_prompt_template().get("LLMSYSTEMPROMPT")
-            if system_prompt is None:
-                raise ValueError("Instruction prompt could not be loaded.")
-            system_prompt = system_prompt.format(chat_history=self.chat_history_from_memory)
-
-            user_prompt = self.load_prompt_template().get("LLMUSERPROMPT")
-            if user_prompt is None:
-                raise ValueError("user prompt could not be loaded.")
-            
-            user_prompt = user_prompt.format(query=self.query, policy_number=self.policy_number,policy_data=self.policy_data if self.policy_data != "" else "")
-            messages = [
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt},
-            ]
-
-            try:
-                response = make_llm_call(messages)
-                create_memory(self.db_client_config.get_context_collection(),self.policy_number,self.query, response)
-            except Exception as e:
-                print(f"Error during LLM call: {str(e)}")
-                raise
+            await self.load_chat_history()
+            with observe_stage("prompt_build"):
+                messages = self.build_messages()
+            logger.info(f"LLM call with prompt versions {self.prompt_versions}")
+
+            response = await make_llm_call(messages, deterministic=self.deterministic)
+            await create_memory(self.db_client_config.get_context_collection(),self.policy_number,self.query, response)
             return response
         except Exception as e:
-            print(f"Error during LLM call: {str(e)}")
+            logger.error("Error during LLM call: %s", e, exc_info=True)
+            raise
+
+    async def stream_llm_call(self)->AsyncIterator[str]:
+        """Yield the reply as it is generated and persist the assembled reply once the stream ends."""
+        try:
+            await self.load_chat_history()
+            with observe_stage("prompt_build"):
+                messages = self.build_messages()
+            logger.info(f"LLM stream with prompt versions {self.prompt_versions}")
+
+            chunks = []
+            async for delta in stream_llm_call(messages, deterministic=self.deterministic):
+                chunks.append(delta)
+                yield delta
+            await create_memory(self.db_client_config.get_context_collection(),self.policy_number,self.query, "".join(chunks))
+        except Exception as e:
+            logger.error("Error during LLM stream: %s", e, exc_info=True)
             raise
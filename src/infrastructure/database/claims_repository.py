@@ -0,0 +1,248 @@
+import base64
+import json
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator, Optional
+
+from pymongo import ASCENDING, DESCENDING, UpdateOne
+from pymongo.asynchronous.collection import AsyncCollection
+from pymongo.asynchronous.database import AsyncDatabase
+
+CLAIMS_COLLECTION = "claims"
+
+# Fields the list endpoint may sort by; each has an index with _id as the tie-breaker
+SORT_FIELDS = {"dateSubmitted", "fraudScore"}
+# Fields the list endpoint may project; _id is always returned as ``id``
+LIST_FIELDS = {
+    "claimantName", "policyNumber", "carRegistration", "status", "claimType",
+    "claimAmount", "dateSubmitted", "fraudScore", "isNew", "lastUpdated",
+}
+MAX_PAGE_SIZE = 200
+
+
+class InvalidCursor(ValueError):
+    """Raised when a pagination cursor cannot be decoded or does not match the requested sort."""
+
+
+def encode_cursor(sort: str, value, claim_id: str) -> str:
+    if isinstance(value, datetime):
+        value = {"$date": value.isoformat()}
+    raw = json.dumps({"s": sort, "v": value, "id": claim_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str) -> tuple:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        data = json.loads(raw)
+        value = data["v"]
+        if isinstance(value, dict):
+            value = datetime.fromisoformat(value["$date"])
+        claim_id = data["id"]
+    except (ValueError, KeyError, TypeError) as e:
+        raise InvalidCursor("Malformed pagination cursor") from e
+    if data.get("s") != sort:
+        raise InvalidCursor("Cursor was issued for a different sort order")
+    return value, claim_id
+
+
+class ClaimsRepository:
+    """
+    Claims summary records for the admin dashboard, one document per claim keyed by claim id.
+
+    Lists are read with keyset (cursor) pagination: each page continues after the sort value and id of
+    the previous page's last claim, so every page is an index range scan however deep the client pages,
+    and claims inserted meanwhile never shift or duplicate rows the way skip/limit would.
+    """
+
+    def __init__(self):
+        self.collection: Optional[AsyncCollection] = None
+
+    async def open(self, database: AsyncDatabase, collection_name: str = CLAIMS_COLLECTION):
+        """Bind the repository to its collection and create the filter and sort indexes."""
+        self.collection = database[collection_name]
+        for name, keys in (
+            ("dateSubmitted_id", [("dateSubmitted", DESCENDING), ("_id", DESCENDING)]),
+            ("fraudScore_id", [("fraudScore", DESCENDING), ("_id", DESCENDING)]),
+            ("status_dateSubmitted_id", [("status", ASCENDING), ("dateSubmitted", DESCENDING), ("_id", DESCENDING)]),
+            ("status_fraudScore_id", [("status", ASCENDING), ("fraudScore", DESCENDING), ("_id", DESCENDING)]),
+            ("policyNumber_dateSubmitted", [("policyNumber", ASCENDING), ("dateSubmitted", ASCENDING)]),
+        ):
+            await self.collection.create_index(keys, name=name)
+
+    async def record_submitted(self, claim_id: str, policy_number: str, claimant_name: Optional[str] = None):
+        """Create the claim on first submission, or mark an existing claim as processing again."""
+        now = datetime.now(timezone.utc)
+        await self.collection.update_one(
+            {"_id": claim_id},
+            {
+                "$setOnInsert": {
+                    "policyNumber": policy_number,
+                    "claimantName": claimant_name,
+                    "carRegistration": "",
+                    "claimType": "Motor Accident",
+                    "claimAmount": 0,
+                    "fraudScore": 0,
+                    "dateSubmitted": now,
+                    "isNew": True,
+                },
+                "$set": {"status": "processing", "lastUpdated": now},
+            },
+            upsert=True,
+        )
+
+    async def record_assessment(self, record: dict):
+        """Update a claim from the claim record built by a completed analysis."""
+        await self.collection.update_one(
+            {"_id": record["id"]},
+            {
+                "$set": {
+                    "claimantName": record["claimantName"],
+                    "policyNumber": record["policyNumber"],
+                    "carRegistration": record["carRegistration"],
+                    "status": record["status"],
+                    "claimType": record["claimType"],
+                    "claimAmount": record["claimAmount"],
+                    "fraudScore": record["fraudScore"],
+                    "fraudFeatures": record.get("fraudFeatures"),
+                    "isNew": False,
+                    "lastUpdated": datetime.now(timezone.utc),
+                },
+                "$setOnInsert": {"dateSubmitted": datetime.now(timezone.utc)},
+            },
+            upsert=True,
+        )
+
+    async def record_status(self, claim_id: str, status: str):
+        await self.collection.update_one(
+            {"_id": claim_id}, {"$set": {"status": status, "lastUpdated": datetime.now(timezone.utc)}}
+        )
+
+    async def count_prior_claims(self, policy_number: str, claim_id: str, before: datetime, window_days: int) -> int:
+        """Count the other claims on a policy submitted in the ``window_days`` before ``before``."""
+        return await self.collection.count_documents({
+            "policyNumber": policy_number,
+            "_id": {"$ne": claim_id},
+            "dateSubmitted": {"$gte": before - timedelta(days=window_days), "$lt": before},
+        })
+
+    async def scoring_batches(self, batch_size: int = 50000) -> AsyncIterator[list]:
+        """Yield every claim's fraud-scoring inputs in batches, in ``_id`` order."""
+        last_id = None
+        while True:
+            query = {} if last_id is None else {"_id": {"$gt": last_id}}
+            documents = await self.collection.find(
+                query, projection={"policyNumber": 1, "claimAmount": 1, "dateSubmitted": 1, "fraudFeatures": 1}
+            ).sort("_id", ASCENDING).limit(batch_size).to_list()
+            if not documents:
+                return
+            yield documents
+            last_id = documents[-1]["_id"]
+
+    async def update_fraud_scores(self, scores: dict) -> int:
+        """Write ``{claim_id: fraud_score}`` in one bulk write; returns the number of claims whose score changed."""
+        if not scores:
+            return 0
+        result = await self.collection.bulk_write(
+            [
+                UpdateOne({"_id": claim_id, "fraudScore": {"$ne": score}}, {"$set": {"fraudScore": score}})
+                for claim_id, score in scores.items()
+            ],
+            ordered=False,
+        )
+        return result.modified_count
+
+    async def list_claims(
+        self,
+        filters: Optional[dict] = None,
+        sort: str = "dateSubmitted",
+        descending: bool = True,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        fields: Optional[set] = None,
+    ) -> tuple:
+        """
+        Read one page of claims.
+
+        Args:
+            filters (dict, optional): ``status`` (list), ``claimType``, ``policyNumber``, ``minFraudScore``,
+                ``maxFraudScore``, ``submittedFrom`` and ``submittedTo`` (datetimes).
+            sort (str): One of SORT_FIELDS.
+            descending (bool): Sort direction.
+            limit (int): Page size, capped at MAX_PAGE_SIZE.
+            cursor (str, optional): ``nextCursor`` of the previous page.
+            fields (set, optional): Subset of LIST_FIELDS to return; all of them when omitted.
+
+        Returns:
+            tuple: ``(claims, next_cursor)``; ``next_cursor`` is None on the last page.
+
+        Raises:
+            ValueError: For an unknown sort or field.
+            InvalidCursor: For a cursor that cannot be used with this sort.
+        """
+        if sort not in SORT_FIELDS:
+            raise ValueError(f"Cannot sort by '{sort}'; use one of {sorted(SORT_FIELDS)}")
+        fields = set(fields) if fields else set(LIST_FIELDS)
+        unknown = fields - LIST_FIELDS
+        if unknown:
+            raise ValueError(f"Unknown fields: {sorted(unknown)}")
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+
+        query = self._filter_query(filters or {})
+        direction = DESCENDING if descending else ASCENDING
+        if cursor:
+            value, claim_id = decode_cursor(cursor, sort)
+            beyond = "$lt" if descending else "$gt"
+            query = {"$and": [query, {"$or": [
+                {sort: {beyond: value}},
+                {sort: value, "_id": {beyond: claim_id}},
+            ]}]}
+
+        # The sort field is always read so the next cursor can be built from the last claim
+        projection = {field: 1 for field in fields | {sort}}
+        documents = await self.collection.find(query, projection=projection).sort(
+            [(sort, direction), ("_id", direction)]
+        ).limit(limit + 1).to_list()
+
+        next_cursor = None
+        if len(documents) > limit:
+            documents = documents[:limit]
+            last = documents[-1]
+            next_cursor = encode_cursor(sort, last.get(sort), last["_id"])
+
+        claims = []
+        for document in documents:
+            claim = {"id": document["_id"]}
+            # Sorted so the same page always serialises to the same bytes (and ETag) in every worker
+            for field in sorted(fields):
+                value = document.get(field)
+                claim[field] = value.isoformat() if isinstance(value, datetime) else value
+            claims.append(claim)
+        return claims, next_cursor
+
+    @staticmethod
+    def _filter_query(filters: dict) -> dict:
+        query = {}
+        if filters.get("status"):
+            query["status"] = {"$in": list(filters["status"])}
+        for field in ("claimType", "policyNumber"):
+            if filters.get(field):
+                query[field] = filters[field]
+        fraud = {}
+        if filters.get("minFraudScore") is not None:
+            fraud["$gte"] = filters["minFraudScore"]
+        if filters.get("maxFraudScore") is not None:
+            fraud["$lte"] = filters["maxFraudScore"]
+        if fraud:
+            query["fraudScore"] = fraud
+        submitted = {}
+        if filters.get("submittedFrom") is not None:
+            submitted["$gte"] = filters["submittedFrom"]
+        if filters.get("submittedTo") is not None:
+            submitted["$lte"] = filters["submittedTo"]
+        if submitted:
+            query["dateSubmitted"] = submitted
+        return query
+
+
+# Shared repository, opened by the application lifespan and the analysis worker
+claims_repository = ClaimsRepository()
@@ -1,44 +1,53 @@
 import logging
-from pymongo import MongoClient
-from pymongo.database import Database
-from pymongo.collection import Collection
+import time
+from pymongo import AsyncMongoClient
+from pymongo.asynchronous.database import AsyncDatabase
+from pymongo.asynchronous.collection import AsyncCollection
 from pymongo.errors import ConnectionFailure, ServerSelectionTimeoutError
+from src.config.app_settings import get_settings
 from src.config.appconfig import env_config
+from src.ai_model.memory_context import ensure_memory_indexes
 
 
-# Configure logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 class MongoDBClientConfig:
     def __init__(self):
-        """Initialize MongoDB client with comprehensive connection logging."""
+        """Create the async MongoDB client. Call ``connect`` before serving requests."""
+        logger.info("🔄 Initializing MongoDB connection...")
+
+        # Construct the MongoDB URI using app configuration
+        context_uri = env_config.mongo_conn_url
+        logger.info(f"📍 Connecting to MongoDB URI: {self._mask_uri(context_uri)}")
+
+        # Create an async MongoDB client; no I/O happens until the first command, and none waits past the timeouts
+        logger.info("🔗 Creating MongoDB client...")
+        settings = get_settings()
+        self.context_client = AsyncMongoClient(
+            context_uri,
+            serverSelectionTimeoutMS=settings.MONGO_SERVER_SELECTION_TIMEOUT_MS,
+            connectTimeoutMS=settings.MONGO_CONNECT_TIMEOUT_MS,
+        )
+
+        # Connect to the database
+        database_name = env_config.mongo_database_name
+        logger.info(f"🗄️  Connecting to database: '{database_name}'")
+        self.context_db = self.context_client[database_name]
+
+        self.collection_name = 'aichatmemory'
+        self.context_collection = None
+
+    async def connect(self):
+        """Verify connectivity and setup the collection with comprehensive connection logging."""
         try:
-            logger.info("🔄 Initializing MongoDB connection...")
-            
-            # Construct the MongoDB URI using app configuration
-            context_uri = env_config.mongo_conn_url
-            logger.info(f"📍 Connecting to MongoDB URI: {self._mask_uri(context_uri)}")
-            
-            # Create a MongoDB client with TLS configuration
-            logger.info("🔗 Creating MongoDB client...")
-            self.context_client = MongoClient(context_uri, serverSelectionTimeoutMS=5000)
-            
-            db_info = self.context_client.server_info()
+            await self.context_client.admin.command('ping')
             logger.info(f"✅ Successfully connected to MongoDB!")
-            
-            # Connect to the database
-            database_name = env_config.mongo_database_name
-            logger.info(f"🗄️  Connecting to database: '{database_name}'")
-            self.context_db = self.context_client[database_name]
-            
+
             # Setup collection
-            collection_name = 'aichatmemory'
-            self.context_collection = None
-            self._setup_collection(collection_name)
-            
+            await self._setup_collection(self.collection_name)
+
             logger.info("🎉 MongoDB initialization completed successfully!")
-            
+
         except ConnectionFailure as e:
             logger.error(f"❌ Failed to connect to MongoDB: {str(e)}")
             raise
@@ -49,29 +58,20 @@ class MongoDBClientConfig:
             logger.error(f"💥 Unexpected error during MongoDB initialization: {str(e)}")
             raise
 
-    def _setup_collection(self, collection_name):
-        """Setup the collection with proper logging."""
+    async def _setup_collection(self, collection_name):
+        """
+        Setup the collection with proper logging. Creating its indexes creates the collection when missing,
+        so startup costs the same round trips however many collections or documents the database holds.
+        """
         try:
-            logger.info(f"📋 Checking if collection '{collection_name}' exists...")
-            
-            existing_collections = self.context_db.list_collection_names()
-            logger.info(f"📚 Found {len(existing_collections)} existing collections in database")
-            
-            if collection_name not in existing_collections:
-                logger.info(f"➕ Creating new collection: '{collection_name}'")
-                self.context_db.create_collection(collection_name)
-                logger.info(f"✅ Collection '{collection_name}' created successfully!")
-            else:
-                logger.info(f"✅ Collection '{collection_name}' already exists")
-            
             # Connect to the collection
             logger.info(f"🔗 Connecting to collection: '{collection_name}'")
             self.context_collection = self.context_db[collection_name]
-            
-            # Verify collection access
-            doc_count = self.context_collection.count_documents({})
-            logger.info(f"📄 Collection '{collection_name}' contains {doc_count} documents")
-            
+
+            # Create and verify the lookup and TTL indexes
+            await ensure_memory_indexes(self.context_collection)
+            logger.info(f"🗂️  Collection '{collection_name}' indexes verified")
+
         except Exception as e:
             logger.error(f"❌ Error setting up collection '{collection_name}': {str(e)}")
             raise
@@ -93,69 +93,67 @@ class MongoDBClientConfig:
         return uri.split('://')[0] + '://***' if '://' in uri else '***'
 
 
-    def get_context_db(self)->Database:
-        """Get the context database instance with logging."""
-        logger.info("🔍 Retrieving context database instance...")
-
-        logger.info("✅ Context database instance retrieved successfully")
+    def get_context_db(self)->AsyncDatabase:
+        """Get the context database instance."""
         return self.context_db
 
 
-    def get_context_collection(self)->Collection:
-        """Get the context collection instance with logging."""
-        logger.info("🔍 Retrieving context collection instance...")
-        logger.info("✅ Context collection instance retrieved successfully")
+    def get_context_collection(self)->AsyncCollection:
+        """Get the context collection instance; called on every chat turn, so it does not log."""
         return self.context_collection
 
-    def health_check(self):
+    async def check_health(self) -> dict:
+        """
+        Cheap enough to run every few seconds: a ``ping`` round trip and the chat memory size from
+        collection metadata (``estimated_document_count``), never a scan. Raises if MongoDB is unreachable.
+        """
+        started = time.perf_counter()
+        await self.context_client.admin.command('ping')
+        ping_seconds = time.perf_counter() - started
+        detail = {"pingMs": round(ping_seconds * 1000, 2)}
+        if self.context_collection is not None:
+            detail["chatMemoryDocuments"] = await self.context_collection.estimated_document_count()
+        return detail
+
+    async def health_check(self):
         """Perform a health check on the MongoDB connection."""
         try:
-            logger.info("🩺 Performing MongoDB health check...")
-            
-            # Test basic connectivity
-            self.context_client.admin.command('ismaster')
-            logger.info("✅ MongoDB connection is healthy")
-            
-            # Test database access
-            collections = self.context_db.list_collection_names()
-            logger.info(f"✅ Database access verified - {len(collections)} collections found")
-            
-            # Test collection access
-            if hasattr(self, 'context_collection'):
-                doc_count = self.context_collection.count_documents({})
-                logger.info(f"✅ Collection access verified - {doc_count} documents")
-            
+            detail = await self.check_health()
+            logger.info(f"✅ MongoDB connection is healthy ({detail['pingMs']} ms)")
             return True
-            
         except Exception as e:
             logger.error(f"❌ Health check failed: {str(e)}")
             return False
 
-    def close_connection(self):
+    async def close_connection(self):
         """Close the MongoDB connection with logging."""
         try:
             logger.info("🔒 Closing MongoDB connection...")
             if hasattr(self, 'context_client'):
-                self.context_client.close()
+                await self.context_client.close()
                 logger.info("✅ MongoDB connection closed successfully")
         except Exception as e:
             logger.error(f"❌ Error closing MongoDB connection: {str(e)}")
 
 # Usage example:
 if __name__ == "__main__":
-    try:
+    import asyncio
+
+    async def main():
         # Initialize the MongoDB client
         mongo_client = MongoDBClientConfig()
-        
-        # Perform health check
-        mongo_client.health_check()
-        
-        # Your application logic here...
-        
-    except Exception as e:
-        logger.error(f"Application failed to start: {str(e)}")
-    finally:
-        # Clean up
-        if 'mongo_client' in locals():
-            mongo_client.close_connection()
-  
\ No newline at end of file
+        try:
+            await mongo_client.connect()
+
+            # Perform health check
+            await mongo_client.health_check()
+
+            # Your application logic here...
+
+        except Exception as e:
+            logger.error(f"Application failed to start: {str(e)}")
+        finally:
+            # Clean up
+            await mongo_client.close_connection()
+
+    asyncio.run(main())
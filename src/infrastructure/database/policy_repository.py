@@ -0,0 +1,175 @@
+import asyncio
+from abc import ABC, abstractmethod
+from typing import Iterable, Optional
+
+from pymongo.asynchronous.collection import AsyncCollection
+from pymongo.asynchronous.database import AsyncDatabase
+
+from src.config.app_settings import get_settings
+from src.infrastructure.schema import generate_fake_policy_information
+from src.utilities.ttl_cache import TTLCache
+
+POLICIES_COLLECTION = "policies"
+
+# Cached in place of a policy that does not exist, so unknown numbers are not looked up on every request
+_UNKNOWN = object()
+
+
+class PolicyRepository(ABC):
+    """
+    Source of policy information, as dicts in the ``UserPolicyInformation`` shape.
+
+    ``get`` returns None for a policy number that does not exist. Returned dicts are the caller's own.
+    """
+
+    async def open(self, database: AsyncDatabase) -> None:
+        pass
+
+    @abstractmethod
+    async def get(self, policy_number: str) -> Optional[dict]:
+        raise NotImplementedError
+
+    async def get_many(self, policy_numbers: Iterable[str]) -> dict:
+        """Return ``{policy_number: policy}`` for the policies that exist."""
+        numbers = list(dict.fromkeys(policy_numbers))
+        policies = await asyncio.gather(*(self.get(number) for number in numbers))
+        return {number: policy for number, policy in zip(numbers, policies) if policy is not None}
+
+
+class DemoPolicyRepository(PolicyRepository):
+    """Every policy number exists and belongs to the demo policy holder."""
+
+    async def get(self, policy_number: str) -> Optional[dict]:
+        return generate_fake_policy_information(policy_number)
+
+
+class MongoPolicyRepository(PolicyRepository):
+    """Policies stored one document per policy in the ``policies`` collection, keyed by policy number."""
+
+    def __init__(self, collection_name: str = POLICIES_COLLECTION, batch_size: int = 1000):
+        self.collection_name = collection_name
+        self.batch_size = batch_size
+        self.collection: Optional[AsyncCollection] = None
+
+    async def open(self, database: AsyncDatabase) -> None:
+        self.collection = database[self.collection_name]
+
+    @staticmethod
+    def _to_policy(document: dict) -> dict:
+        document["policy_number"] = document.pop("_id")
+        return document
+
+    async def get(self, policy_number: str) -> Optional[dict]:
+        document = await self.collection.find_one({"_id": policy_number})
+        return None if document is None else self._to_policy(document)
+
+    async def get_many(self, policy_numbers: Iterable[str]) -> dict:
+        numbers = list(dict.fromkeys(policy_numbers))
+        policies = {}
+        # One $in query per batch, served by the _id index
+        for offset in range(0, len(numbers), self.batch_size):
+            documents = await self.collection.find(
+                {"_id": {"$in": numbers[offset:offset + self.batch_size]}}
+            ).to_list()
+            for document in documents:
+                policy = self._to_policy(document)
+                policies[policy["policy_number"]] = policy
+        return policies
+
+
+class CachedPolicyRepository(PolicyRepository):
+    """
+    LRU/TTL cache in front of another policy repository.
+
+    Policies change rarely and are read on almost every chat turn, so found policies are kept for
+    ``ttl_seconds`` and unknown policy numbers for the shorter ``negative_ttl_seconds``. Concurrent
+    misses for the same policy share one backend lookup.
+    """
+
+    def __init__(self, backend: PolicyRepository, max_entries: int, ttl_seconds: float, negative_ttl_seconds: float):
+        self.backend = backend
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._cache = TTLCache(max_entries=max_entries, ttl_seconds=ttl_seconds)
+        self._pending = {}
+
+    async def open(self, database: AsyncDatabase) -> None:
+        await self.backend.open(database)
+
+    def _store(self, policy_number: str, policy: Optional[dict]):
+        if policy is None:
+            self._cache.set(policy_number, _UNKNOWN, ttl_seconds=self.negative_ttl_seconds)
+        else:
+            self._cache.set(policy_number, policy)
+
+    async def _load(self, policy_number: str) -> Optional[dict]:
+        try:
+            policy = await self.backend.get(policy_number)
+            self._store(policy_number, policy)
+            return policy
+        finally:
+            self._pending.pop(policy_number, None)
+
+    async def get(self, policy_number: str) -> Optional[dict]:
+        cached = self._cache.get(policy_number)
+        if cached is not None:
+            self.hits += 1
+            return None if cached is _UNKNOWN else dict(cached)
+        self.misses += 1
+        pending = self._pending.get(policy_number)
+        if pending is None:
+            pending = self._pending[policy_number] = asyncio.ensure_future(self._load(policy_number))
+        policy = await asyncio.shield(pending)
+        return None if policy is None else dict(policy)
+
+    async def get_many(self, policy_numbers: Iterable[str]) -> dict:
+        policies, missing = {}, []
+        for number in dict.fromkeys(policy_numbers):
+            cached = self._cache.get(number)
+            if cached is None:
+                missing.append(number)
+                continue
+            self.hits += 1
+            if cached is not _UNKNOWN:
+                policies[number] = dict(cached)
+        self.misses += len(missing)
+        if missing:
+            found = await self.backend.get_many(missing)
+            for number in missing:
+                self._store(number, found.get(number))
+                if number in found:
+                    policies[number] = dict(found[number])
+        return policies
+
+    async def warm(self, policy_number: str) -> bool:
+        """Load a policy into the cache ahead of use; returns whether the policy exists."""
+        return await self.get(policy_number) is not None
+
+    def invalidate(self, policy_number: Optional[str] = None):
+        """Forget one cached policy after it changed, or every cached policy."""
+        if policy_number is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(policy_number)
+
+
+def _build_policy_repository() -> CachedPolicyRepository:
+    settings = get_settings()
+    backend = settings.POLICY_BACKEND.lower()
+    if backend == "mongo":
+        source = MongoPolicyRepository()
+    elif backend == "demo":
+        source = DemoPolicyRepository()
+    else:
+        raise ValueError(f"Unknown POLICY_BACKEND: {settings.POLICY_BACKEND}")
+    return CachedPolicyRepository(
+        source,
+        max_entries=settings.POLICY_CACHE_ENTRIES,
+        ttl_seconds=settings.POLICY_CACHE_TTL_SECONDS,
+        negative_ttl_seconds=settings.POLICY_NEGATIVE_CACHE_TTL_SECONDS,
+    )
+
+
+# Shared repository, opened by the application lifespan and the analysis worker
+policy_repository = _build_policy_repository()
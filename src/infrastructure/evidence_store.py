@@ -0,0 +1,292 @@
+import asyncio
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+from src.config.app_settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class IngestResult:
+    digest: str
+    path: Path
+    size: int
+    mime_type: str
+    deduplicated: bool  # True when the blob was already stored
+
+
+class EvidenceStore:
+    """
+    Content-addressed storage for uploaded evidence.
+
+    Every blob is stored once under its SHA-256 digest at ``blobs/<first two hex chars>/<digest>``.
+    Per-claim manifests map ``(policy_number, filename)`` to a digest, and each blob keeps a reference
+    count of the manifest entries pointing at it. Blobs whose count drops to zero are removed by
+    ``collect_garbage``. The index is a SQLite file next to the blobs, safe to share between workers.
+    """
+
+    def __init__(self, root: str):
+        self.root = Path(root)
+        self.blob_dir = self.root / "blobs"
+        self.staging_dir = self.root / "staging"
+        self.index_path = self.root / "index.sqlite3"
+        self._lock = threading.Lock()
+        self._conn = None
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.blob_dir.mkdir(parents=True, exist_ok=True)
+            self.staging_dir.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.index_path, timeout=10, isolation_level=None, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS blobs (
+                    digest TEXT PRIMARY KEY,
+                    size INTEGER NOT NULL,
+                    mime_type TEXT NOT NULL,
+                    refcount INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    released_at REAL
+                );
+                CREATE INDEX IF NOT EXISTS blobs_unreferenced ON blobs (released_at) WHERE refcount = 0;
+                CREATE TABLE IF NOT EXISTS manifest_entries (
+                    policy_number TEXT NOT NULL,
+                    filename TEXT NOT NULL,
+                    digest TEXT NOT NULL REFERENCES blobs (digest),
+                    uploaded_at REAL NOT NULL,
+                    PRIMARY KEY (policy_number, filename)
+                );
+                CREATE INDEX IF NOT EXISTS manifest_entries_digest ON manifest_entries (digest);
+                CREATE INDEX IF NOT EXISTS manifest_entries_uploaded_at ON manifest_entries (uploaded_at);
+                """
+            )
+            self._conn = conn
+        return self._conn
+
+    def blob_path(self, digest: str) -> Path:
+        return self.blob_dir / digest[:2] / digest
+
+    def analysis_path(self, digest: str) -> Path:
+        """Where the document-understanding result derived from a blob is cached."""
+        return self.root / "analysis" / digest[:2] / f"{digest}.json"
+
+    def staging_path(self, extension: str) -> Path:
+        """A unique path to stream an upload to before it is ingested."""
+        return self.staging_dir / f"{uuid.uuid4().hex}{extension}"
+
+    def _decrement(self, conn: sqlite3.Connection, digest: str, now: float) -> None:
+        conn.execute(
+            "UPDATE blobs SET refcount = refcount - 1,"
+            " released_at = CASE WHEN refcount - 1 = 0 THEN ? ELSE released_at END WHERE digest = ?",
+            (now, digest),
+        )
+
+    def _ingest(self, staged: Path, digest: str, size: int, mime_type: str, policy_number: str, filename: str) -> IngestResult:
+        with self._lock:
+            conn = self._connection()
+            now = time.time()
+            blob_path = self.blob_path(digest)
+            # The write lock also serialises against collect_garbage in other workers
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute("SELECT digest FROM blobs WHERE digest = ?", (digest,)).fetchone()
+                deduplicated = row is not None and blob_path.exists()
+                if deduplicated:
+                    staged.unlink(missing_ok=True)
+                else:
+                    blob_path.parent.mkdir(parents=True, exist_ok=True)
+                    os.replace(staged, blob_path)
+                    conn.execute(
+                        "INSERT OR IGNORE INTO blobs (digest, size, mime_type, refcount, created_at, released_at)"
+                        " VALUES (?, ?, ?, 0, ?, ?)",
+                        (digest, size, mime_type, now, now),
+                    )
+
+                previous = conn.execute(
+                    "SELECT digest FROM manifest_entries WHERE policy_number = ? AND filename = ?",
+                    (policy_number, filename),
+                ).fetchone()
+                if previous is None or previous["digest"] != digest:
+                    if previous is not None:
+                        self._decrement(conn, previous["digest"], now)
+                    conn.execute(
+                        "UPDATE blobs SET refcount = refcount + 1, released_at = NULL WHERE digest = ?", (digest,)
+                    )
+                conn.execute(
+                    "INSERT OR REPLACE INTO manifest_entries (policy_number, filename, digest, uploaded_at)"
+                    " VALUES (?, ?, ?, ?)",
+                    (policy_number, filename, digest, now),
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        return IngestResult(digest=digest, path=blob_path, size=size, mime_type=mime_type, deduplicated=deduplicated)
+
+    def _manifest(self, policy_number: str) -> list:
+        with self._lock:
+            rows = self._connection().execute(
+                "SELECT m.filename, m.digest, m.uploaded_at, b.size, b.mime_type"
+                " FROM manifest_entries m JOIN blobs b ON b.digest = m.digest"
+                " WHERE m.policy_number = ? ORDER BY m.uploaded_at",
+                (policy_number,),
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def _shared_evidence(self, policy_number: str) -> int:
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT MAX(shared) FROM ("
+                " SELECT COUNT(DISTINCT o.policy_number) AS shared"
+                " FROM manifest_entries m JOIN manifest_entries o"
+                " ON o.digest = m.digest AND o.policy_number != m.policy_number"
+                " WHERE m.policy_number = ? GROUP BY m.digest)",
+                (policy_number,),
+            ).fetchone()
+        return row[0] or 0
+
+    def _digest_pairs(self) -> list:
+        with self._lock:
+            rows = self._connection().execute("SELECT policy_number, digest FROM manifest_entries").fetchall()
+        return [(row["policy_number"], row["digest"]) for row in rows]
+
+    def _release(self, policy_number: str, filename: Optional[str]) -> int:
+        with self._lock:
+            conn = self._connection()
+            now = time.time()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                if filename is None:
+                    rows = conn.execute(
+                        "SELECT filename, digest FROM manifest_entries WHERE policy_number = ?", (policy_number,)
+                    ).fetchall()
+                else:
+                    rows = conn.execute(
+                        "SELECT filename, digest FROM manifest_entries WHERE policy_number = ? AND filename = ?",
+                        (policy_number, filename),
+                    ).fetchall()
+                for row in rows:
+                    conn.execute(
+                        "DELETE FROM manifest_entries WHERE policy_number = ? AND filename = ?",
+                        (policy_number, row["filename"]),
+                    )
+                    self._decrement(conn, row["digest"], now)
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        return len(rows)
+
+    def _expire_before(self, cutoff: float, limit: int) -> int:
+        with self._lock:
+            conn = self._connection()
+            now = time.time()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                # Walks the uploaded_at index from the oldest entry, so only expired entries are touched
+                rows = conn.execute(
+                    "SELECT policy_number, filename, digest FROM manifest_entries"
+                    " WHERE uploaded_at < ? ORDER BY uploaded_at LIMIT ?",
+                    (cutoff, limit),
+                ).fetchall()
+                for row in rows:
+                    conn.execute(
+                        "DELETE FROM manifest_entries WHERE policy_number = ? AND filename = ?",
+                        (row["policy_number"], row["filename"]),
+                    )
+                    self._decrement(conn, row["digest"], now)
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        return len(rows)
+
+    def _collect_garbage(self, limit: int, grace_seconds: float) -> tuple:
+        with self._lock:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                rows = conn.execute(
+                    "SELECT digest, size FROM blobs WHERE refcount = 0 AND released_at <= ?"
+                    " ORDER BY released_at LIMIT ?",
+                    (time.time() - grace_seconds, limit),
+                ).fetchall()
+                reclaimed = 0
+                for row in rows:
+                    self.blob_path(row["digest"]).unlink(missing_ok=True)
+                    self.analysis_path(row["digest"]).unlink(missing_ok=True)
+                    conn.execute("DELETE FROM blobs WHERE digest = ?", (row["digest"],))
+                    reclaimed += row["size"]
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        return len(rows), reclaimed
+
+    async def ingest(self, staged: Path, digest: str, size: int, mime_type: str, policy_number: str, filename: str) -> IngestResult:
+        """
+        Move a staged upload into the store (or drop it if the blob already exists) and reference it
+        from the claim's manifest. Re-uploading the same content under the same name is a no-op.
+
+        Args:
+            staged (Path): The fully written upload, normally from ``staging_path``.
+            digest (str): SHA-256 hex digest of the content.
+            size (int): Size in bytes.
+            mime_type (str): Sniffed MIME type.
+            policy_number (str): The claim the file belongs to.
+            filename (str): The sanitised name the claimant uploaded it under.
+
+        Returns:
+            IngestResult: Where the blob lives and whether it was already stored.
+        """
+        return await asyncio.to_thread(self._ingest, staged, digest, size, mime_type, policy_number, filename)
+
+    async def manifest(self, policy_number: str) -> list:
+        """Return the manifest entries of a claim, oldest first."""
+        return await asyncio.to_thread(self._manifest, policy_number)
+
+    async def shared_evidence(self, policy_number: str) -> int:
+        """The largest number of other claims that uploaded a file identical to one of this claim's files."""
+        return await asyncio.to_thread(self._shared_evidence, policy_number)
+
+    async def digest_pairs(self) -> list:
+        """Every ``(policy_number, digest)`` manifest pair, for scoring the whole claim book."""
+        return await asyncio.to_thread(self._digest_pairs)
+
+    async def release(self, policy_number: str, filename: Optional[str] = None) -> int:
+        """Remove one file, or the whole manifest, of a claim; returns the number of entries removed."""
+        return await asyncio.to_thread(self._release, policy_number, filename)
+
+    async def expire_before(self, cutoff: float, limit: int = 1000) -> int:
+        """Release up to ``limit`` of the oldest manifest entries uploaded before ``cutoff`` (epoch seconds)."""
+        return await asyncio.to_thread(self._expire_before, cutoff, limit)
+
+    async def collect_garbage(self, limit: int = 1000, grace_seconds: float = 60.0) -> tuple:
+        """
+        Delete up to ``limit`` blobs that no manifest references any more.
+
+        Blobs released less than ``grace_seconds`` ago are kept, so a file dropped and re-uploaded
+        straight away is deduplicated instead of rewritten. Returns ``(blobs_deleted, bytes_reclaimed)``.
+        """
+        return await asyncio.to_thread(self._collect_garbage, limit, grace_seconds)
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+# Shared store for the whole process
+evidence_store = EvidenceStore(get_settings().EVIDENCE_STORE_PATH)
@@ -0,0 +1,465 @@
+import asyncio
+import logging
+import os
+import socket
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from pymongo import ASCENDING, ReturnDocument
+from pymongo.asynchronous.collection import AsyncCollection
+from pymongo.asynchronous.database import AsyncDatabase
+from pymongo.errors import PyMongoError
+
+from src.config.app_settings import get_settings
+from src.domain.evidencesynthesisengine import claimassessment
+from src.infrastructure.database.claims_repository import ClaimsRepository, claims_repository
+
+logger = logging.getLogger(__name__)
+
+JOB_COLLECTION = "claim_analysis_jobs"
+
+
+async def _document_extraction(job: dict) -> dict:
+    return await claimassessment.extract_documents(job["policyNumber"])
+
+
+async def _policy_check(job: dict) -> dict:
+    return await claimassessment.check_policy(job["policyNumber"], job["stageResults"]["document_extraction"])
+
+
+async def _fraud_scoring(job: dict) -> dict:
+    results = job["stageResults"]
+    return await claimassessment.score_fraud(
+        job["_id"], job["policyNumber"], job["createdAt"], results["document_extraction"], results["policy_check"]
+    )
+
+
+async def _llm_assessment(job: dict) -> dict:
+    results = job["stageResults"]
+    return await claimassessment.assess_claim(
+        job["_id"], job["policyNumber"], results["document_extraction"], results["policy_check"], results["fraud_scoring"]
+    )
+
+
+# Analysis stages in the order they run: (name, status shown while running, handler)
+STAGES = (
+    ("document_extraction", "Extracting evidence from uploaded documents...", _document_extraction),
+    ("policy_check", "Checking the claim against the policy...", _policy_check),
+    ("fraud_scoring", "Scoring fraud indicators...", _fraud_scoring),
+    ("llm_assessment", "AI assessment in progress...", _llm_assessment),
+)
+
+
+class _LeaseLost(Exception):
+    """Another worker took over the job after this worker's lease expired."""
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class ClaimAnalysisQueue:
+    """
+    Mongo-backed job queue that runs the claim analysis stages on a pool of worker tasks.
+
+    A job is one document per claim in ``claim_analysis_jobs``. Workers claim queued jobs with an
+    atomic ``find_one_and_update`` and hold them under a lease they renew while working, so any number
+    of API or dedicated worker processes can share the queue. Each stage's result is persisted as soon
+    as it finishes: a job whose worker dies is picked up again once its lease expires and resumes at the
+    first unfinished stage. Failed stages are retried with a growing delay up to ``max_attempts`` times.
+    A restart requested while a worker holds the job is recorded on it (``rerunRequested``), and the
+    worker queues the job again from scratch instead of settling it.
+    """
+
+    def __init__(
+        self,
+        workers: int = 2,
+        lease_seconds: float = 120.0,
+        poll_interval: float = 2.0,
+        max_attempts: int = 3,
+        retry_delay: float = 30.0,
+        claims: ClaimsRepository = claims_repository,
+    ):
+        self.workers = workers
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.claims = claims
+        self.collection: Optional[AsyncCollection] = None
+        self._tasks = []
+        self._stopping = None
+        self._wakeup = None
+        self._worker_prefix = f"{socket.gethostname()}:{os.getpid()}"
+        self._listeners = []
+
+    async def open(self, database: AsyncDatabase):
+        """Bind the queue and the claims repository it updates, and create the indexes the workers claim jobs through."""
+        if self.claims.collection is None:
+            await self.claims.open(database)
+        self.collection = database[JOB_COLLECTION]
+        await self.collection.create_index([("status", ASCENDING), ("availableAt", ASCENDING)], name="status_available")
+        await self.collection.create_index([("status", ASCENDING), ("leaseExpiresAt", ASCENDING)], name="status_lease")
+        await self.collection.create_index([("updatedAt", ASCENDING)], name="updated_at")
+
+    def add_listener(self, callback):
+        """Call ``callback(job)`` whenever a job submitted or processed in this process changes."""
+        if callback not in self._listeners:
+            self._listeners.append(callback)
+
+    def remove_listener(self, callback):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def _changed(self, job: dict):
+        for callback in self._listeners:
+            try:
+                callback(job)
+            except Exception as e:
+                logger.error(f"Claim analysis listener failed: {e}")
+
+    def _new_job(self, policy_number: str) -> dict:
+        now = _now()
+        return {
+            "policyNumber": policy_number,
+            "status": "queued",
+            "stages": [{"name": name, "status": "pending"} for name, _, _ in STAGES],
+            "stageResults": {},
+            "currentStage": None,
+            "progress": 0,
+            "attempts": 0,
+            "availableAt": now,
+            "leaseOwner": None,
+            "leaseExpiresAt": None,
+            "result": None,
+            "error": None,
+            "rerunRequested": False,
+            "createdAt": now,
+            "updatedAt": now,
+        }
+
+    async def submit(self, claim_id: str, policy_number: Optional[str] = None, restart: bool = False) -> dict:
+        """
+        Queue the analysis of a claim. Submitting a claim that already has a job returns that job,
+        unless ``restart`` is set: a job no worker holds is then queued again from scratch, and a running
+        one is queued again from scratch as soon as its current run ends.
+
+        Args:
+            claim_id (str): The claim to analyse; also the job id.
+            policy_number (str, optional): Policy the evidence was uploaded under; defaults to the claim id.
+            restart (bool): Re-run the analysis, e.g. because evidence was added.
+
+        Returns:
+            dict: The job document.
+        """
+        policy_number = policy_number or claim_id
+        job = self._new_job(policy_number)
+        # Twice at most: a running job can finish between the two updates, and is then replaced on the second pass
+        for _ in range(2 if restart else 0):
+            replaced = await self.collection.find_one_and_replace(
+                {"_id": claim_id, "status": {"$in": ["queued", "completed", "failed"]}},
+                job,
+                return_document=ReturnDocument.AFTER,
+            )
+            if replaced is not None:
+                await self.claims.record_submitted(
+                    claim_id, policy_number, await claimassessment.policy_holder_name(policy_number)
+                )
+                self._notify()
+                self._changed(replaced)
+                return replaced
+            running = await self.collection.find_one_and_update(
+                {"_id": claim_id, "status": "running"},
+                {"$set": {"rerunRequested": True}},
+                return_document=ReturnDocument.AFTER,
+            )
+            if running is not None:
+                return running
+
+        inserted = await self.collection.update_one({"_id": claim_id}, {"$setOnInsert": job}, upsert=True)
+        if inserted.upserted_id is not None:
+            await self.claims.record_submitted(
+                claim_id, policy_number, await claimassessment.policy_holder_name(policy_number)
+            )
+            self._notify()
+        job = await self.collection.find_one({"_id": claim_id})
+        self._changed(job)
+        return job
+
+    async def get(self, claim_id: str) -> Optional[dict]:
+        return await self.collection.find_one({"_id": claim_id})
+
+    @staticmethod
+    def describe(job: dict) -> dict:
+        """Summarise a job for the status endpoint: status, current stage, progress and, once done, the claim data."""
+        labels = {name: label for name, label, _ in STAGES}
+        if job["status"] == "completed":
+            status, processing_status = "completed", "Analysis completed successfully"
+        elif job["status"] == "failed":
+            status, processing_status = "failed", f"Analysis failed: {job.get('error')}"
+        else:
+            status = "running"
+            processing_status = labels.get(job.get("currentStage"), "Waiting for an analysis worker...")
+        return {
+            "status": status,
+            "processing_status": processing_status,
+            "progress": job.get("progress", 0),
+            "attempts": job.get("attempts", 0),
+            "stages": [
+                {key: value for key, value in stage.items() if key != "error" or value}
+                for stage in job["stages"]
+            ],
+            "data": job.get("result") if status == "completed" else None,
+        }
+
+    def _notify(self):
+        # Wake idle local workers straight away instead of waiting for the next poll
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def start(self):
+        """Start the worker tasks on the running event loop."""
+        if self._tasks or self.workers <= 0:
+            return
+        self._stopping = asyncio.Event()
+        self._wakeup = asyncio.Event()
+        self._tasks = [
+            asyncio.create_task(self._worker(), name=f"claim-analysis-worker-{index}")
+            for index in range(self.workers)
+        ]
+
+    async def stop(self, timeout: float = 10.0):
+        """Let workers finish their current job for up to ``timeout`` seconds, then hand unfinished jobs back to the queue."""
+        if not self._tasks:
+            return
+        self._stopping.set()
+        self._wakeup.set()
+        done, pending = await asyncio.wait(self._tasks, timeout=timeout)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        self._tasks = []
+
+    async def _worker(self):
+        while not self._stopping.is_set():
+            try:
+                job = await self._claim_next()
+            except PyMongoError as e:
+                logger.warning(f"Could not claim a claim analysis job: {e}")
+                job = None
+
+            if job is None:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            try:
+                await self._process(job)
+            except _LeaseLost:
+                logger.warning(f"Lost the lease on claim analysis job {job['_id']}; another worker resumed it")
+            except Exception as e:
+                logger.error(f"Unexpected error in claim analysis job {job['_id']}: {e}")
+
+    async def _claim_next(self) -> Optional[dict]:
+        now = _now()
+        update = {
+            "$set": {
+                "status": "running",
+                "leaseOwner": f"{self._worker_prefix}:{uuid.uuid4().hex[:8]}",
+                "leaseExpiresAt": now + timedelta(seconds=self.lease_seconds),
+                "updatedAt": now,
+            },
+            "$inc": {"attempts": 1},
+        }
+        # Jobs whose worker died are resumed first, then queued jobs in the order they became available
+        job = await self.collection.find_one_and_update(
+            {"status": "running", "leaseExpiresAt": {"$lte": now}},
+            update,
+            sort=[("leaseExpiresAt", ASCENDING)],
+            return_document=ReturnDocument.AFTER,
+        )
+        if job is None:
+            job = await self.collection.find_one_and_update(
+                {"status": "queued", "availableAt": {"$lte": now}},
+                update,
+                sort=[("availableAt", ASCENDING)],
+                return_document=ReturnDocument.AFTER,
+            )
+        return job
+
+    async def _update(self, job: dict, fields: dict, condition: Optional[dict] = None):
+        """Persist fields of a job this worker holds the lease on, and that also matches ``condition`` if given."""
+        fields["updatedAt"] = _now()
+        result = await self.collection.update_one(
+            {**(condition or {}), "_id": job["_id"], "leaseOwner": job["leaseOwner"]}, {"$set": fields}
+        )
+        if result.matched_count == 0:
+            raise _LeaseLost()
+        # Mirror the update on the local copy so listeners see the job as stored
+        for key, value in fields.items():
+            *path, last = key.split(".")
+            target = job
+            for part in path:
+                target = target[int(part)] if isinstance(target, list) else target.setdefault(part, {})
+            if isinstance(target, list):
+                target[int(last)] = value
+            else:
+                target[last] = value
+        if self._listeners and set(fields) != {"leaseExpiresAt", "updatedAt"}:
+            self._changed(job)
+
+    async def _renew_lease(self, job: dict):
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            try:
+                await self._update(job, {"leaseExpiresAt": _now() + timedelta(seconds=self.lease_seconds)})
+            except _LeaseLost:
+                return
+            except PyMongoError as e:
+                logger.warning(f"Could not renew the lease on claim analysis job {job['_id']}: {e}")
+
+    async def _restart_if_requested(self, job: dict) -> bool:
+        """Queue a job this worker holds again from scratch if a restart was requested while it ran."""
+        restarted = await self.collection.find_one_and_replace(
+            {"_id": job["_id"], "leaseOwner": job["leaseOwner"], "rerunRequested": True},
+            self._new_job(job["policyNumber"]),
+            return_document=ReturnDocument.AFTER,
+        )
+        if restarted is None:
+            return False
+        await self.claims.record_submitted(job["_id"], job["policyNumber"])
+        self._notify()
+        self._changed(restarted)
+        return True
+
+    async def _settle(self, job: dict, fields: dict) -> bool:
+        """
+        Record how a run ended and give up the lease, unless a restart was requested meanwhile: the job is then
+        queued again from scratch instead. Returns whether the fields were written.
+        """
+        try:
+            await self._update(
+                job, {**fields, "leaseOwner": None, "leaseExpiresAt": None}, condition={"rerunRequested": {"$ne": True}}
+            )
+            return True
+        except _LeaseLost:
+            if await self._restart_if_requested(job):
+                return False
+            raise
+
+    async def _process(self, job: dict):
+        if job["attempts"] > self.max_attempts:
+            if await self._settle(job, {"status": "failed"}):
+                await self.claims.record_status(job["_id"], "flagged")
+            return
+
+        heartbeat = asyncio.create_task(self._renew_lease(job))
+        index = 0
+        try:
+            for index, (name, _, handler) in enumerate(STAGES):
+                if job["stages"][index]["status"] == "completed":
+                    continue
+                await self._update(job, {
+                    f"stages.{index}.status": "running",
+                    f"stages.{index}.startedAt": _now(),
+                    "currentStage": name,
+                })
+                result = await handler(job)
+                await self._update(job, {
+                    f"stages.{index}.status": "completed",
+                    f"stages.{index}.completedAt": _now(),
+                    f"stageResults.{name}": result,
+                    "progress": round(100 * (index + 1) / len(STAGES)),
+                })
+
+            record = claimassessment.build_claim_record(job)
+            # The claims list is updated first so a failure here retries without re-running any stage
+            await self.claims.record_assessment(record)
+            await self._settle(job, {
+                "status": "completed",
+                "result": record,
+                "currentStage": None,
+                "error": None,
+            })
+        except _LeaseLost:
+            raise
+        except asyncio.CancelledError:
+            # Shutting down: hand the job back so another worker resumes it without waiting for the lease
+            await asyncio.shield(self._release(job, {"status": "queued", "availableAt": _now()}))
+            raise
+        except Exception as e:
+            logger.error(f"Claim analysis stage '{STAGES[index][0]}' failed for {job['_id']}: {e}")
+            retry = job["attempts"] < self.max_attempts
+            try:
+                settled = await self._settle(job, {
+                    f"stages.{index}.status": "failed",
+                    f"stages.{index}.error": str(e),
+                    "status": "queued" if retry else "failed",
+                    "availableAt": _now() + timedelta(seconds=self.retry_delay * job["attempts"]),
+                    "error": str(e),
+                })
+            except (_LeaseLost, PyMongoError) as release_error:
+                logger.warning(f"Could not release claim analysis job {job['_id']}: {release_error!r}")
+                settled = False
+            if settled and not retry:
+                # Analysis gave up: leave the claim for an adjuster to review by hand
+                await self.claims.record_status(job["_id"], "flagged")
+        finally:
+            heartbeat.cancel()
+
+    async def _release(self, job: dict, fields: dict):
+        try:
+            await self._update(job, {**fields, "leaseOwner": None, "leaseExpiresAt": None})
+        except (_LeaseLost, PyMongoError) as e:
+            logger.warning(f"Could not release claim analysis job {job['_id']}: {e!r}")
+
+
+def _build_queue() -> ClaimAnalysisQueue:
+    settings = get_settings()
+    return ClaimAnalysisQueue(
+        workers=settings.CLAIM_ANALYSIS_WORKERS,
+        lease_seconds=settings.CLAIM_ANALYSIS_LEASE_SECONDS,
+        poll_interval=settings.CLAIM_ANALYSIS_POLL_SECONDS,
+        max_attempts=settings.CLAIM_ANALYSIS_MAX_ATTEMPTS,
+    )
+
+
+# Shared queue, opened by the application lifespan or the standalone worker below
+claim_analysis_queue = _build_queue()
+
+
+# Run analysis workers without the API: python -m src.services.claim_analysis
+if __name__ == "__main__":
+    import signal
+
+    from src.domain.evidencesynthesisengine.documentunderstanding import document_engine
+    from src.infrastructure.database.mongo import MongoDBClientConfig
+    from src.infrastructure.database.policy_repository import policy_repository
+    from src.utilities.structured_logging import configure_logging
+
+    configure_logging()
+
+    async def main():
+        mongo_client = MongoDBClientConfig()
+        await mongo_client.connect()
+        await policy_repository.open(mongo_client.get_context_db())
+        await claim_analysis_queue.open(mongo_client.get_context_db())
+        claim_analysis_queue.workers = max(1, claim_analysis_queue.workers)
+        claim_analysis_queue.start()
+
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, stop.set)
+        logger.info(f"Claim analysis worker running with {claim_analysis_queue.workers} workers")
+        await stop.wait()
+
+        await claim_analysis_queue.stop()
+        await document_engine.shutdown()
+        await mongo_client.close_connection()
+
+    asyncio.run(main())
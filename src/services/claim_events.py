@@ -0,0 +1,82 @@
+import asyncio
+import logging
+from datetime import datetime, timezone
+
+from fastapi.encoders import jsonable_encoder
+from pymongo import ASCENDING
+
+from src.config.app_settings import get_settings
+from src.services.claim_analysis import ClaimAnalysisQueue, claim_analysis_queue
+from src.services.event_bus import EventBus, event_bus
+from src.utilities.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+CLAIM_STATUS_TOPIC = "claim.status"
+
+
+class ClaimStatusBroadcaster:
+    """
+    Publishes claim analysis progress to the event bus as ``claim.status`` events.
+
+    Jobs processed by workers in this process are published the moment they change. Jobs processed
+    by other processes are picked up by one watcher per process that reads recently updated jobs
+    through the ``updatedAt`` index, and only while someone is subscribed. Unchanged states are not
+    published twice, so every connected dashboard only receives real deltas.
+    """
+
+    def __init__(self, bus: EventBus, queue: ClaimAnalysisQueue, poll_interval: float = 1.0):
+        self.bus = bus
+        self.queue = queue
+        self.poll_interval = poll_interval
+        self._published = TTLCache(max_entries=10000, ttl_seconds=3600)
+        self._task = None
+
+    def publish_job(self, job: dict):
+        status = self.queue.describe(job)
+        signature = (status["status"], status["progress"], status["processing_status"], status["attempts"])
+        if self._published.get(job["_id"]) == signature:
+            return
+        self._published.set(job["_id"], signature)
+        self.bus.publish(CLAIM_STATUS_TOPIC, jsonable_encoder({"claimId": job["_id"], **status}))
+
+    async def _watch(self):
+        since = datetime.now(timezone.utc)
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            if self.bus.subscriber_count == 0 or self.queue.collection is None:
+                since = datetime.now(timezone.utc)
+                continue
+            try:
+                jobs = await self.queue.collection.find(
+                    {"updatedAt": {"$gte": since}}, projection={"stageResults": 0}
+                ).sort("updatedAt", ASCENDING).limit(500).to_list()
+            except Exception as e:
+                logger.warning(f"Could not read claim analysis updates: {e}")
+                continue
+            for job in jobs:
+                self.publish_job(job)
+            if jobs:
+                since = jobs[-1]["updatedAt"]
+
+    def start(self):
+        """Publish local job changes straight away and start watching for changes made elsewhere."""
+        self.queue.add_listener(self.publish_job)
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._watch(), name="claim-status-watcher")
+
+    async def stop(self):
+        self.queue.remove_listener(self.publish_job)
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+# Shared broadcaster, started and stopped by the application lifespan
+claim_status_broadcaster = ClaimStatusBroadcaster(
+    event_bus, claim_analysis_queue, poll_interval=get_settings().CLAIM_EVENTS_POLL_SECONDS
+)
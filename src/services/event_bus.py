@@ -0,0 +1,96 @@
+import asyncio
+import itertools
+import json
+import logging
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Optional
+
+from src.config.app_settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Event:
+    id: int
+    topic: str
+    data: dict
+
+    @cached_property
+    def encoded(self) -> str:
+        """The data as JSON, serialised once however many subscribers receive the event."""
+        return json.dumps(self.data, default=str)
+
+
+class TooManySubscribers(Exception):
+    """Raised by ``subscribe`` when the bus already has its maximum number of subscriptions."""
+
+
+class Subscription:
+    """A subscriber's bounded queue of events; iterate it or call ``get``, and ``close`` it when done."""
+
+    def __init__(self, bus: "EventBus", topics: Optional[set], max_queue_size: int):
+        self._bus = bus
+        self.topics = topics
+        self.dropped = 0
+        self._queue = asyncio.Queue(maxsize=max_queue_size)
+
+    def _deliver(self, event: Event):
+        if self.topics is not None and event.topic not in self.topics:
+            return
+        if self._queue.full():
+            # A slow consumer loses its oldest event rather than holding up the publisher
+            self._queue.get_nowait()
+            self.dropped += 1
+        self._queue.put_nowait(event)
+
+    async def get(self) -> Event:
+        return await self._queue.get()
+
+    def close(self):
+        self._bus._subscriptions.discard(self)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> Event:
+        return await self.get()
+
+
+class EventBus:
+    """
+    In-process publish/subscribe hub. ``publish`` fans an event out to every subscription on the
+    same event loop without awaiting, so publishers are never slowed down by connected clients.
+    At most ``max_subscribers`` subscriptions are open at once (0 for no limit).
+    """
+
+    def __init__(self, max_queue_size: int = 256, max_subscribers: int = 0):
+        self.max_queue_size = max_queue_size
+        self.max_subscribers = max_subscribers
+        self._subscriptions = set()
+        self._ids = itertools.count(1)
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscriptions)
+
+    def subscribe(self, topics: Optional[set] = None) -> Subscription:
+        """Subscribe to the given topics, or to every topic when ``topics`` is None."""
+        if self.max_subscribers and len(self._subscriptions) >= self.max_subscribers:
+            raise TooManySubscribers(f"The event bus already has {self.max_subscribers} subscribers")
+        subscription = Subscription(self, topics, self.max_queue_size)
+        self._subscriptions.add(subscription)
+        return subscription
+
+    def publish(self, topic: str, data: dict) -> Event:
+        event = Event(id=next(self._ids), topic=topic, data=data)
+        for subscription in list(self._subscriptions):
+            subscription._deliver(event)
+        return event
+
+
+# Shared bus for the whole process
+event_bus = EventBus(
+    max_queue_size=get_settings().EVENT_BUS_QUEUE_SIZE, max_subscribers=get_settings().EVENT_BUS_MAX_SUBSCRIBERS
+)
@@ -0,0 +1,117 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+
+from src.config.app_settings import get_settings
+from src.infrastructure.evidence_store import EvidenceStore, evidence_store
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SweepReport:
+    entries_expired: int = 0
+    blobs_deleted: int = 0
+    bytes_reclaimed: int = 0
+    duration_seconds: float = 0.0
+
+
+class EvidenceRetentionSweeper:
+    """
+    Background task that enforces the evidence retention period.
+
+    Each sweep walks the evidence store's uploaded_at index from the oldest entry, releases manifest
+    entries older than the retention period, then deletes the blobs nothing references any more.
+    Work is done in batches and blob deletion is throttled to ``max_deletions_per_second``, so a
+    large backlog never floods the disk with unlinks.
+    """
+
+    def __init__(
+        self,
+        store: EvidenceStore,
+        retention_days: float,
+        interval_seconds: float,
+        batch_size: int = 500,
+        max_deletions_per_second: int = 200,
+    ):
+        self.store = store
+        self.retention_seconds = retention_days * 24 * 3600
+        self.interval_seconds = interval_seconds
+        self.batch_size = batch_size
+        self.max_deletions_per_second = max_deletions_per_second
+        self.last_report = None
+        self.total_bytes_reclaimed = 0
+        self._task = None
+
+    async def sweep_once(self) -> SweepReport:
+        """Run one full sweep and return what it reclaimed."""
+        report = SweepReport()
+        started = time.monotonic()
+        cutoff = time.time() - self.retention_seconds
+
+        while True:
+            expired = await self.store.expire_before(cutoff, limit=self.batch_size)
+            report.entries_expired += expired
+            if expired < self.batch_size:
+                break
+            # Yield between batches so the event loop and other writers keep moving
+            await asyncio.sleep(0)
+
+        while True:
+            window_started = time.monotonic()
+            deleted, reclaimed = await self.store.collect_garbage(limit=self.max_deletions_per_second)
+            report.blobs_deleted += deleted
+            report.bytes_reclaimed += reclaimed
+            if deleted < self.max_deletions_per_second:
+                break
+            # Throttle: at most max_deletions_per_second blobs per second
+            await asyncio.sleep(max(0.0, 1.0 - (time.monotonic() - window_started)))
+
+        report.duration_seconds = time.monotonic() - started
+        self.last_report = report
+        self.total_bytes_reclaimed += report.bytes_reclaimed
+        return report
+
+    async def _run(self):
+        while True:
+            try:
+                report = await self.sweep_once()
+                if report.entries_expired or report.blobs_deleted:
+                    logger.info(
+                        f"Evidence retention sweep: {report.entries_expired} entries expired, "
+                        f"{report.blobs_deleted} blobs deleted, {report.bytes_reclaimed} bytes reclaimed "
+                        f"in {report.duration_seconds:.2f}s"
+                    )
+            except Exception as e:
+                logger.error(f"Evidence retention sweep failed: {e}")
+            await asyncio.sleep(self.interval_seconds)
+
+    def start(self):
+        """Schedule the periodic sweep on the running event loop."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name="evidence-retention-sweeper")
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+def _build_sweeper() -> EvidenceRetentionSweeper:
+    settings = get_settings()
+    return EvidenceRetentionSweeper(
+        store=evidence_store,
+        retention_days=settings.EVIDENCE_RETENTION_DAYS,
+        interval_seconds=settings.EVIDENCE_SWEEP_INTERVAL_SECONDS,
+        batch_size=settings.EVIDENCE_SWEEP_BATCH_SIZE,
+        max_deletions_per_second=settings.EVIDENCE_MAX_DELETIONS_PER_SECOND,
+    )
+
+
+# Shared sweeper, started and stopped by the application lifespan
+retention_sweeper = _build_sweeper()
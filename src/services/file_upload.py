@@ -0,0 +1,145 @@
+import hashlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+import aiofiles
+import aiofiles.os
+from fastapi import UploadFile
+
+# Read uploads in 1MB chunks so a file is never held in memory whole
+CHUNK_SIZE = 1024 * 1024
+
+# Magic numbers for the evidence types we accept
+PDF_MAGIC = b"%PDF-"
+PNG_MAGIC = b"\x89PNG\r\n\x1a\n"
+JPEG_MAGIC = b"\xff\xd8\xff"
+OLE2_MAGIC = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"  # legacy .doc
+ZIP_MAGIC = b"PK\x03\x04"  # .docx is a zip container
+
+DOCX_MIME_TYPE = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+# MIME types a sniffed file may have for each allowed extension
+EXTENSION_MIME_TYPES = {
+    ".pdf": {"application/pdf"},
+    ".jpg": {"image/jpeg"},
+    ".jpeg": {"image/jpeg"},
+    ".png": {"image/png"},
+    ".doc": {"application/msword"},
+    ".docx": {DOCX_MIME_TYPE},
+    ".txt": {"text/plain"},
+}
+
+
+class UploadRejected(Exception):
+    """Raised when an upload breaks the size, extension or content-type rules."""
+
+    def __init__(self, status_code: int, message: str):
+        super().__init__(message)
+        self.status_code = status_code
+        self.message = message
+
+
+@dataclass
+class StoredUpload:
+    path: Path
+    size: int
+    sha256: str
+    mime_type: str
+
+
+def sniff_mime_type(head: bytes, extension: str) -> Optional[str]:
+    """
+    Detect the MIME type of a file from its first bytes.
+
+    Args:
+        head (bytes): The first bytes of the file (a few hundred are enough).
+        extension (str): The lower-cased file extension, used to tell .docx from other zip files.
+
+    Returns:
+        str: The detected MIME type, or None if the content is not a type we recognise.
+    """
+    if head.startswith(PDF_MAGIC):
+        return "application/pdf"
+    if head.startswith(PNG_MAGIC):
+        return "image/png"
+    if head.startswith(JPEG_MAGIC):
+        return "image/jpeg"
+    if head.startswith(OLE2_MAGIC):
+        return "application/msword"
+    if head.startswith(ZIP_MAGIC):
+        return DOCX_MIME_TYPE if extension == ".docx" else None
+    if b"\x00" not in head:
+        # Ignore a multi-byte character cut off at the end of the sample
+        sample = head[:-3] if len(head) > 3 else head
+        try:
+            sample.decode("utf-8")
+            return "text/plain"
+        except UnicodeDecodeError:
+            return None
+    return None
+
+
+async def stream_upload_to_disk(
+    file: UploadFile,
+    destination: Path,
+    max_size: int,
+    allowed_extensions: set,
+    allowed_mime_types: set,
+) -> StoredUpload:
+    """
+    Stream an upload to disk in chunks, enforcing the size cap and content type as it goes.
+
+    The multipart parser has already spooled the upload to a temporary file by the time this runs; the
+    request body as a whole is capped before parsing by ``RequestBodyLimitMiddleware``, and the cap here
+    is the per-file limit.
+    The file is written to a ``.part`` sibling and only renamed into place once it is complete and valid,
+    so a rejected or interrupted upload never leaves a partial file at the destination.
+
+    Args:
+        file (UploadFile): The incoming upload.
+        destination (Path): Where the file should end up.
+        max_size (int): Maximum size in bytes.
+        allowed_extensions (set): Lower-cased file extensions that may be uploaded.
+        allowed_mime_types (set): MIME types the sniffed content may have.
+
+    Returns:
+        StoredUpload: The final path, size, SHA-256 hex digest and sniffed MIME type.
+
+    Raises:
+        UploadRejected: With status 413 when the file is too large, 415 when its type is not allowed.
+    """
+    extension = destination.suffix.lower()
+    if extension not in allowed_extensions or extension not in EXTENSION_MIME_TYPES:
+        raise UploadRejected(415, f"File extension '{extension}' is not allowed")
+    # The parser records the size of the spooled file; no need to copy it before rejecting
+    if file.size is not None and file.size > max_size:
+        raise UploadRejected(413, f"File exceeds the {max_size // (1024 * 1024)}MB limit")
+
+    await aiofiles.os.makedirs(destination.parent, exist_ok=True)
+    partial = destination.with_name(destination.name + ".part")
+    digest = hashlib.sha256()
+    size = 0
+    mime_type = None
+
+    try:
+        async with aiofiles.open(partial, "wb") as out:
+            while chunk := await file.read(CHUNK_SIZE):
+                if mime_type is None:
+                    mime_type = sniff_mime_type(chunk[:512], extension)
+                    if mime_type not in allowed_mime_types or mime_type not in EXTENSION_MIME_TYPES[extension]:
+                        raise UploadRejected(415, f"File content does not match an allowed type for '{extension}'")
+                size += len(chunk)
+                if size > max_size:
+                    raise UploadRejected(413, f"File exceeds the {max_size // (1024 * 1024)}MB limit")
+                digest.update(chunk)
+                await out.write(chunk)
+        if size == 0:
+            raise UploadRejected(415, "File is empty")
+        await aiofiles.os.replace(partial, destination)
+    except BaseException:
+        if await aiofiles.os.path.exists(partial):
+            await aiofiles.os.remove(partial)
+        raise
+
+    return StoredUpload(path=destination, size=size, sha256=digest.hexdigest(), mime_type=mime_type)
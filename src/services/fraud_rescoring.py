@@ -0,0 +1,131 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from datetime import date
+
+import numpy as np
+
+from src.domain.frauddetectionengine.fraudscoring import (
+    EPOCH_ORDINAL,
+    ClaimFeatures,
+    count_prior_claims,
+    count_shared_evidence,
+    epoch_day,
+    score_claims,
+)
+from src.infrastructure.database.claims_repository import ClaimsRepository, claims_repository
+from src.infrastructure.database.policy_repository import PolicyRepository, policy_repository
+from src.infrastructure.evidence_store import EvidenceStore, evidence_store
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RescoreReport:
+    claims: int
+    updated: int
+    load_seconds: float
+    score_seconds: float
+    write_seconds: float
+
+
+async def rescore_claim_book(
+    claims: ClaimsRepository = claims_repository,
+    evidence: EvidenceStore = evidence_store,
+    policies: PolicyRepository = policy_repository,
+    batch_size: int = 50000,
+) -> RescoreReport:
+    """
+    Re-score every claim with the current fraud model and policy data.
+
+    Claim frequency and shared evidence depend on the rest of the book, so the whole book is loaded
+    into column arrays and scored in one vectorised pass; only the claims whose score changed are written.
+    """
+    started = time.perf_counter()
+    rows = []
+    async for batch in claims.scoring_batches(batch_size):
+        rows.extend(batch)
+    pairs = await evidence.digest_pairs()
+    loaded = time.perf_counter()
+    if not rows:
+        return RescoreReport(0, 0, loaded - started, 0.0, 0.0)
+
+    today = float(date.today().toordinal() - EPOCH_ORDINAL)
+    stored = [row.get("fraudFeatures") or {} for row in rows]
+    submitted_day = np.array([epoch_day(row.get("dateSubmitted")) for row in rows])
+    submitted_day = np.where(np.isnan(submitted_day), today, submitted_day)
+    incident_day = np.array([epoch_day(features.get("incidentDate")) for features in stored])
+    incident_day = np.where(np.isnan(incident_day), submitted_day, incident_day)
+
+    policy_numbers, policy_codes = np.unique(
+        np.array([row.get("policyNumber") or row["_id"] for row in rows], dtype=object).astype(str),
+        return_inverse=True,
+    )
+    # One bulk lookup for the book; claims on unknown policies keep NaN policy features
+    found = await policies.get_many(policy_numbers.tolist())
+    on_file = [found.get(policy_number, {}) for policy_number in policy_numbers]
+    premium = np.array([policy.get("premium_amount") or np.nan for policy in on_file], dtype=float)
+    policy_start = np.array([epoch_day(policy.get("policy_start_date")) for policy in on_file])
+    policy_end = np.array([epoch_day(policy.get("policy_end_date")) for policy in on_file])
+
+    # Evidence is filed per policy number, so duplicates are counted between policies, including
+    # policies whose claims are no longer on the book, exactly as the analysis stage counts them
+    shared_by_policy = np.zeros(len(policy_numbers), dtype=np.int64)
+    if pairs:
+        pair_policies, pair_digests = (np.array(column, dtype=str) for column in zip(*pairs))
+        evidence_policies, evidence_codes = np.unique(pair_policies, return_inverse=True)
+        _, digest_codes = np.unique(pair_digests, return_inverse=True)
+        shared = count_shared_evidence(evidence_codes, digest_codes, len(evidence_policies))
+        positions = np.minimum(np.searchsorted(evidence_policies, policy_numbers), len(evidence_policies) - 1)
+        shared_by_policy = np.where(evidence_policies[positions] == policy_numbers, shared[positions], 0)
+
+    features = ClaimFeatures(
+        claim_amount=np.array(
+            [features.get("claimAmount", row.get("claimAmount") or 0) for row, features in zip(rows, stored)], dtype=float
+        ),
+        premium=premium[policy_codes],
+        incident_day=incident_day,
+        policy_start_day=policy_start[policy_codes],
+        policy_end_day=policy_end[policy_codes],
+        prior_claims=count_prior_claims(policy_codes, submitted_day.astype(np.int64)),
+        shared_evidence=shared_by_policy[policy_codes],
+        document_count=np.array([features.get("documentCount", 0) for features in stored]),
+        vin_match=np.array([features.get("vinMatch", -1) for features in stored]),
+    )
+    scores = score_claims(features).fraud_score
+    scored = time.perf_counter()
+
+    updated = 0
+    ids = [row["_id"] for row in rows]
+    for offset in range(0, len(ids), batch_size):
+        updated += await claims.update_fraud_scores(
+            dict(zip(ids[offset:offset + batch_size], scores[offset:offset + batch_size].tolist()))
+        )
+    written = time.perf_counter()
+    return RescoreReport(len(rows), updated, loaded - started, scored - loaded, written - scored)
+
+
+# Nightly re-scoring, e.g. from cron: python -m src.services.fraud_rescoring
+if __name__ == "__main__":
+    from src.infrastructure.database.mongo import MongoDBClientConfig
+    from src.utilities.structured_logging import configure_logging
+
+    configure_logging()
+
+    async def main():
+        mongo_client = MongoDBClientConfig()
+        await mongo_client.connect()
+        try:
+            await claims_repository.open(mongo_client.get_context_db())
+            await policy_repository.open(mongo_client.get_context_db())
+            report = await rescore_claim_book()
+        finally:
+            await mongo_client.close_connection()
+            evidence_store.close()
+        logger.info(
+            f"Re-scored {report.claims} claims, {report.updated} changed"
+            f" (load {report.load_seconds:.1f}s, score {report.score_seconds:.2f}s, write {report.write_seconds:.1f}s)"
+        )
+
+    asyncio.run(main())
@@ -0,0 +1,241 @@
+import asyncio
+import logging
+import os
+import shutil
+import signal
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Awaitable, Callable, Optional
+
+from src.ai_model.llm_gateway import LLMGateway, llm_gateway
+from src.config.app_settings import get_settings
+from src.utilities.metrics import DEPENDENCY_CHECK_SECONDS, DEPENDENCY_UP
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CheckResult:
+    status: str  # "up", "degraded" or "down"
+    latency_seconds: float
+    checked_at: float
+    detail: dict = field(default_factory=dict)
+    error: Optional[str] = None
+
+    def to_dict(self) -> dict:
+        result = {
+            "status": self.status,
+            "latencyMs": round(self.latency_seconds * 1000, 2),
+            "checkedAgoSeconds": round(time.time() - self.checked_at, 1),
+            **self.detail,
+        }
+        if self.error:
+            result["error"] = self.error
+        return result
+
+
+@dataclass
+class _Check:
+    name: str
+    probe: Callable[[], Awaitable[dict]]
+    critical: bool
+
+
+class HealthMonitor:
+    """
+    Dependency checks run in the background every ``interval_seconds``, so probes only read the last results.
+
+    A check is a coroutine returning details about the dependency; raising (or taking longer than
+    ``timeout_seconds``) marks it down, and returning ``{"status": "degraded", ...}`` reports a problem
+    that should not take the pod out of rotation. The service is ready when every critical check is up
+    and the results are fresh; stale results mean the refresh loop itself is stuck.
+    """
+
+    def __init__(self, interval_seconds: float = 5.0, timeout_seconds: float = 2.0):
+        self.interval_seconds = interval_seconds
+        self.timeout_seconds = timeout_seconds
+        self.started_at = time.time()
+        self.results = {}
+        self.loop_lag_seconds = 0.0
+        self.draining = False
+        # Set on the serving loop when draining starts, for long-lived responses to end on (see wait_draining)
+        self._drain_started = None
+        self._checks = {}
+        self._task = None
+
+    def register(self, name: str, probe: Callable[[], Awaitable[dict]], critical: bool = True):
+        self._checks[name] = _Check(name, probe, critical)
+
+    async def _run_check(self, check: _Check) -> CheckResult:
+        started = time.perf_counter()
+        try:
+            detail = await asyncio.wait_for(check.probe(), timeout=self.timeout_seconds)
+            status = detail.pop("status", "up")
+            result = CheckResult(status, time.perf_counter() - started, time.time(), detail)
+        except asyncio.TimeoutError:
+            result = CheckResult("down", time.perf_counter() - started, time.time(),
+                                 error=f"No answer within {self.timeout_seconds}s")
+        except Exception as e:
+            result = CheckResult("down", time.perf_counter() - started, time.time(), error=str(e))
+        DEPENDENCY_UP.labels(check.name).set(1 if result.status != "down" else 0)
+        DEPENDENCY_CHECK_SECONDS.labels(check.name).observe(result.latency_seconds)
+        if result.status == "down" and self.results.get(check.name, result).status != "down":
+            logger.warning(f"Health check '{check.name}' is down: {result.error}")
+        return result
+
+    async def refresh(self):
+        """Run every check once, concurrently, and keep the results."""
+        checks = list(self._checks.values())
+        results = await asyncio.gather(*(self._run_check(check) for check in checks))
+        self.results = {check.name: result for check, result in zip(checks, results)}
+
+    async def _run(self):
+        while True:
+            await self.refresh()
+            expected = time.monotonic() + self.interval_seconds
+            await asyncio.sleep(self.interval_seconds)
+            # How late the loop woke up: a busy or blocked event loop shows here before requests time out
+            self.loop_lag_seconds = max(0.0, time.monotonic() - expected)
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name="health-monitor")
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def drain_on_signal(self, delay_seconds: float, signum: int = signal.SIGTERM):
+        """
+        On ``signum``, report not ready straight away but keep serving for ``delay_seconds`` before handing the
+        signal to the server, so the load balancer stops routing here before the listener closes. A second
+        signal stops at once. Call it from the lifespan, after the server has installed its own handlers.
+        """
+        loop = asyncio.get_running_loop()
+        self._drain_started = asyncio.Event()
+        if threading.current_thread() is not threading.main_thread():
+            return  # Signal handlers can only be set from the main thread (not the case under the test client)
+        server_handler = signal.getsignal(signum)
+        if not callable(server_handler):
+            return
+
+        def handle(sig, frame):
+            # Signal handlers run between two steps of the loop; this wakes it to run the waiters
+            loop.call_soon_threadsafe(self._drain_started.set)
+            if self.draining or delay_seconds <= 0:
+                self.draining = True
+                server_handler(sig, frame)
+                return
+            self.draining = True
+            logger.info(f"Draining: readiness reports 503, shutting down in {delay_seconds}s")
+            timer = threading.Timer(delay_seconds, server_handler, (sig, frame))
+            timer.daemon = True
+            timer.start()
+
+        signal.signal(signum, handle)
+
+    async def wait_draining(self):
+        """Return once draining starts, so streams can end and let clients reconnect elsewhere before shutdown."""
+        if self._drain_started is None:
+            self._drain_started = asyncio.Event()
+        await self._drain_started.wait()
+
+    def liveness(self) -> dict:
+        """The process is serving; dependencies are deliberately not consulted."""
+        return {
+            "status": "alive",
+            "uptimeSeconds": round(time.time() - self.started_at, 1),
+            "eventLoopLagMs": round(self.loop_lag_seconds * 1000, 2),
+        }
+
+    def readiness(self) -> tuple:
+        """Return ``(ready, report)`` from the cached check results."""
+        now = time.time()
+        stale_after = 3 * self.interval_seconds + self.timeout_seconds
+        checks = {}
+        ready = bool(self.results) and self._task is not None and not self.draining
+        for name, check in self._checks.items():
+            result = self.results.get(name)
+            if result is None:
+                checks[name] = {"status": "pending", "critical": check.critical}
+                ready = ready and not check.critical
+                continue
+            stale = now - result.checked_at > stale_after
+            checks[name] = {**result.to_dict(), "critical": check.critical, **({"stale": True} if stale else {})}
+            if check.critical and (result.status == "down" or stale):
+                ready = False
+        status = "draining" if self.draining else "ready" if ready else "not ready"
+        return ready, {"status": status, "checks": checks}
+
+
+def mongo_check(mongo_client) -> Callable[[], Awaitable[dict]]:
+    async def probe() -> dict:
+        return await mongo_client.check_health()
+    return probe
+
+
+def llm_gateway_check(gateway: LLMGateway) -> Callable[[], Awaitable[dict]]:
+    """
+    Reports the gateway from its own traffic instead of calling the model API: a probe every few seconds
+    per pod would cost tokens, and an upstream outage is not something taking this pod out of rotation fixes.
+    """
+    last = {"calls": 0, "failures": 0}
+
+    async def probe() -> dict:
+        counters = gateway.counters
+        calls = counters["calls"] - last["calls"]
+        failures = counters["failures"] - last["failures"]
+        last.update(calls=counters["calls"], failures=counters["failures"])
+        saturated = gateway.in_flight >= gateway.max_concurrency
+        failing = calls > 0 and failures / calls > 0.5
+        return {
+            "status": "degraded" if saturated or failing else "up",
+            "inFlight": gateway.in_flight,
+            "maxConcurrency": gateway.max_concurrency,
+            "recentCalls": calls,
+            "recentFailures": failures,
+        }
+    return probe
+
+
+def disk_check(path: str, min_free_bytes: int) -> Callable[[], Awaitable[dict]]:
+    """Free space and writability of the volume holding ``path`` (the evidence store)."""
+    def measure() -> dict:
+        target = Path(path)
+        # The store's directory may not exist before the first upload; check the volume it will live on
+        while not target.exists() and target != target.parent:
+            target = target.parent
+        usage = shutil.disk_usage(target)
+        if usage.free < min_free_bytes:
+            raise RuntimeError(f"Only {usage.free // (1024 * 1024)} MB free on {target}")
+        if not os.access(target, os.W_OK):
+            raise RuntimeError(f"{target} is not writable")
+        return {"freeMB": usage.free // (1024 * 1024), "usedPercent": round(100 * usage.used / usage.total, 1)}
+
+    async def probe() -> dict:
+        return await asyncio.to_thread(measure)
+    return probe
+
+
+def _build_health_monitor() -> HealthMonitor:
+    settings = get_settings()
+    monitor = HealthMonitor(
+        interval_seconds=settings.HEALTH_CHECK_INTERVAL_SECONDS,
+        timeout_seconds=settings.HEALTH_CHECK_TIMEOUT_SECONDS,
+    )
+    monitor.register("llm_gateway", llm_gateway_check(llm_gateway), critical=False)
+    monitor.register(
+        "disk", disk_check(settings.EVIDENCE_STORE_PATH, settings.HEALTH_MIN_FREE_DISK_MB * 1024 * 1024), critical=True
+    )
+    return monitor
+
+
+# Shared monitor; the lifespan registers the Mongo check once connected and starts the refresh loop
+health_monitor = _build_health_monitor()
@@ -1,38 +1,56 @@
+import logging
 
 from src.ai_model.memory_context import create_memory
-from src.infrastructure.schema import generate_fake_policy_information
+from src.infrastructure.database.policy_repository import policy_repository
 from src.infrastructure.database.mongo import MongoDBClientConfig
 from src.domain.policyintelligencemodule.conversationmanager import ConversationManager
 from src.application.datamodels import ClaimApplicationPayload
 
 from pydantic import BaseModel
-from typing import Optional
+from typing import AsyncIterator, Optional
+
+logger = logging.getLogger(__name__)
 
 
 
 
 class ProcessClaim():
 
-    def get_policy_information(self,policy_number:str):
-        return generate_fake_policy_information(policy_number)
+    async def get_policy_information(self,policy_number:str):
+        # Served from the policy cache, warmed when the claimant logs in
+        return await policy_repository.get(policy_number) or ""
     
-    def save_claim_processing_docs(self,policy_number:str,db_client_config:MongoDBClientConfig=MongoDBClientConfig)->bool:
+    async def save_claim_processing_docs(self,policy_number:str,db_client_config:MongoDBClientConfig=MongoDBClientConfig,filenames:Optional[list]=None)->bool:
         try:
-            create_memory(db_client_config.get_context_collection(),policy_number,"I have just successfully uploaded a document", "Alright! Document has been recieved, time to proceed to next step.")
+            if filenames:
+                # One entry acknowledging a whole batch of uploads
+                await create_memory(db_client_config.get_context_collection(),policy_number,f"I have just successfully uploaded {len(filenames)} document(s): {', '.join(filenames)}", "Alright! Your documents have been received, time to proceed to next step.")
+            else:
+                await create_memory(db_client_config.get_context_collection(),policy_number,"I have just successfully uploaded a document", "Alright! Document has been recieved, time to proceed to next step.")
         except Exception as e:
-            print(f"Error during claim processing file saving: {str(e)}")
+            logger.error("Error during claim processing file saving: %s", e, exc_info=True)
             raise
 
-    def run_claim_processing(self,user_input:ClaimApplicationPayload,db_client_config:MongoDBClientConfig=MongoDBClientConfig):
+    async def run_claim_processing(self,user_input:ClaimApplicationPayload,db_client_config:MongoDBClientConfig=MongoDBClientConfig):
         try:
             if user_input != "":
                 policy_data = ""
-                print("user_input >>> ", user_input)
                 if user_input.message == "I want to make a claim":
-                    policy_data = self.get_policy_information(user_input.policyNumber)
+                    policy_data = await self.get_policy_information(user_input.policyNumber)
                 conversationManager = ConversationManager(user_input.message, user_input.policyNumber, policy_data, db_client_config)
-                return conversationManager.llm_call()
+                return await conversationManager.llm_call()
         except Exception as e:
-            print(f"Error during claim processing: {str(e)}")
+            logger.error("Error during claim processing: %s", e, exc_info=True)
             raise
 
+    async def stream_claim_processing(self,user_input:ClaimApplicationPayload,db_client_config:MongoDBClientConfig=MongoDBClientConfig)->AsyncIterator[str]:
+        try:
+            policy_data = ""
+            if user_input.message == "I want to make a claim":
+                policy_data = await self.get_policy_information(user_input.policyNumber)
+            conversationManager = ConversationManager(user_input.message, user_input.policyNumber, policy_data, db_client_config)
+            async for delta in conversationManager.stream_llm_call():
+                yield delta
+        except Exception as e:
+            logger.error("Error during claim processing stream: %s", e, exc_info=True)
+            raise
@@ -0,0 +1,110 @@
+import functools
+import os
+import time
+from contextlib import contextmanager
+
+from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Gauge, Histogram, generate_latest, multiprocess
+
+# Stages of a claim turn, from the API key check to persisting the reply or an upload
+STAGES = ("api_key_check", "memory_read", "prompt_build", "llm_call", "memory_write", "file_write")
+
+# From sub-millisecond checks up to model calls bounded by the LLM deadline
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+STAGE_SECONDS = Histogram(
+    "claimlightning_stage_duration_seconds", "Time spent in each stage of a claim turn", ["stage"],
+    buckets=LATENCY_BUCKETS,
+)
+# Gauges say how to combine workers when PROMETHEUS_MULTIPROC_DIR is set (see src/application/server.py)
+STAGE_IN_FLIGHT = Gauge(
+    "claimlightning_stage_in_flight", "Operations currently running, per stage", ["stage"], multiprocess_mode="livesum"
+)
+STAGE_ERRORS = Counter("claimlightning_stage_errors_total", "Stage operations that failed", ["stage"])
+
+HTTP_SECONDS = Histogram(
+    "claimlightning_http_request_duration_seconds", "HTTP request latency until the response body ends",
+    ["method", "route"], buckets=LATENCY_BUCKETS,
+)
+HTTP_REQUESTS = Counter("claimlightning_http_requests_total", "HTTP requests served", ["method", "route", "status"])
+HTTP_IN_FLIGHT = Gauge(
+    "claimlightning_http_requests_in_flight", "HTTP requests currently being served", multiprocess_mode="livesum"
+)
+HTTP_SHED = Counter("claimlightning_http_requests_shed_total", "Requests refused with 503 because the worker was at capacity")
+
+LLM_TOKENS = Counter(
+    "claimlightning_llm_tokens_total", "Tokens reported in the model API's usage; cached is part of prompt",
+    ["model", "kind"],
+)
+LLM_FIRST_TOKEN_SECONDS = Histogram(
+    "claimlightning_llm_time_to_first_token_seconds", "Time until a streamed reply yields its first text",
+    ["model"], buckets=LATENCY_BUCKETS,
+)
+
+DEPENDENCY_UP = Gauge(
+    "claimlightning_dependency_up", "1 when the last health check of a dependency passed", ["dependency"],
+    multiprocess_mode="livemin",
+)
+DEPENDENCY_CHECK_SECONDS = Histogram(
+    "claimlightning_dependency_check_seconds", "Latency of background health checks", ["dependency"],
+    buckets=LATENCY_BUCKETS,
+)
+
+STARTUP_SECONDS = Gauge(
+    "claimlightning_startup_phase_seconds", "Time each phase of this process's startup took", ["phase"],
+    multiprocess_mode="livemax",
+)
+
+# Label children created up front, so every stage is exported (as zero) before it first runs
+for _stage in STAGES:
+    STAGE_SECONDS.labels(_stage)
+    STAGE_IN_FLIGHT.labels(_stage)
+    STAGE_ERRORS.labels(_stage)
+
+
+@contextmanager
+def observe_stage(stage: str):
+    """Time the block into the stage histogram; an exception leaving it is counted as a stage error."""
+    STAGE_IN_FLIGHT.labels(stage).inc()
+    started = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        STAGE_ERRORS.labels(stage).inc()
+        raise
+    finally:
+        STAGE_SECONDS.labels(stage).observe(time.perf_counter() - started)
+        STAGE_IN_FLIGHT.labels(stage).dec()
+
+
+def timed_stage(stage: str):
+    """Decorator form of ``observe_stage`` for coroutine functions."""
+    def decorate(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            with observe_stage(stage):
+                return await func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def count_stage_error(stage: str):
+    """Count a failure the stage handled itself instead of raising."""
+    STAGE_ERRORS.labels(stage).inc()
+
+
+def render_metrics() -> tuple:
+    """
+    Return ``(body, content_type)`` of the Prometheus text exposition. With several workers sharing
+    PROMETHEUS_MULTIPROC_DIR, whichever worker is scraped reports all of them combined.
+    """
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(), CONTENT_TYPE_LATEST
+
+
+def release_worker_metrics():
+    """Drop this worker's live gauges from the shared directory when it exits; counters and histograms are kept."""
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        multiprocess.mark_process_dead(os.getpid())
@@ -1,3 +1,8 @@
+import hashlib
+import string
+import threading
+import time
+from dataclasses import dataclass
 from pathlib import Path
 
 import yaml
@@ -16,3 +21,85 @@ def load_yaml_file(file_path):
         data = yaml.safe_load(file)
     return data
 
+
+@dataclass(frozen=True)
+class PromptTemplate:
+    """A prompt template split once into literal text and placeholder segments."""
+    name: str
+    text: str
+    version: str
+    segments: tuple
+
+    @classmethod
+    def compile(cls, name: str, text: str) -> "PromptTemplate":
+        segments = []
+        for literal, field_name, format_spec, conversion in string.Formatter().parse(text):
+            if format_spec or conversion:
+                raise ValueError(f"Prompt '{name}' uses an unsupported placeholder: {{{field_name}}}")
+            segments.append((literal, field_name))
+        version = hashlib.sha256(text.encode("utf-8")).hexdigest()[:12]
+        return cls(name=name, text=text, version=version, segments=tuple(segments))
+
+    def render(self, **values) -> str:
+        """Fill the placeholders; equivalent to ``str.format`` on the raw template."""
+        parts = []
+        for literal, field_name in self.segments:
+            parts.append(literal)
+            if field_name is not None:
+                parts.append(str(values[field_name]))
+        return "".join(parts)
+
+
+@dataclass(frozen=True)
+class _RegistryEntry:
+    mtime_ns: int
+    checked_at: float
+    templates: dict
+
+
+class PromptRegistry:
+    """
+    Process-wide cache of compiled prompt templates, keyed by file path and mtime.
+
+    A file is re-stat'ed at most once every ``check_interval`` seconds and only
+    re-parsed when its mtime changes, so edited prompts hot-reload without a restart.
+    """
+
+    def __init__(self, check_interval: float = 1.0):
+        self.check_interval = check_interval
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def load(self, file_path) -> dict:
+        """Return the compiled templates of a YAML prompt file as ``{name: PromptTemplate}``."""
+        path = Path(file_path).resolve()
+        entry = self._entries.get(path)
+        now = time.monotonic()
+        if entry is not None and now - entry.checked_at < self.check_interval:
+            return entry.templates
+
+        if not path.exists():
+            raise FileNotFoundError(f"Prompt template not found at {file_path}")
+        mtime_ns = path.stat().st_mtime_ns
+
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is None or entry.mtime_ns != mtime_ns:
+                yaml_data = load_yaml_file(path) or {}
+                templates = {
+                    name: PromptTemplate.compile(name, text)
+                    for name, text in yaml_data.items()
+                    if isinstance(text, str)
+                }
+            else:
+                templates = entry.templates
+            self._entries[path] = _RegistryEntry(mtime_ns=mtime_ns, checked_at=now, templates=templates)
+        return templates
+
+    def versions(self, file_path) -> dict:
+        """Return ``{name: version}`` for the templates of a prompt file."""
+        return {name: template.version for name, template in self.load(file_path).items()}
+
+
+# Shared registry for the whole process
+prompt_registry = PromptRegistry()
@@ -0,0 +1,32 @@
+import logging
+import re
+import uuid
+from contextvars import ContextVar
+from typing import Optional
+
+REQUEST_ID_HEADER = "X-Request-ID"
+# Accept a caller's request ID only if it is short and safe to put in logs and headers
+_VALID_REQUEST_ID = re.compile(r"^[A-Za-z0-9._:-]{1,128}$")
+
+# ID of the HTTP request being served; "-" outside a request (startup, background workers)
+request_id_var: ContextVar[str] = ContextVar("request_id", default="-")
+
+
+def new_request_id(incoming: Optional[str] = None) -> str:
+    """Reuse the caller's request ID when it is valid, otherwise make a new one."""
+    if incoming and _VALID_REQUEST_ID.match(incoming):
+        return incoming
+    return uuid.uuid4().hex
+
+
+def current_request_id() -> str:
+    return request_id_var.get()
+
+
+class RequestIdFilter(logging.Filter):
+    """Adds ``request_id`` to every log record, so handlers can include it in their format."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        return True
+
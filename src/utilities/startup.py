@@ -0,0 +1,43 @@
+import logging
+import time
+from contextlib import contextmanager
+
+from src.utilities.metrics import STARTUP_SECONDS
+
+logger = logging.getLogger(__name__)
+
+
+class StartupTimer:
+    """
+    Times the phases of application startup, so a slow cold start shows which phase to look at.
+
+    ``started`` is taken as early as possible (the top of ``main.py``); the time until the lifespan
+    begins is recorded as the ``import`` phase.
+    """
+
+    def __init__(self, started: float):
+        self.started = started
+        self.phases = {}
+
+    def mark(self, phase: str, seconds: float):
+        self.phases[phase] = seconds
+        STARTUP_SECONDS.labels(phase).set(seconds)
+
+    @contextmanager
+    def phase(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.mark(name, time.perf_counter() - started)
+
+    def report(self) -> dict:
+        """Per-phase and total startup time in milliseconds, logged once startup completes."""
+        total = time.perf_counter() - self.started
+        STARTUP_SECONDS.labels("total").set(total)
+        breakdown = {
+            "totalMs": round(total * 1000, 1),
+            "phasesMs": {name: round(seconds * 1000, 1) for name, seconds in self.phases.items()},
+        }
+        logger.info(f"Startup completed in {breakdown['totalMs']} ms", extra={"startup": breakdown})
+        return breakdown
@@ -0,0 +1,214 @@
+import atexit
+import copy
+import hashlib
+import json
+import logging
+import queue
+import random
+import re
+import sys
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+from src.config.app_settings import get_settings
+from src.utilities.request_context import RequestIdFilter
+
+# Libraries that log every HTTP request or server round trip at INFO; held at WARNING unless LOG_LEVEL is DEBUG
+CHATTY_LOGGERS = ("httpx", "httpcore", "openai", "pymongo")
+
+# Attributes every LogRecord has; anything else on a record came from ``extra=`` and is logged as a field
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "request_id"}
+
+# Fields whose values are personal data: dropped entirely
+_PII_FIELDS = {
+    "email", "contact_information", "phone", "mobile", "address",
+    "policy_holder_name", "beneficiary_name", "claimantName", "name",
+}
+# Fields holding a policy number: replaced by a stable pseudonym, so one claimant's lines can still be correlated
+_POLICY_FIELDS = {"policy_number", "policyNumber", "policy"}
+
+_EMAIL = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
+_PHONE = re.compile(r"(?<![\w+])(?:\+\d[\d\s-]{7,}\d|0\d{9,10})(?!\w)")
+_VIN = re.compile(r"\b[A-HJ-NPR-Z0-9]{17}\b")
+_API_KEY = re.compile(r"(?i)\b(x-api-key|api[_-]?key)(['\"]?\s*[:=]\s*['\"]?)[^\s&'\",]+")
+# Policy numbers have no fixed shape, so they are recognised by where they appear
+_POLICY_CONTEXTS = (
+    re.compile(r"(?i)(\bpolicy[ _-]?(?:number|no)['\"]?\s*[:=]\s*['\"]?)([A-Za-z0-9-]+)"),
+    re.compile(r"(/claims/)([^/\s?]+)(?=/documents)"),
+    re.compile(r"()([A-Za-z0-9._-]+)(?=riaˆ)"),
+)
+
+
+def pseudonymise(policy_number: str) -> str:
+    return "pol_" + hashlib.sha256(policy_number.encode()).hexdigest()[:10]
+
+
+def redact(text: str) -> str:
+    """Mask credentials, contact details, VINs and policy numbers in free text."""
+    text = _API_KEY.sub(lambda m: m.group(1) + m.group(2) + "[REDACTED]", text)
+    for pattern in _POLICY_CONTEXTS:
+        text = pattern.sub(lambda m: m.group(1) + pseudonymise(m.group(2)), text)
+    text = _EMAIL.sub("[EMAIL]", text)
+    text = _VIN.sub("[VIN]", text)
+    return _PHONE.sub("[PHONE]", text)
+
+
+def redact_field(key: str, value):
+    if key in _PII_FIELDS:
+        return "[REDACTED]"
+    if key in _POLICY_FIELDS and value is not None:
+        return pseudonymise(str(value))
+    if isinstance(value, str):
+        return redact(value)
+    return value
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: time, level, logger, request ID, redacted message, ``extra`` fields and traceback."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "requestId": getattr(record, "request_id", "-"),
+            "message": redact(record.getMessage()),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRIBUTES:
+                payload[key] = redact_field(key, value)
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            payload["exception"] = redact(record.exc_text)
+        return json.dumps(payload, default=str, ensure_ascii=False)
+
+
+class TextFormatter(logging.Formatter):
+    """The plain text format for local development, with the request ID and redaction applied."""
+
+    def __init__(self):
+        super().__init__("%(asctime)s - %(name)s - %(levelname)s - [%(request_id)s] %(message)s")
+
+    def format(self, record: logging.LogRecord) -> str:
+        return redact(super().format(record))
+
+
+class DebugSamplingFilter(logging.Filter):
+    """Passes only a random ``rate`` share of DEBUG records; other levels always pass."""
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return record.levelno > logging.DEBUG or self.rate >= 1 or random.random() < self.rate
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """
+    Hands records to the listener thread that formats and writes them, so the event loop never waits on
+    log I/O. Only message merging happens on the caller; when the queue is full the record is dropped
+    and counted rather than blocking.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        # Merge the arguments now: they may be mutated by the caller before the listener formats them
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            # Tracebacks hold frames of the calling thread; render them here
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+_listener: Optional[QueueListener] = None
+
+
+def configure_logging(
+    level: Optional[str] = None,
+    log_format: Optional[str] = None,
+    debug_sample_rate: Optional[float] = None,
+    queue_size: Optional[int] = None,
+) -> Optional[QueueListener]:
+    """
+    Route all logging through one non-blocking queue handler writing to stdout from a background thread.
+
+    Defaults come from Settings (LOG_LEVEL, LOG_FORMAT, LOG_DEBUG_SAMPLE_RATE, LOG_QUEUE_SIZE). Uvicorn's
+    loggers are re-pointed at the same handler. Calling it again has no effect.
+    """
+    global _listener
+    if _listener is not None:
+        return _listener
+    settings = get_settings()
+    level = logging.getLevelName((level or settings.LOG_LEVEL).upper())
+    log_format = (log_format or settings.LOG_FORMAT).lower()
+    if log_format not in ("json", "text"):
+        raise ValueError(f"Unknown LOG_FORMAT: {log_format}")
+
+    output = logging.StreamHandler(sys.stdout)
+    output.setFormatter(JsonFormatter() if log_format == "json" else TextFormatter())
+
+    handler = NonBlockingQueueHandler(queue.Queue(queue_size or settings.LOG_QUEUE_SIZE))
+    # Both run on the calling thread: the request ID lives in its context, and sampled-out records are never queued
+    handler.addFilter(RequestIdFilter())
+    handler.addFilter(DebugSamplingFilter(
+        settings.LOG_DEBUG_SAMPLE_RATE if debug_sample_rate is None else debug_sample_rate
+    ))
+
+    root = logging.getLogger()
+    root.handlers[:] = [handler]
+    root.setLevel(level)
+    for name in ("uvicorn", "uvicorn.error", "uvicorn.access"):
+        uvicorn_logger = logging.getLogger(name)
+        uvicorn_logger.handlers[:] = []
+        uvicorn_logger.propagate = True
+    for name in CHATTY_LOGGERS:
+        logging.getLogger(name).setLevel(level if level <= logging.DEBUG else max(level, logging.WARNING))
+
+    _listener = QueueListener(handler.queue, output)
+    _listener.start()
+    atexit.register(shutdown_logging)
+    return _listener
+
+
+def configure_process_logging(level: Optional[str] = None, log_format: Optional[str] = None):
+    """
+    Logging for helper processes such as the document parser pool: records are written to stdout directly,
+    in the configured format and with the same redaction. A helper process has no event loop to keep free,
+    and a queue handler inherited from its parent would feed a listener thread that does not run there.
+    """
+    settings = get_settings()
+    level = logging.getLevelName((level or settings.LOG_LEVEL).upper())
+    log_format = (log_format or settings.LOG_FORMAT).lower()
+
+    output = logging.StreamHandler(sys.stdout)
+    output.setFormatter(JsonFormatter() if log_format == "json" else TextFormatter())
+    output.addFilter(RequestIdFilter())
+
+    root = logging.getLogger()
+    root.handlers[:] = [output]
+    root.setLevel(level)
+    for name in CHATTY_LOGGERS:
+        logging.getLogger(name).setLevel(level if level <= logging.DEBUG else max(level, logging.WARNING))
+
+
+def shutdown_logging():
+    """Write out queued records and stop the listener thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
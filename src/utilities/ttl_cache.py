@@ -0,0 +1,91 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    A thread-safe LRU cache whose entries also expire after a time-to-live.
+
+    Args:
+        max_entries (int): Least recently used entries are evicted beyond this many entries.
+        ttl_seconds (float): Seconds an entry stays valid after it was set.
+        max_bytes (int, optional): Evict least recently used entries while the summed size exceeds this.
+        sizeof (callable, optional): Returns the approximate size of a value in bytes; required with max_bytes.
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        ttl_seconds: float,
+        max_bytes: Optional[int] = None,
+        sizeof: Optional[Callable[[Any], int]] = None,
+    ):
+        if max_bytes is not None and sizeof is None:
+            raise ValueError("sizeof is required when max_bytes is set")
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self._data = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            item = self._data.get(key, _MISSING)
+            if item is _MISSING:
+                return default
+            value, expires_at, size = item
+            if expires_at <= time.monotonic():
+                self._remove(key)
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        size = self.sizeof(value) if self.sizeof is not None else 0
+        with self._lock:
+            if key in self._data:
+                self._remove(key)
+            self._data[key] = (value, time.monotonic() + ttl, size)
+            self._bytes += size
+            self._evict()
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            item = self._data.get(key, _MISSING)
+            if item is _MISSING:
+                return default
+            self._remove(key)
+            return item[0]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    @property
+    def size_bytes(self) -> int:
+        return self._bytes
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def _remove(self, key: Hashable) -> None:
+        _, _, size = self._data.pop(key)
+        self._bytes -= size
+
+    def _evict(self) -> None:
+        while len(self._data) > self.max_entries:
+            self._remove(next(iter(self._data)))
+        if self.max_bytes is not None:
+            while self._bytes > self.max_bytes and self._data:
+                self._remove(next(iter(self._data)))
@@ -1,24 +1,15 @@
-# Helper function to clean up old files (optional)
-from datetime import datetime
-from pathlib import Path
-
-
-async def cleanup_old_files(UPLOAD_DIR:str,days_old: int = 30):
+async def strip_bold_markers(chunks):
     """
-    Clean up files older than specified days.
-    Run this as a background task or cron job.
+    Remove the `**` markdown markers from a stream of text chunks.
+    A trailing `*` is held back until the next chunk so markers split across chunks are still removed.
     """
-    try:
-        upload_path = Path(UPLOAD_DIR)
-        if not upload_path.exists():
-            return
-        
-        cutoff_time = datetime.now().timestamp() - (days_old * 24 * 3600)
-        
-        for file_path in upload_path.glob("*"):
-            if file_path.is_file() and file_path.stat().st_mtime < cutoff_time:
-                file_path.unlink()
-                print(f"Deleted old file: {file_path}")
-                
-    except Exception as e:
-        print(f"Error cleaning up old files: {e}")
\ No newline at end of file
+    pending = ""
+    async for chunk in chunks:
+        text = (pending + chunk).replace("**", "")
+        pending = ""
+        if text.endswith("*"):
+            text, pending = text[:-1], "*"
+        if text:
+            yield text
+    if pending:
+        yield pending